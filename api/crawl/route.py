@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Dict
 
 from backend.database.database import get_db
+from backend.utils.crawl_scheduler import CrawlScheduler
 from backend.utils.data_pipeline import DataPipeline
 from backend.database.models import Source
 
@@ -15,6 +16,10 @@ router = APIRouter(prefix="/api/crawl", tags=["crawl"])
 # 全局数据管道实例
 pipeline = DataPipeline()
 
+# 多数据源调度：手动爬取也经过调度器，与定时爬取一样先抢占数据源行
+# （定时调度用 python -m backend.utils.crawl_scheduler 单独运行，API 进程中不自动启动）
+scheduler = CrawlScheduler(pipeline=pipeline)
+
 class CrawlRequest(BaseModel):
     platform: str = "hackernews"
     max_posts: int = 30
@@ -214,11 +219,13 @@ async def get_crawl_stats():
         
         # 计算总体统计
         total_crawls = len(active_crawls)
-        completed_crawls = sum(1 for c in active_crawls.values() if c["status"] in ["completed", "failed", "cancelled"])
+        completed_crawls = sum(1 for c in active_crawls.values() if c["status"] in ["completed", "failed", "cancelled", "skipped"])
         running_crawls = total_crawls - completed_crawls
         
         return {
             "pipeline_stats": pipeline_stats,
+            # 需求分析各阶段耗时（次数、总耗时、均值和 p50/p90/p99）
+            "analyzer_timings": pipeline.analyzer.timings.snapshot(),
             "crawl_jobs": {
                 "total": total_crawls,
                 "running": running_crawls,
@@ -232,6 +239,19 @@ async def get_crawl_stats():
         logger.error(f"Error getting crawl stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/scheduler")
+async def get_scheduler_status():
+    """获取各数据源的下次爬取时间（按数据库中的 last_crawled_at 计算，调度进程不在 API 中运行）"""
+    try:
+        return {
+            "next_due": scheduler.next_due(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error getting scheduler status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 async def run_crawl_task(crawl_id: str, platform: str, max_posts: int):
     """后台运行爬取任务"""
     try:
@@ -239,14 +259,15 @@ async def run_crawl_task(crawl_id: str, platform: str, max_posts: int):
         
         start_time = datetime.utcnow()
         
-        # 根据平台选择爬虫
-        if platform == "hackernews":
-            result = pipeline.run_hackernews_pipeline(max_posts=max_posts)
-        else:
-            raise ValueError(f"Unsupported platform: {platform}")
+        # 按平台选择爬取函数（不支持的平台抛出 ValueError）
+        result = scheduler.run_platform(platform, max_posts=max_posts)
         
-        # 更新任务状态
-        active_crawls[crawl_id]["status"] = "completed" if result["status"] == "success" else "failed"
+        # 更新任务状态（数据源正被其他任务爬取时为 skipped）
+        if result["status"] == "skipped":
+            active_crawls[crawl_id]["status"] = "skipped"
+            active_crawls[crawl_id]["error"] = result.get("reason")
+        else:
+            active_crawls[crawl_id]["status"] = "completed" if result["status"] == "success" else "failed"
         active_crawls[crawl_id]["completed_at"] = datetime.utcnow()
         active_crawls[crawl_id]["duration_seconds"] = (active_crawls[crawl_id]["completed_at"] - start_time).total_seconds()
         active_crawls[crawl_id]["stats"] = result.get("stats", {})
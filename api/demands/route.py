@@ -45,6 +45,11 @@ class DemandCreate(BaseModel):
     source_url: Optional[str] = None
     tags: Optional[List[str]] = None
     tool_type: Optional[str] = None
+    source_item_id: Optional[str] = None
+    source_score: Optional[int] = None
+    source_comments: Optional[int] = None
+    demand_type: Optional[str] = None
+    demand_types: Optional[List[str]] = None
 
 class DemandResponse(BaseModel):
     id: str
@@ -77,6 +82,11 @@ class DemandResponse(BaseModel):
     source_url: Optional[str]
     tags: Optional[List[str]]
     tool_type: Optional[str]
+    source_item_id: Optional[str]
+    source_score: Optional[int]
+    source_comments: Optional[int]
+    demand_type: Optional[str]
+    demand_types: Optional[List[str]]
     status: str
     is_high_potential: bool
     discovered_at: datetime
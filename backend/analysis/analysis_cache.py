@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 缓存的分析特征：(工具类型, 付费潜力, 技术复杂度, 关键词, 评分)
+Features = Tuple[str, str, str, list, Dict[str, float]]
+
+
+def normalize_text(text: str) -> str:
+    """缓存键使用的规范化文本：小写、去掉首尾空白（不影响分析结果）"""
+    return text.lower().strip()
+
+
+class AnalysisCache:
+    """分析结果缓存 - 按 hash(规范化文本 + 分析器配置版本) 缓存文本相关的分析特征
+
+    两级：进程内LRU，以及可选的SQLite持久层（path 为 None 时只用内存）。
+    分析器通过 bind() 设置配置版本；版本变化时内存层清空，持久层删除旧版本的条目。
+    """
+
+    FILE_NAME = "analysis_cache.sqlite3"
+
+    # SQLite 单条语句的参数个数有上限，批量查询按块进行
+    QUERY_CHUNK = 500
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None, max_disk_entries: int = 200000):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.version = ""
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Features]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stored": 0
+        }
+
+        if path:
+            self._open(path)
+
+    @classmethod
+    def persistent(cls, path: Optional[str] = None, **kwargs) -> "AnalysisCache":
+        """带SQLite持久层的缓存（默认放在爬虫缓存目录下）"""
+        # 延迟导入：分析器导入本模块时不需要加载 requests
+        from backend.crawlers.http_cache import default_cache_dir
+        return cls(path=path or os.path.join(default_cache_dir(), cls.FILE_NAME), **kwargs)
+
+    def bind(self, version: str) -> None:
+        """设置分析器配置版本，旧版本的缓存全部失效"""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self._memory.clear()
+
+            if self._db is not None:
+                try:
+                    with self._db:
+                        self._db.execute("DELETE FROM analyses WHERE version != ?", (version,))
+                    self._prune_disk()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to purge analysis cache: {str(e)}")
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.version}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[Features]:
+        return self.get_many([text]).get(text)
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Features]:
+        """批量查找，返回命中的 {文本: 特征}；内存未命中的再查一次持久层"""
+        keys = {text: self.key(text) for text in dict.fromkeys(texts)}
+        found: Dict[str, Features] = {}
+        with self._lock:
+            for text, key in keys.items():
+                features = self._memory.get(key)
+                if features is not None:
+                    self._memory.move_to_end(key)
+                    found[text] = features
+
+            missing = {key: text for text, key in keys.items() if text not in found}
+            if missing and self._db is not None:
+                for key, features in self._load(list(missing)).items():
+                    found[missing[key]] = features
+                    self._remember(key, features)
+                    self.stats["disk_hits"] += 1
+
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put(self, text: str, features: Features) -> None:
+        self.put_many({text: features})
+
+    def put_many(self, entries: Dict[str, Features]) -> None:
+        """批量写入（持久层在一个事务里写完）"""
+        if not entries:
+            return
+
+        rows = []
+        stored_at = time.time()
+        with self._lock:
+            for text, features in entries.items():
+                key = self.key(text)
+                self._remember(key, features)
+                rows.append((key, self.version, json.dumps(features), stored_at))
+            self.stats["stored"] += len(rows)
+
+            if self._db is not None:
+                try:
+                    with self._db:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO analyses (key, version, result, stored_at) VALUES (?, ?, ?, ?)",
+                            rows
+                        )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to write analysis cache: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM analyses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, features: Features):
+        self._memory[key] = features
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: list) -> Dict[str, Features]:
+        found = {}
+        try:
+            for start in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[start:start + self.QUERY_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, result FROM analyses WHERE key IN ({placeholders})", chunk
+                )
+                for key, result in rows:
+                    tool_type, payment_potential, complexity, keywords, scores = json.loads(result)
+                    found[key] = (tool_type, payment_potential, complexity, keywords, scores)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Failed to read analysis cache: {str(e)}")
+        return found
+
+    def _prune_disk(self):
+        """持久层超过 max_disk_entries 时删除最早写入的条目"""
+        (count,) = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY stored_at LIMIT ?)",
+                    (overflow,)
+                )
+
+    def _open(self, path: str):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS analyses ("
+                    "key TEXT PRIMARY KEY, version TEXT NOT NULL, result TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Analysis cache at {path} is not available, using memory only: {str(e)}")
+            self._db = None
@@ -1,95 +1,162 @@
+import hashlib
+import json
 import logging
+import os
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import re
 from collections import Counter
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+
+from backend.analysis.analysis_cache import AnalysisCache, Features
+from backend.analysis.keyword_matcher import KeywordMatcher, DEFAULT_KEYWORD_DICTIONARIES
+from backend.analysis.tokenizer import get_tokenizer
+from backend.utils.records import Analysis
+from backend.utils.timings import StageTimings
 
 logger = logging.getLogger(__name__)
 
-# 下载NLTK数据（第一次运行时需要）
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+DEFAULT_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_weights.json")
+
+
+def load_scoring_config(path: Optional[str] = None) -> Dict:
+    """读取评分配置文件，返回 {"weights": {维度: 权重}, "high_potential_threshold": 阈值}"""
+    path = path or os.environ.get("SCOUT_SCORING_WEIGHTS") or DEFAULT_WEIGHTS_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    return {
+        "weights": config.get("weights", {}),
+        "high_potential_threshold": config.get("high_potential_threshold", DemandAnalyzer.HIGH_POTENTIAL_THRESHOLD)
+    }
 
 class DemandAnalyzer:
     """需求分析引擎 - 分析提取的需求并评分"""
     
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+    # 综合评分权重（加权平均）的默认值，实际使用的权重来自 scoring_weights.json
+    SCORE_WEIGHTS = {
+        'demand_strength': 0.25,
+        'market_size': 0.20,
+        'payment_willingness': 0.25,
+        'technical_feasibility': 0.15,
+        'passive_income_fit': 0.15
+    }
+    
+    # 综合评分达到此值的需求标记为高潜力
+    HIGH_POTENTIAL_THRESHOLD = 7.0
+    
+    # 通用工具类型有更大市场，小众工具类型市场较小
+    BROAD_MARKET_TOOLS = ['web_app', 'browser_extension', 'mobile_app', 'productivity']
+    NICHE_TOOLS = ['cli_tool', 'desktop_app']
+    
+    # 适合被动收入的工具类型
+    PASSIVE_FRIENDLY_TOOLS = ['web_app', 'api_service', 'automation', 'analytics']
+    
+    # 付费潜力 -> 付费意愿评分；技术复杂度 -> 可行性评分（低复杂度 = 高可行性）
+    PAYMENT_WILLINGNESS_SCORES = {'high': 8.0, 'medium': 5.0, 'low': 2.0}
+    FEASIBILITY_SCORES = {'low': 9.0, 'medium': 6.0, 'high': 3.0}
+    
+    # 分析逻辑的版本号，修改分类/评分代码时递增，使缓存的旧结果失效
+    ANALYSIS_VERSION = 1
+    
+    def __init__(self, tokenizer: Optional[str] = None, cache: Optional[AnalysisCache] = None,
+                 keyword_extractor=None, scoring_config: Optional[Dict] = None, timings: bool = True):
+        # 默认使用正则分词器；tokenizer="nltk" 时才加载NLTK（可能需要下载语料）
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.stop_words = self.tokenizer.stop_words
+        
+        # 评分权重：配置中缺少的维度使用默认权重
+        scoring_config = scoring_config if scoring_config is not None else load_scoring_config()
+        self.score_weights = self._validate_weights(scoring_config.get("weights", {}))
+        self.high_potential_threshold = float(
+            scoring_config.get("high_potential_threshold", self.HIGH_POTENTIAL_THRESHOLD)
+        )
+        
+        # 语料级关键词提取器（如 TfidfKeywordExtractor）；为 None 时按单条文本内的词频取关键词
+        self.keyword_extractor = keyword_extractor
         
         # 关键词库
-        self.tool_keywords = {
-            'browser_extension': ['extension', 'chrome', 'firefox', 'browser', 'plugin', 'addon'],
-            'api_service': ['api', 'rest', 'graphql', 'endpoint', 'integration'],
-            'cli_tool': ['cli', 'command line', 'terminal', 'shell', 'script'],
-            'mobile_app': ['app', 'mobile', 'ios', 'android', 'phone'],
-            'desktop_app': ['desktop', 'windows', 'mac', 'linux', 'application'],
-            'web_app': ['web', 'website', 'saas', 'cloud', 'online'],
-            'automation': ['automate', 'automation', 'bot', 'robot', 'schedule'],
-            'analytics': ['analytics', 'dashboard', 'metrics', 'report', 'statistics'],
-            'monitoring': ['monitor', 'alert', 'notification', 'track', 'watch'],
-            'productivity': ['productivity', 'efficiency', 'time', 'save', 'fast']
-        }
+        self.tool_keywords = DEFAULT_KEYWORD_DICTIONARIES['tool_type']
         
         # 付费信号关键词
-        self.payment_keywords = {
-            'high': ['pay', 'price', 'cost', 'subscription', 'monthly', 'yearly', 
-                    'premium', 'enterprise', 'business', 'professional', 'worth'],
-            'medium': ['free', 'trial', 'freemium', 'basic', 'standard', 'affordable'],
-            'low': ['open source', 'free', 'gratis', 'no cost', 'cheap']
-        }
+        self.payment_keywords = DEFAULT_KEYWORD_DICTIONARIES['payment']
         
         # 技术复杂度关键词
-        self.complexity_keywords = {
-            'high': ['ai', 'machine learning', 'blockchain', 'real-time', 'scalable',
-                    'distributed', 'complex', 'advanced', 'sophisticated'],
-            'medium': ['database', 'api', 'integration', 'automation', 'dashboard',
-                      'analytics', 'monitoring', 'scheduling'],
-            'low': ['simple', 'basic', 'lightweight', 'minimal', 'straightforward']
-        }
+        self.complexity_keywords = DEFAULT_KEYWORD_DICTIONARIES['complexity']
+        
+        # 需求强度和被动收入关键词
+        self.strong_keywords = DEFAULT_KEYWORD_DICTIONARIES['demand_strength']['strong']
+        self.passive_friendly_keywords = DEFAULT_KEYWORD_DICTIONARIES['passive_income']['friendly']
+        
+        # 所有词典编译进一个匹配器，每段文本只扫描一次（与爬虫共用同一实例）
+        self.matcher = KeywordMatcher.shared(dict(
+            DEFAULT_KEYWORD_DICTIONARIES,
+            tool_type=self.tool_keywords,
+            payment=self.payment_keywords,
+            complexity=self.complexity_keywords,
+            demand_strength={'strong': self.strong_keywords},
+            passive_income={'friendly': self.passive_friendly_keywords}
+        ))
+        
+        # 各阶段耗时直方图（分词/分类/评分/推荐等），通过 /api/crawl/stats 导出
+        self.timings = StageTimings(enabled=timings)
+        
+        # 分析结果缓存（按文本内容+配置版本），配置变化时自动失效
+        self.config_version = self._config_version()
+        self.cache = cache
+        if self.cache is not None:
+            self.cache.bind(self.config_version)
     
-    def analyze_demand(self, raw_demand: Dict) -> Dict:
-        """分析单个需求"""
+    def analyze_demand(self, raw_demand: Dict) -> Analysis:
+        """分析单个需求（raw_demand 可以是 RawDemand 记录或同结构的字典）"""
         try:
-            logger.info(f"Analyzing demand: {raw_demand.get('extracted_text', '')[:50]}...")
+            # 逐条分析只有几十微秒，分阶段计时按 sample_every 抽样
+            timings = self.timings
+            timed = timings.sample()
+            if timed:
+                started = now = timings.now()
             
-            # 提取文本
+            # 提取文本（热路径上的日志用惰性格式化，未开启debug时不拼接字符串）
             text = raw_demand.get('extracted_text', '').lower()
+            logger.debug("Analyzing demand: %.50s...", text)
             
-            # 基础分析
-            tool_type = self._classify_tool_type(text)
-            payment_potential = self._assess_payment_potential(text)
-            complexity = self._assess_complexity(text)
-            
-            # 提取关键词
-            keywords = self._extract_keywords(text)
+            features = None
+            if self.cache is not None:
+                features = self.cache.get(text)
+                if timed:
+                    now = timings.since("cache", now)
+            if features is None:
+                # 一次扫描得到所有关键词词典的命中数
+                hits = self.matcher.match(text)
+                if timed:
+                    now = timings.since("match", now)
+                
+                # 基础分析
+                tool_type = self._classify_tool_type(text, hits)
+                payment_potential = self._assess_payment_potential(text, hits)
+                complexity = self._assess_complexity(text, hits)
+                if timed:
+                    now = timings.since("classify", now)
+                
+                # 提取关键词（分词）
+                keywords = self.extract_keywords_batch([text])[0]
+                if timed:
+                    now = timings.since("keywords", now)
+                
+                # 评分
+                scores = self._calculate_scores(text, tool_type, payment_potential, complexity, hits)
+                if timed:
+                    now = timings.since("score", now)
+                
+                features = (tool_type, payment_potential, complexity, keywords, scores)
+                if self.cache is not None:
+                    self.cache.put(text, features)
             
-            # 评分
-            scores = self._calculate_scores(text, tool_type, payment_potential, complexity)
-            
-            # 构建分析结果
-            analysis = {
-                "tool_type": tool_type,
-                "payment_potential": payment_potential,
-                "technical_complexity": complexity,
-                "keywords": keywords,
-                "scores": scores,
-                "analyzed_at": datetime.utcnow().isoformat(),
-                "confidence": raw_demand.get('confidence', 0.5),
-                "source_info": {
-                    "platform": raw_demand.get('source_post', {}).get('platform', 'unknown'),
-                    "post_title": raw_demand.get('source_post', {}).get('title', ''),
-                    "post_url": raw_demand.get('source_post', {}).get('url', '')
-                }
-            }
+            # 构建分析结果（来源信息由记录按需从帖子生成）
+            analysis = self.build_analysis(raw_demand, features, datetime.utcnow().isoformat())
+            if timed:
+                timings.since("build", now)
+                timings.since("analyze_demand", started)
             
-            logger.debug(f"Analysis completed: {analysis}")
+            logger.debug("Analysis completed: %r", analysis)
             return analysis
             
         except Exception as e:
@@ -99,18 +166,114 @@ class DemandAnalyzer:
                 "analyzed_at": datetime.utcnow().isoformat()
             }
     
-    def _classify_tool_type(self, text: str) -> str:
-        """分类工具类型"""
-        scores = {}
+    def analyze_batch(self, raw_demands: List[Dict]) -> List[Analysis]:
+        """批量分析需求 - 整批构建特征矩阵，评分用NumPy向量化计算
+
+        结果与逐条调用 analyze_demand 完全一致；没有安装NumPy或批量计算出错时退回逐条分析。
+        """
+        if not raw_demands:
+            return []
         
-        for tool_type, keywords in self.tool_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in text:
-                    score += 1
+        try:
+            from backend.analysis.vectorized import score_batch
+        except ImportError:
+            logger.warning("NumPy not available, falling back to per-item analysis")
+            return [self.analyze_demand(raw_demand) for raw_demand in raw_demands]
+        
+        try:
+            logger.info(f"Analyzing batch of {len(raw_demands)} demands")
+            timings = self.timings
+            started = now = timings.now()
             
-            if score > 0:
-                scores[tool_type] = score
+            texts = [raw_demand.get('extracted_text', '').lower() for raw_demand in raw_demands]
+            
+            # 同一标题命中多个需求模式时文本相同，每个不同的文本只分析一次；缓存命中的不再分析
+            unique_texts = list(dict.fromkeys(texts))
+            features = {}
+            if self.cache is not None:
+                features = self.cache.get_many(unique_texts)
+                now = timings.since("batch_cache", now)
+            missing = [text for text in unique_texts if text not in features]
+            if missing:
+                labels, scores = score_batch(self, missing)
+                now = timings.since("batch_score", now)
+                keywords = self.extract_keywords_batch(missing)
+                now = timings.since("batch_keywords", now)
+                computed = {
+                    text: (*label, text_keywords, item_scores)
+                    for text, label, text_keywords, item_scores in zip(missing, labels, keywords, scores)
+                }
+                features.update(computed)
+                if self.cache is not None:
+                    self.cache.put_many(computed)
+            
+            analyzed_at = datetime.utcnow().isoformat()
+            results = [
+                self.build_analysis(raw_demand, features[text], analyzed_at)
+                for raw_demand, text in zip(raw_demands, texts)
+            ]
+            timings.since("batch_build", now)
+            timings.since("analyze_batch", started)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error analyzing demand batch, falling back to per-item analysis: {str(e)}")
+            return [self.analyze_demand(raw_demand) for raw_demand in raw_demands]
+    
+    def build_analysis(self, raw_demand: Dict, features: Features, analyzed_at: str) -> Analysis:
+        """由分析特征构建分析结果（关键词和评分复制一份，缓存中的对象不会被修改）"""
+        tool_type, payment_potential, complexity, keywords, scores = features
+        return Analysis(
+            post=raw_demand.get('source_post'),
+            tool_type=tool_type,
+            payment_potential=payment_potential,
+            technical_complexity=complexity,
+            keywords=list(keywords),
+            scores=dict(scores),
+            analyzed_at=analyzed_at,
+            confidence=raw_demand.get('confidence', 0.5)
+        )
+    
+    @staticmethod
+    def features_of(analysis: Analysis) -> Features:
+        return (analysis.tool_type, analysis.payment_potential, analysis.technical_complexity,
+                analysis.keywords, analysis.scores)
+    
+    def _config_version(self) -> str:
+        """分析器配置（关键词词典、权重、分词器）的指纹"""
+        config = {
+            "analysis_version": self.ANALYSIS_VERSION,
+            "dictionaries": self.matcher.dictionaries,
+            "score_weights": self.score_weights,
+            "broad_market_tools": self.BROAD_MARKET_TOOLS,
+            "niche_tools": self.NICHE_TOOLS,
+            "passive_friendly_tools": self.PASSIVE_FRIENDLY_TOOLS,
+            "payment_willingness_scores": self.PAYMENT_WILLINGNESS_SCORES,
+            "feasibility_scores": self.FEASIBILITY_SCORES,
+            "tokenizer": self.tokenizer.name,
+            "keywords": self.keyword_extractor.name if self.keyword_extractor is not None else "frequency",
+            "stop_words": sorted(self.stop_words)
+        }
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    
+    def _validate_weights(self, weights: Dict[str, float]) -> Dict[str, float]:
+        unknown = set(weights) - set(self.SCORE_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown score weights: {', '.join(sorted(unknown))}")
+        
+        merged = dict(self.SCORE_WEIGHTS, **{name: float(value) for name, value in weights.items()})
+        if any(value < 0 for value in merged.values()) or sum(merged.values()) <= 0:
+            raise ValueError(f"Score weights must be non-negative and not all zero: {merged}")
+        return merged
+    
+    def _classify_tool_type(self, text: str, hits: Optional[Dict] = None) -> str:
+        """分类工具类型"""
+        hits = hits or self.matcher.match(text)
+        scores = {
+            tool_type: score
+            for tool_type, score in hits['tool_type'].items()
+            if score > 0
+        }
         
         if scores:
             # 返回得分最高的类型
@@ -118,14 +281,11 @@ class DemandAnalyzer:
         
         return "unknown"
     
-    def _assess_payment_potential(self, text: str) -> str:
+    def _assess_payment_potential(self, text: str, hits: Optional[Dict] = None) -> str:
         """评估付费潜力"""
+        hits = hits or self.matcher.match(text)
         scores = {'high': 0, 'medium': 0, 'low': 0}
-        
-        for level, keywords in self.payment_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    scores[level] += 1
+        scores.update(hits['payment'])
         
         # 返回得分最高的级别
         max_level = max(scores.items(), key=lambda x: x[1])
@@ -136,14 +296,11 @@ class DemandAnalyzer:
         
         return max_level[0]
     
-    def _assess_complexity(self, text: str) -> str:
+    def _assess_complexity(self, text: str, hits: Optional[Dict] = None) -> str:
         """评估技术复杂度"""
+        hits = hits or self.matcher.match(text)
         scores = {'high': 0, 'medium': 0, 'low': 0}
-        
-        for level, keywords in self.complexity_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    scores[level] += 1
+        scores.update(hits['complexity'])
         
         max_level = max(scores.items(), key=lambda x: x[1])
         
@@ -152,17 +309,31 @@ class DemandAnalyzer:
         
         return max_level[0]
     
+    def extract_keywords_batch(self, texts: List[str], top_n: int = 10) -> List[List[str]]:
+        """批量提取关键词；配置了语料级提取器时整批向量化，并把这批文本计入语料统计"""
+        if self.keyword_extractor is None:
+            return [self._extract_keywords(text, top_n) for text in texts]
+        
+        try:
+            documents = [self._keyword_tokens(text) for text in texts]
+            return self.keyword_extractor.extract_batch(documents, top_n=top_n)
+        except Exception as e:
+            logger.warning(f"Error extracting corpus keywords, using term frequency: {str(e)}")
+            return [self._extract_keywords(text, top_n) for text in texts]
+    
+    def _keyword_tokens(self, text: str) -> List[str]:
+        """分词并移除停用词和标点"""
+        tokens = self.tokenizer.tokenize(text.lower())
+        return [
+            token for token in tokens 
+            if token.isalnum() and token not in self.stop_words
+        ]
+    
     def _extract_keywords(self, text: str, top_n: int = 10) -> List[str]:
-        """提取关键词"""
+        """提取关键词（单条文本内的词频）"""
         try:
-            # 分词
-            tokens = word_tokenize(text.lower())
-            
-            # 移除停用词和标点
-            filtered_tokens = [
-                token for token in tokens 
-                if token.isalnum() and token not in self.stop_words
-            ]
+            # 分词，移除停用词和标点
+            filtered_tokens = self._keyword_tokens(text)
             
             # 统计词频
             word_freq = Counter(filtered_tokens)
@@ -174,18 +345,17 @@ class DemandAnalyzer:
             logger.warning(f"Error extracting keywords: {str(e)}")
             return []
     
-    def _calculate_scores(self, text: str, tool_type: str, payment_potential: str, complexity: str) -> Dict:
+    def _calculate_scores(self, text: str, tool_type: str, payment_potential: str, complexity: str,
+                          hits: Optional[Dict] = None) -> Dict:
         """计算各项评分"""
+        hits = hits or self.matcher.match(text)
         
         # 1. 需求强度评分 (0-10)
         # 基于文本长度、特定关键词等
         demand_strength = 5.0  # 基础分
         
-        # 增加强度的关键词
-        strong_keywords = ['need', 'want', 'must', 'essential', 'critical', 'urgent']
-        for keyword in strong_keywords:
-            if keyword in text:
-                demand_strength += 0.5
+        # 增加强度的关键词（self.strong_keywords）
+        demand_strength += 0.5 * hits['demand_strength']['strong']
         
         # 文本长度影响
         word_count = len(text.split())
@@ -201,55 +371,35 @@ class DemandAnalyzer:
         market_size = 6.0
         
         # 通用工具类型有更大市场
-        broad_market_tools = ['web_app', 'browser_extension', 'mobile_app', 'productivity']
-        if tool_type in broad_market_tools:
+        if tool_type in self.BROAD_MARKET_TOOLS:
             market_size += 2.0
         
         # 小众工具类型市场较小
-        niche_tools = ['cli_tool', 'desktop_app']
-        if tool_type in niche_tools:
+        if tool_type in self.NICHE_TOOLS:
             market_size -= 1.0
         
         market_size = max(0, min(10, market_size))
         
         # 3. 付费意愿评分 (0-10)
-        payment_willingness = {
-            'high': 8.0,
-            'medium': 5.0,
-            'low': 2.0
-        }.get(payment_potential, 5.0)
+        payment_willingness = self.PAYMENT_WILLINGNESS_SCORES.get(payment_potential, 5.0)
         
         # 4. 技术可行性评分 (0-10)
-        technical_feasibility = {
-            'low': 9.0,   # 低复杂度 = 高可行性
-            'medium': 6.0,
-            'high': 3.0   # 高复杂度 = 低可行性
-        }.get(complexity, 6.0)
+        technical_feasibility = self.FEASIBILITY_SCORES.get(complexity, 6.0)
         
         # 5. 被动收入适配度评分 (0-10)
         passive_income_fit = 5.0
         
-        # 适合被动收入的特性
-        passive_friendly_keywords = ['subscription', 'saas', 'cloud', 'automation', 'api']
-        for keyword in passive_friendly_keywords:
-            if keyword in text:
-                passive_income_fit += 1.0
+        # 适合被动收入的特性（self.passive_friendly_keywords）
+        passive_income_fit += 1.0 * hits['passive_income']['friendly']
         
         # 工具类型影响
-        passive_friendly_tools = ['web_app', 'api_service', 'automation', 'analytics']
-        if tool_type in passive_friendly_tools:
+        if tool_type in self.PASSIVE_FRIENDLY_TOOLS:
             passive_income_fit += 2.0
         
         passive_income_fit = max(0, min(10, passive_income_fit))
         
         # 6. 综合评分 (加权平均)
-        weights = {
-            'demand_strength': 0.25,
-            'market_size': 0.20,
-            'payment_willingness': 0.25,
-            'technical_feasibility': 0.15,
-            'passive_income_fit': 0.15
-        }
+        weights = self.score_weights
         
         overall_score = (
             demand_strength * weights['demand_strength'] +
@@ -270,6 +420,9 @@ class DemandAnalyzer:
     
     def generate_recommendations(self, analysis: Dict) -> Dict:
         """生成推荐信息"""
+        timed = self.timings.sample()
+        if timed:
+            started = self.timings.now()
         scores = analysis.get('scores', {})
         tool_type = analysis.get('tool_type', 'unknown')
         
@@ -293,13 +446,17 @@ class DemandAnalyzer:
         # 技术栈建议
         tech_stack = self._suggest_tech_stack(tool_type, analysis.get('technical_complexity', 'medium'))
         
-        return {
+        # 优先级沿用固定的分档（不随可配置的高潜力阈值变化）
+        recommendations = {
             "recommended_pricing": f"${recommended_price}/month",
             "mvp_features": mvp_features,
             "suggested_tech_stack": tech_stack,
             "time_estimate_weeks": self._estimate_dev_time(analysis.get('technical_complexity', 'medium')),
-            "priority": "high" if overall_score >= 7.0 else "medium" if overall_score >= 5.0 else "low"
+            "priority": "high" if overall_score >= self.HIGH_POTENTIAL_THRESHOLD else "medium" if overall_score >= 5.0 else "low"
         }
+        if timed:
+            self.timings.since("recommend", started)
+        return recommendations
     
     def _suggest_mvp_features(self, tool_type: str) -> List[str]:
         """根据工具类型建议MVP功能"""
@@ -0,0 +1,164 @@
+import json
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# 爬虫和分析器共用的默认关键词词典：词典名 -> 分组 -> 关键词
+DEFAULT_KEYWORD_DICTIONARIES: Dict[str, Dict[str, List[str]]] = {
+    # 帖子类型（爬虫 _classify_post）
+    "post_type": {
+        "tool": [
+            'tool', 'app', 'website', 'platform', 'service', 'api',
+            'library', 'framework', 'cli', 'extension', 'plugin',
+            'dashboard', 'analytics', 'monitor', 'automation'
+        ],
+        "problem": [
+            'how to', 'why', 'what', 'which', 'help', 'advice',
+            'recommend', 'suggest', 'looking for', 'need', 'want',
+            'problem', 'issue', 'challenge', 'pain', 'annoying'
+        ]
+    },
+    # 工具类型
+    "tool_type": {
+        'browser_extension': ['extension', 'chrome', 'firefox', 'browser', 'plugin', 'addon'],
+        'api_service': ['api', 'rest', 'graphql', 'endpoint', 'integration'],
+        'cli_tool': ['cli', 'command line', 'terminal', 'shell', 'script'],
+        'mobile_app': ['app', 'mobile', 'ios', 'android', 'phone'],
+        'desktop_app': ['desktop', 'windows', 'mac', 'linux', 'application'],
+        'web_app': ['web', 'website', 'saas', 'cloud', 'online'],
+        'automation': ['automate', 'automation', 'bot', 'robot', 'schedule'],
+        'analytics': ['analytics', 'dashboard', 'metrics', 'report', 'statistics'],
+        'monitoring': ['monitor', 'alert', 'notification', 'track', 'watch'],
+        'productivity': ['productivity', 'efficiency', 'time', 'save', 'fast']
+    },
+    # 付费信号
+    "payment": {
+        'high': ['pay', 'price', 'cost', 'subscription', 'monthly', 'yearly',
+                 'premium', 'enterprise', 'business', 'professional', 'worth'],
+        'medium': ['free', 'trial', 'freemium', 'basic', 'standard', 'affordable'],
+        'low': ['open source', 'free', 'gratis', 'no cost', 'cheap']
+    },
+    # 技术复杂度
+    "complexity": {
+        'high': ['ai', 'machine learning', 'blockchain', 'real-time', 'scalable',
+                 'distributed', 'complex', 'advanced', 'sophisticated'],
+        'medium': ['database', 'api', 'integration', 'automation', 'dashboard',
+                   'analytics', 'monitoring', 'scheduling'],
+        'low': ['simple', 'basic', 'lightweight', 'minimal', 'straightforward']
+    },
+    # 需求强度
+    "demand_strength": {
+        'strong': ['need', 'want', 'must', 'essential', 'critical', 'urgent']
+    },
+    # 被动收入适配度
+    "passive_income": {
+        'friendly': ['subscription', 'saas', 'cloud', 'automation', 'api']
+    }
+}
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """把关键词编译成前缀树形式的正则（同一位置只需按首字符分支一次）"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """多模式关键词匹配器 - 一次扫描文本，同时得到所有词典各分组的命中数
+
+    语义与 `keyword in text` 完全一致（子串匹配、每个关键词最多计1次）。
+    所有关键词编译成一个前缀树正则，在每个位置用前瞻取最长匹配，
+    该位置上其他命中的关键词必然是最长匹配的前缀，预先算好即可。
+    输入文本需要已经转成小写。
+    """
+
+    _shared: Dict[str, "KeywordMatcher"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, dictionaries: Dict[str, Dict[str, List[str]]], cache_size: int = 4096):
+        self.dictionaries = dictionaries
+
+        # 分组编号：(词典名, 分组名) -> 计数数组下标
+        self.groups: List[Tuple[str, str]] = [
+            (name, group) for name, groups in dictionaries.items() for group in groups
+        ]
+        self._slices: Dict[str, Tuple[int, int, List[str]]] = {}
+        offset = 0
+        for name, groups in dictionaries.items():
+            self._slices[name] = (offset, offset + len(groups), list(groups))
+            offset += len(groups)
+
+        owners: Dict[str, List[int]] = {}
+        for index, (name, group) in enumerate(self.groups):
+            for keyword in dictionaries[name][group]:
+                owners.setdefault(keyword, []).append(index)
+        keywords = sorted(owners)
+
+        # 最长匹配 -> 同一位置命中的全部关键词
+        self._closure: Dict[str, frozenset] = {
+            keyword: frozenset(other for other in keywords if keyword.startswith(other))
+            for keyword in keywords
+        }
+        self._owners = owners
+        self._pattern = re.compile(f"(?=({_trie_pattern(keywords)}))") if keywords else None
+        self._scan_cached = lru_cache(maxsize=cache_size)(self._scan)
+
+    @classmethod
+    def shared(cls, dictionaries: Dict[str, Dict[str, List[str]]] = None) -> "KeywordMatcher":
+        """按词典内容复用同一个匹配器（爬虫和分析器扫描同一文本时命中缓存）"""
+        dictionaries = dictionaries or DEFAULT_KEYWORD_DICTIONARIES
+        key = json.dumps(dictionaries)
+        with cls._shared_lock:
+            matcher = cls._shared.get(key)
+            if matcher is None:
+                matcher = cls(dictionaries)
+                cls._shared[key] = matcher
+            return matcher
+
+    def match(self, text: str) -> Dict[str, Dict[str, int]]:
+        """返回 {词典名: {分组: 命中关键词数}}"""
+        counts = self._scan_cached(text)
+        result: Dict[str, Dict[str, int]] = {}
+        for name, (start, end, groups) in self._slices.items():
+            result[name] = dict(zip(groups, counts[start:end]))
+        return result
+
+    def match_counts(self, text: str) -> Tuple[int, ...]:
+        """返回按 self.groups 顺序排列的命中数（批量构建特征矩阵用）"""
+        return self._scan_cached(text)
+
+    def group_slice(self, name: str) -> Tuple[int, int, List[str]]:
+        """词典 name 在 match_counts 结果中的列范围和分组名"""
+        return self._slices[name]
+
+    def keywords_in(self, text: str) -> List[str]:
+        """文本中出现的全部关键词"""
+        return sorted(self._present(text))
+
+    def _present(self, text: str) -> set:
+        present = set()
+        if self._pattern is not None:
+            for longest in set(self._pattern.findall(text)):
+                present |= self._closure[longest]
+        return present
+
+    def _scan(self, text: str) -> Tuple[int, ...]:
+        counts = [0] * len(self.groups)
+        for keyword in self._present(text):
+            for index in self._owners[keyword]:
+                counts[index] += 1
+        return tuple(counts)
@@ -0,0 +1,245 @@
+"""近似重复检测 - MinHash签名 + LSH分段索引
+
+需求文本规范化后取字符 k-gram，用 num_perm 个哈希函数得到 MinHash 签名，
+两个签名相同位置相等的比例即 Jaccard 相似度的估计。签名按 bands 段切分，
+每段哈希成一个桶，任意一段同桶即为候选，再用签名估计的相似度确认。
+
+索引存放在SQLite里（桶表为 WITHOUT ROWID 的 (bucket, id) 主键，查找只走索引），
+跨运行持久化，支持增量插入；path 为 None 时在内存中。
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 大于 2^32 的素数；a * h + b 在 uint64 内不会溢出
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# 桶哈希：FNV-1a 风格逐行折叠，低56位为哈希，高位为段号
+_FNV_PRIME = np.uint64(0x100000001B3)
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_BUCKET_MASK = np.uint64((1 << 56) - 1)
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# 转帖常见的只是前缀不同（Ask HN / Show HN ...），规范化时去掉
+_HN_PREFIX_RE = re.compile(r"^(?:ask|show|tell|launch) hn ")
+
+
+class MinHasher:
+    """MinHash签名计算（哈希参数由 seed 决定，不同进程、不同运行结果一致）"""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """规范化（小写、标点和空白合并为一个空格、去掉 "Ask HN:" 等前缀）后的字符 k-gram 哈希"""
+        normalized = _HN_PREFIX_RE.sub("", _NON_WORD_RE.sub(" ", text.lower()).strip())
+        size = self.shingle_size
+        grams = {normalized[i:i + size] for i in range(max(1, len(normalized) - size + 1))}
+        return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self.shingles(text)
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """批量签名，返回 (文本数 x num_perm) 的矩阵"""
+        result = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for row, text in enumerate(texts):
+            result[row] = self.signature(text)
+        return result
+
+
+class NearDuplicateIndex:
+    """持久化的LSH索引 - 按文本查找已收录的近似重复项，返回其键（如 Demand.id）"""
+
+    FILE_NAME = "near_duplicates.sqlite3"
+
+    # 规范化或签名算法修改时递增，已有索引会被清空重建
+    FORMAT_VERSION = 1
+
+    # 按键查找已收录签名时每条 SQL 的键数（低于 SQLite 的参数个数上限）
+    KEY_CHUNK = 500
+
+    def __init__(self, path: Optional[str] = None, num_perm: int = 64, bands: int = 16,
+                 threshold: float = 0.6, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands or bands > 127:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands}), at most 127 bands")
+
+        self.path = path
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size, seed=seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            "lookups": 0,
+            "candidates": 0,
+            "duplicates": 0,
+            "inserted": 0
+        }
+
+        try:
+            self._db = self._open(path or ":memory:")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Near-duplicate index at {path} is not available, using memory only: {str(e)}")
+            self._db = self._open(":memory:")
+
+    @classmethod
+    def persistent(cls, path: Optional[str] = None, **kwargs) -> "NearDuplicateIndex":
+        """索引保存在爬虫缓存目录下"""
+        from backend.crawlers.http_cache import default_cache_dir
+        return cls(path=path or os.path.join(default_cache_dir(), cls.FILE_NAME), **kwargs)
+
+    def scratch(self) -> "NearDuplicateIndex":
+        """参数相同的内存索引（用于单次运行内的去重）"""
+        hasher = self.hasher
+        return NearDuplicateIndex(num_perm=hasher.num_perm, bands=self.bands, threshold=self.threshold,
+                                  shingle_size=hasher.shingle_size, seed=hasher.seed)
+
+    def query(self, text: str) -> Optional[Tuple[str, float]]:
+        """查找最相似的已收录项，相似度不低于 threshold 时返回 (键, 相似度)"""
+        return self.query_signature(self.hasher.signature(text))
+
+    def query_signature(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        matches = self.query_all_signature(signature)
+        return matches[0] if matches else None
+
+    def query_all(self, text: str) -> List[Tuple[str, float]]:
+        """相似度不低于 threshold 的所有已收录项 [(键, 相似度)]，按相似度从高到低"""
+        return self.query_all_signature(self.hasher.signature(text))
+
+    def query_all_signature(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        buckets = self._buckets(signature[np.newaxis, :])[0].tolist()
+        with self._lock:
+            self.stats["lookups"] += 1
+            rows = self._db.execute(
+                "SELECT key, signature FROM signatures WHERE id IN "
+                f"(SELECT id FROM buckets WHERE bucket IN ({', '.join('?' * len(buckets))}))",
+                buckets
+            ).fetchall()
+            self.stats["candidates"] += len(rows)
+
+            matches = []
+            for key, blob in rows:
+                similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+                if similarity >= self.threshold:
+                    matches.append((key, similarity))
+            if matches:
+                self.stats["duplicates"] += 1
+            matches.sort(key=lambda match: -match[1])
+            return matches
+
+    def add(self, key: str, text: str) -> None:
+        self.add_many([(key, text)])
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """增量插入 (键, 文本)，一个事务内写完；已收录的键替换为新文本的签名"""
+        items = list(items)
+        if not items:
+            return
+        keys = [key for key, _ in items]
+        self.add_signatures(keys, self.hasher.signatures([text for _, text in items]))
+
+    def add_signatures(self, keys: List[str], signatures: np.ndarray) -> None:
+        """插入已计算好的签名（批量导入时避免重复计算），同一键只保留最新的签名"""
+        buckets = self._buckets(signatures)
+        with self._lock:
+            try:
+                with self._db:
+                    self._remove_keys(keys)
+                    (start,) = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM signatures").fetchone()
+                    ids = range(start + 1, start + 1 + len(keys))
+                    self._db.executemany(
+                        "INSERT INTO signatures (id, key, signature) VALUES (?, ?, ?)",
+                        zip(ids, keys, (row.tobytes() for row in signatures))
+                    )
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO buckets (bucket, id) VALUES (?, ?)",
+                        ((bucket, item_id) for item_id, row in zip(ids, buckets.tolist()) for bucket in row)
+                    )
+                self.stats["inserted"] += len(keys)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to update near-duplicate index: {str(e)}")
+
+    def _remove_keys(self, keys: List[str]) -> None:
+        """删除这些键已收录的签名和它们所在的桶（重新爬取后文本变化的条目），调用方持有锁并开启事务"""
+        rows = []
+        for offset in range(0, len(keys), self.KEY_CHUNK):
+            chunk = keys[offset:offset + self.KEY_CHUNK]
+            rows.extend(self._db.execute(
+                f"SELECT id, signature FROM signatures WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        if not rows:
+            return
+        ids = [item_id for item_id, _ in rows]
+        buckets = self._buckets(np.stack([np.frombuffer(blob, dtype=np.uint32) for _, blob in rows]))
+        self._db.executemany(
+            "DELETE FROM buckets WHERE bucket = ? AND id = ?",
+            ((bucket, item_id) for item_id, row in zip(ids, buckets.tolist()) for bucket in row)
+        )
+        self._db.executemany("DELETE FROM signatures WHERE id = ?", ((item_id,) for item_id in ids))
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM signatures").fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _buckets(self, signatures: np.ndarray) -> np.ndarray:
+        """(n x num_perm) 签名 -> (n x bands) 桶号（非负 int64，可直接存入SQLite）"""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        hashes = np.full(bands.shape[:2], _FNV_OFFSET, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for row in range(self.rows):
+                hashes = (hashes ^ bands[:, :, row]) * _FNV_PRIME
+        band_ids = np.arange(self.bands, dtype=np.uint64) << np.uint64(56)
+        return ((hashes & _BUCKET_MASK) | band_ids).astype(np.int64)
+
+    def _config(self) -> str:
+        hasher = self.hasher
+        return json.dumps({"format": self.FORMAT_VERSION, "num_perm": hasher.num_perm, "bands": self.bands, "shingle_size": hasher.shingle_size,
+                           "seed": hasher.seed})
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS signatures "
+                       "(id INTEGER PRIMARY KEY, key TEXT NOT NULL, signature BLOB NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS signatures_key ON signatures (key)")
+            db.execute("CREATE TABLE IF NOT EXISTS buckets "
+                       "(bucket INTEGER NOT NULL, id INTEGER NOT NULL, PRIMARY KEY (bucket, id)) WITHOUT ROWID")
+
+            # 签名参数变化后旧签名不可比较，清空重建
+            config = self._config()
+            row = db.execute("SELECT value FROM meta WHERE name = 'config'").fetchone()
+            if row is not None and row[0] != config:
+                logger.warning(f"Near-duplicate index config changed, clearing {path}")
+                db.execute("DELETE FROM signatures")
+                db.execute("DELETE FROM buckets")
+            db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('config', ?)", (config,))
+        return db
@@ -0,0 +1,138 @@
+"""多进程需求分析 - 把原始需求分块交给进程池，每个工作进程持有一个预热好的 DemandAnalyzer
+
+分析是纯Python的CPU密集计算，单进程只能用一个核。进程池按块分发（减少进程间传输次数），
+executor.map 保证结果按输入顺序返回。帖子不随结果传回，由主进程重新关联到原来的帖子对象。
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.analysis.analysis_cache import AnalysisCache
+from backend.analysis.demand_analyzer import DemandAnalyzer, load_scoring_config
+from backend.utils.records import Analysis
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内的分析器（由 _init_worker 创建）
+_worker_analyzer: Optional[DemandAnalyzer] = None
+
+WARMUP_TEXT = "Looking for a simple web app or chrome extension to automate invoices, would pay for it"
+
+
+def _init_worker(tokenizer: Optional[str], scoring_config: Dict):
+    """进程池初始化：用主进程的评分配置创建分析器并预热（编译匹配器、加载NumPy评分）"""
+    global _worker_analyzer
+    _worker_analyzer = DemandAnalyzer(tokenizer=tokenizer, scoring_config=scoring_config)
+    _worker_analyzer.analyze_batch([{"extracted_text": WARMUP_TEXT}])
+
+
+def _analyze_chunk(raw_demands: List[Dict]) -> List[Analysis]:
+    results = _worker_analyzer.analyze_batch(raw_demands)
+    for analysis in results:
+        # 帖子由主进程重新关联，不必再序列化传回
+        if isinstance(analysis, Analysis):
+            analysis.post = None
+    return results
+
+
+class ParallelAnalyzer:
+    """进程池分析器 - analyze_batch 的多进程版本，结果与单进程完全一致（analyzed_at 除外）"""
+
+    DEFAULT_CHUNK_SIZE = 500
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 tokenizer: Optional[str] = None, cache: Optional[AnalysisCache] = None,
+                 keyword_extractor=None, scoring_config: Optional[Dict] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.tokenizer = tokenizer
+        # 评分配置在主进程读取一次，本进程和工作进程的分析器用同一份
+        self.scoring_config = scoring_config if scoring_config is not None else load_scoring_config()
+        # 缓存只在主进程查找和写入，工作进程只分析未命中的需求
+        self.cache = cache
+        # 语料级关键词的统计同样只在主进程维护
+        self.keyword_extractor = keyword_extractor
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # 单进程模式和进程池出错时使用
+        self._local: Optional[DemandAnalyzer] = None
+
+    def _local_analyzer(self) -> DemandAnalyzer:
+        if self._local is None:
+            self._local = DemandAnalyzer(tokenizer=self.tokenizer, cache=self.cache,
+                                         keyword_extractor=self.keyword_extractor,
+                                         scoring_config=self.scoring_config)
+        return self._local
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # 进程池在多次调用之间复用，工作进程只预热一次
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self.tokenizer, self.scoring_config))
+        return self._executor
+
+    def analyze_batch(self, raw_demands: List[Dict]) -> List[Analysis]:
+        """分块并行分析，结果按输入顺序返回；只有一个工作进程或只有一块时直接在本进程分析"""
+        if self.workers <= 1 or len(raw_demands) <= self.chunk_size:
+            return self._local_analyzer().analyze_batch(raw_demands)
+
+        local = self._local_analyzer()
+        texts = [raw_demand.get('extracted_text', '').lower() for raw_demand in raw_demands]
+        cached = self.cache.get_many(texts) if self.cache is not None else {}
+        pending = [raw_demand for raw_demand, text in zip(raw_demands, texts) if text not in cached]
+
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+        try:
+            logger.info(f"Analyzing {len(pending)} demands in {len(chunks)} chunks on {self.workers} workers "
+                        f"({len(raw_demands) - len(pending)} cached)")
+            computed = []
+            if chunks:
+                for chunk_results in self._get_executor().map(_analyze_chunk, chunks):
+                    computed.extend(chunk_results)
+        except Exception as e:
+            logger.error(f"Parallel analysis failed, falling back to single process: {str(e)}")
+            self.close()
+            return local.analyze_batch(raw_demands)
+
+        if local.keyword_extractor is not None and pending:
+            # 工作进程没有语料统计，关键词在主进程按整批重新提取
+            pending_texts = list(dict.fromkeys(raw_demand.get('extracted_text', '').lower() for raw_demand in pending))
+            keywords = dict(zip(pending_texts, local.extract_keywords_batch(pending_texts)))
+            for raw_demand, analysis in zip(pending, computed):
+                if isinstance(analysis, Analysis):
+                    analysis.keywords = list(keywords[raw_demand.get('extracted_text', '').lower()])
+
+        if self.cache is not None:
+            self.cache.put_many({
+                raw_demand.get('extracted_text', '').lower(): local.features_of(analysis)
+                for raw_demand, analysis in zip(pending, computed)
+                if isinstance(analysis, Analysis)
+            })
+
+        # 按输入顺序合并缓存命中的结果和工作进程的结果
+        analyzed_at = datetime.utcnow().isoformat()
+        computed = iter(computed)
+        results = []
+        for raw_demand, text in zip(raw_demands, texts):
+            if text in cached:
+                results.append(local.build_analysis(raw_demand, cached[text], analyzed_at))
+                continue
+            analysis = next(computed)
+            if isinstance(analysis, Analysis):
+                analysis.post = raw_demand.get('source_post')
+            results.append(analysis)
+        return results
+
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "ParallelAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,157 @@
+"""语料级TF-IDF关键词提取 - 按所有已分析需求的文档频率给每个词加权
+
+单条标题里的词频几乎都是1，按词频排序得到的关键词多半是 "tool"、"need" 这类常见词。
+这里维护增量的文档频率（DF）统计，每批文本先构建一个稀疏词频矩阵（CSR，重复项求和），
+再整体乘以当前的IDF得到TF-IDF分数，每行取分数最高的词作为关键词。
+词表和DF持久化到磁盘，重启后继续累积，不需要重建。
+
+IDF与 scikit-learn 的 TfidfTransformer(smooth_idf=True, sublinear_tf=True) 相同，
+但由增量DF计算（TfidfTransformer.fit 只能看到当前这一批）。
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+
+class TfidfKeywordExtractor:
+    """增量TF-IDF关键词提取器，输入为已分词、去停用词的词列表"""
+
+    name = "tfidf"
+
+    FILE_NAME = "tfidf_vocabulary.json"
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+
+        # 词 -> 列号；terms[列号] 为对应的词，df[列号] 为包含该词的文档数
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.df = np.zeros(0, dtype=np.int64)
+        self.n_docs = 0
+        self._dirty = False
+
+        if path:
+            self._load()
+
+    @classmethod
+    def persistent(cls, path: Optional[str] = None) -> "TfidfKeywordExtractor":
+        """词表保存在爬虫缓存目录下"""
+        from backend.crawlers.http_cache import default_cache_dir
+        return cls(path=path or os.path.join(default_cache_dir(), cls.FILE_NAME))
+
+    def extract_batch(self, documents: Sequence[List[str]], top_n: int = 10, update: bool = True) -> List[List[str]]:
+        """为每个文档返回TF-IDF最高的 top_n 个词；update=True 时先把这批文档计入DF"""
+        if not documents:
+            return []
+
+        with self._lock:
+            counts = self._vectorize(documents)
+            if update:
+                # 每个文档中出现过的词各计一次（CSR已合并重复项）
+                self.df += np.bincount(counts.indices, minlength=len(self.vocabulary))
+                self.n_docs += len(documents)
+                self._dirty = True
+
+            idf = np.log((1.0 + self.n_docs) / (1.0 + self.df)) + 1.0
+            scores = counts.astype(np.float64)
+            scores.data = (1.0 + np.log(scores.data)) * idf[scores.indices]
+
+        # 整批排序：先按行，行内按分数从高到低，同分按列号（词进入词表的先后），结果稳定
+        lengths = np.diff(scores.indptr)
+        rows = np.repeat(np.arange(len(documents)), lengths)
+        order = np.lexsort((-scores.data, rows))
+        ranks = np.arange(len(order)) - scores.indptr[rows]
+        columns = scores.indices[order][ranks < top_n].tolist()
+
+        terms = self.terms
+        words = [terms[column] for column in columns]
+        bounds = np.concatenate([[0], np.cumsum(np.minimum(lengths, top_n))]).tolist()
+        return [words[bounds[row]:bounds[row + 1]] for row in range(len(documents))]
+
+    def idf(self, term: str) -> float:
+        column = self.vocabulary.get(term)
+        df = self.df[column] if column is not None else 0
+        return float(np.log((1.0 + self.n_docs) / (1.0 + df)) + 1.0)
+
+    def save(self) -> None:
+        """原子写入词表和DF"""
+        if not self.path:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": self.FORMAT_VERSION,
+                "n_docs": self.n_docs,
+                "terms": self.terms,
+                "df": self.df.tolist()
+            }
+
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Failed to save TF-IDF vocabulary: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    def _vectorize(self, documents: Sequence[List[str]]) -> sparse.csr_matrix:
+        """一批文档 -> (文档数 x 词表大小) 的稀疏词频矩阵，新词追加到词表末尾"""
+        vocabulary = self.vocabulary
+        terms = self.terms
+        columns = []
+        indptr = [0]
+        for tokens in documents:
+            for token in tokens:
+                column = vocabulary.get(token)
+                if column is None:
+                    column = vocabulary[token] = len(terms)
+                    terms.append(token)
+                columns.append(column)
+            indptr.append(len(columns))
+
+        if len(vocabulary) > len(self.df):
+            self.df = np.concatenate([self.df, np.zeros(len(vocabulary) - len(self.df), dtype=np.int64)])
+
+        counts = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.int64), np.array(columns, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(documents), len(vocabulary))
+        )
+        counts.sum_duplicates()
+        return counts
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION or len(data["terms"]) != len(data["df"]):
+                logger.warning(f"Ignoring incompatible TF-IDF vocabulary at {self.path}")
+                return
+            self.terms = list(data["terms"])
+            self.vocabulary = {term: column for column, term in enumerate(self.terms)}
+            self.df = np.array(data["df"], dtype=np.int64)
+            self.n_docs = int(data["n_docs"])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load TF-IDF vocabulary, starting empty: {str(e)}")
+            self.vocabulary = {}
+            self.terms = []
+            self.df = np.zeros(0, dtype=np.int64)
+            self.n_docs = 0
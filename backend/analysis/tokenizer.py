@@ -0,0 +1,77 @@
+import logging
+import os
+import re
+from typing import FrozenSet, List
+
+logger = logging.getLogger(__name__)
+
+# NLTK english 停用词表（随代码分发，不需要下载语料）
+ENGLISH_STOPWORDS: FrozenSet[str] = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself yourselves
+he him his himself she she's her hers herself it it's its itself they them their theirs themselves
+what which who whom this that that'll these those am is are was were be been being have has had
+having do does did doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in out on off over
+under again further then once here there when where why how all any both each few more most other
+some such no nor not only own same so than too very s t can will just don don't should should've
+now d ll m o re ve y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+# 字母数字串；中间用 . - _ / 连接的复合词（node.js、e-mail、a/b）整体作为一个词，
+# 与 word_tokenize 的切分一致，随后被 isalnum 过滤掉
+_TOKEN_RE = re.compile(r"[^\W_]+(?:[-._/][^\W_]+)*")
+
+
+class RegexTokenizer:
+    """正则分词器 - 默认分词器，无外部依赖，导入和运行都很快"""
+
+    name = "regex"
+    stop_words = ENGLISH_STOPWORDS
+
+    def tokenize(self, text: str) -> List[str]:
+        return _TOKEN_RE.findall(text)
+
+
+class NLTKTokenizer:
+    """NLTK分词器 - 只在显式选择时加载，首次使用时需要 punkt/stopwords 语料"""
+
+    name = "nltk"
+
+    def __init__(self):
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.tokenize import word_tokenize
+
+        try:
+            nltk.data.find('tokenizers/punkt')
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('punkt')
+            nltk.download('stopwords')
+
+        self._word_tokenize = word_tokenize
+        self.stop_words = frozenset(stopwords.words('english'))
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._word_tokenize(text)
+
+
+TOKENIZERS = {
+    "regex": RegexTokenizer,
+    "nltk": NLTKTokenizer,
+}
+
+
+def get_tokenizer(name: str = None):
+    """按名称创建分词器（默认 SCOUT_TOKENIZER 或 regex），NLTK不可用时回退到正则分词器"""
+    name = name or os.getenv("SCOUT_TOKENIZER") or "regex"
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer: {name}")
+
+    try:
+        return TOKENIZERS[name]()
+    except (ImportError, LookupError) as e:
+        logger.warning(f"Tokenizer {name} is not available ({str(e)}), falling back to regex")
+        return RegexTokenizer()
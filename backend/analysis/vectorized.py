@@ -0,0 +1,104 @@
+"""需求评分的向量化实现 - 与 DemandAnalyzer 的逐条评分逻辑一一对应
+
+每条文本先用共享的关键词匹配器得到各分组命中数，拼成 (需求数 x 分组数) 的特征矩阵，
+再对整批做分类（argmax）和各项评分的数组运算。浮点运算顺序与逐条实现相同，
+最后用Python的 round 取整，保证结果逐位一致。
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+LEVELS = ('high', 'medium', 'low')
+
+
+def _levels(matcher, counts: np.ndarray, name: str, default: str) -> Tuple[np.ndarray, List[str]]:
+    """按 high/medium/low 取命中数最多的级别（并列取靠前的，全为0时取 default）"""
+    start, _, groups = matcher.group_slice(name)
+    order = list(dict.fromkeys(list(LEVELS) + list(groups)))
+    columns = np.zeros((counts.shape[0], len(order)), dtype=counts.dtype)
+    for index, level in enumerate(order):
+        if level in groups:
+            columns[:, index] = counts[:, start + groups.index(level)]
+
+    codes = columns.argmax(axis=1)
+    codes = np.where(columns.max(axis=1) == 0, order.index(default), codes)
+    return codes, order
+
+
+def _lookup(codes: np.ndarray, order: List[str], values: Dict[str, float], default: float) -> np.ndarray:
+    table = np.array([values.get(level, default) for level in order], dtype=np.float64)
+    return table[codes]
+
+
+def score_batch(analyzer, texts: Sequence[str]) -> Tuple[List[Tuple[str, str, str]], List[Dict[str, float]]]:
+    """批量分类和评分，返回 [(工具类型, 付费潜力, 技术复杂度)] 和 [评分字典]"""
+    matcher = analyzer.matcher
+    counts = np.array([matcher.match_counts(text) for text in texts], dtype=np.int64)
+    counts = counts.reshape(len(texts), len(matcher.groups))
+    word_counts = np.array([len(text.split()) for text in texts], dtype=np.int64)
+
+    # 工具类型：命中数最多的类型，全为0时为 unknown
+    start, end, tool_types = matcher.group_slice('tool_type')
+    tool_counts = counts[:, start:end]
+    tool_labels = list(tool_types) + ['unknown']
+    tool_codes = np.where(tool_counts.max(axis=1) > 0, tool_counts.argmax(axis=1), len(tool_types))
+
+    payment_codes, payment_order = _levels(matcher, counts, 'payment', 'medium')
+    complexity_codes, complexity_order = _levels(matcher, counts, 'complexity', 'medium')
+
+    def tool_in(names: List[str]) -> np.ndarray:
+        return np.isin(tool_codes, [tool_labels.index(name) for name in names if name in tool_labels])
+
+    def column(name: str, group: str) -> np.ndarray:
+        start, _, groups = matcher.group_slice(name)
+        return counts[:, start + groups.index(group)]
+
+    # 1. 需求强度
+    demand_strength = 5.0 + 0.5 * column('demand_strength', 'strong')
+    demand_strength = np.where(word_counts > 50, demand_strength + 1.0,
+                               np.where(word_counts < 10, demand_strength - 1.0, demand_strength))
+    demand_strength = np.clip(demand_strength, 0, 10)
+
+    # 2. 市场规模
+    market_size = np.full(len(texts), 6.0)
+    market_size = np.where(tool_in(analyzer.BROAD_MARKET_TOOLS), market_size + 2.0, market_size)
+    market_size = np.where(tool_in(analyzer.NICHE_TOOLS), market_size - 1.0, market_size)
+    market_size = np.clip(market_size, 0, 10)
+
+    # 3. 付费意愿 / 4. 技术可行性
+    payment_willingness = _lookup(payment_codes, payment_order, analyzer.PAYMENT_WILLINGNESS_SCORES, 5.0)
+    technical_feasibility = _lookup(complexity_codes, complexity_order, analyzer.FEASIBILITY_SCORES, 6.0)
+
+    # 5. 被动收入适配度
+    passive_income_fit = 5.0 + 1.0 * column('passive_income', 'friendly')
+    passive_income_fit = np.where(tool_in(analyzer.PASSIVE_FRIENDLY_TOOLS), passive_income_fit + 2.0,
+                                  passive_income_fit)
+    passive_income_fit = np.clip(passive_income_fit, 0, 10)
+
+    # 6. 综合评分（与逐条实现相同的求和顺序）
+    weights = analyzer.score_weights
+    overall = (
+        demand_strength * weights['demand_strength'] +
+        market_size * weights['market_size'] +
+        payment_willingness * weights['payment_willingness'] +
+        technical_feasibility * weights['technical_feasibility'] +
+        passive_income_fit * weights['passive_income_fit']
+    )
+
+    columns = {
+        "demand_strength": demand_strength,
+        "market_size": market_size,
+        "payment_willingness": payment_willingness,
+        "technical_feasibility": technical_feasibility,
+        "passive_income_fit": passive_income_fit,
+        "overall": overall
+    }
+    rounded = {name: [round(value, 1) for value in values.tolist()] for name, values in columns.items()}
+    scores = [dict(zip(rounded, row)) for row in zip(*rounded.values())]
+
+    labels = [
+        (tool_labels[tool], payment_order[payment], complexity_order[complexity])
+        for tool, payment, complexity in zip(tool_codes.tolist(), payment_codes.tolist(), complexity_codes.tolist())
+    ]
+    return labels, scores
@@ -0,0 +1,87 @@
+"""批量分析基准 - 逐条 analyze_demand vs analyze_batch（NumPy向量化评分）
+
+分别比较完整分析和只做分类+评分两部分的耗时，并校验两条路径的结果完全一致。
+
+用法: python -m backend.benchmarks.bench_analyze_batch [--size 20000]
+"""
+
+import argparse
+import random
+import time
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.vectorized import score_batch
+from backend.benchmarks.bench_keyword_matcher import FILLER_WORDS, make_corpus
+
+
+def make_demands(size: int, seed: int = 11):
+    """合成需求；约十分之一是超过50个词的长文本，约三成文本同时命中两个需求模式（文本相同）"""
+    rng = random.Random(seed)
+    demands = []
+    for i, text in enumerate(make_corpus(size, seed=seed)):
+        if len(demands) >= size:
+            break
+        if rng.random() < 0.1:
+            text += " " + " ".join(rng.choice(FILLER_WORDS) for _ in range(60))
+        post = {"platform": "hackernews", "title": text[:40], "url": f"https://example.com/{i}"}
+        for _ in range(2 if rng.random() < 0.3 else 1):
+            demands.append({"extracted_text": text, "confidence": 0.7, "source_post": post})
+    return demands[:size]
+
+
+def comparable(analysis):
+    return (analysis["tool_type"], analysis["payment_potential"], analysis["technical_complexity"],
+            analysis["keywords"], analysis["scores"], analysis["source_info"])
+
+
+def scalar_scores(analyzer: DemandAnalyzer, texts):
+    """逐条实现中的分类+评分部分"""
+    results = []
+    for text in texts:
+        hits = analyzer.matcher.match(text)
+        tool_type = analyzer._classify_tool_type(text, hits)
+        payment = analyzer._assess_payment_potential(text, hits)
+        complexity = analyzer._assess_complexity(text, hits)
+        scores = analyzer._calculate_scores(text, tool_type, payment, complexity, hits)
+        results.append(((tool_type, payment, complexity), scores))
+    return results
+
+
+def run(size: int = 20000):
+    demands = make_demands(size)
+    texts = [demand["extracted_text"].lower() for demand in demands]
+    analyzer = DemandAnalyzer()
+
+    start = time.perf_counter()
+    expected = [analyzer.analyze_demand(demand) for demand in demands]
+    per_item_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = analyzer.analyze_batch(demands)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = scalar_scores(analyzer, texts)
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    labels, scores = score_batch(analyzer, texts)
+    vector_seconds = time.perf_counter() - start
+
+    identical = ([comparable(a) for a in expected] == [comparable(a) for a in actual]
+                 and scalar == list(zip(labels, scores)))
+
+    print(f"📐 {size} demands")
+    print(f"  full analysis     per-item {per_item_seconds:7.2f}s   batch {batch_seconds:7.2f}s   "
+          f"speedup {per_item_seconds / batch_seconds:.1f}x")
+    print(f"  classify + score  per-item {scalar_seconds:7.2f}s   numpy {vector_seconds:7.2f}s   "
+          f"speedup {scalar_seconds / vector_seconds:.1f}x")
+    print(f"  identical results: {'✅' if identical else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    args = parser.parse_args()
+
+    run(size=args.size)
@@ -0,0 +1,81 @@
+"""分析器分阶段计时开销基准 - 开启/关闭 StageTimings 时 analyze_demand 和 analyze_batch 的吞吐
+
+两种配置按 ABBA 顺序交替各跑 --rounds 轮取最好成绩（不使用结果缓存）。单核共享机器上
+两次运行本身有几个百分点的抖动，因此另外单独测出 sample()/since() 的单次耗时，
+按每次调用的计时次数估算开销（目标低于2%）。最后校验结果一致并打印各阶段的耗时分布。
+
+用法: python -m backend.benchmarks.bench_analyzer_timings [--size 2000] [--rounds 30]
+"""
+
+import argparse
+import time
+import timeit
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.benchmarks.bench_analyze_batch import comparable, make_demands
+from backend.utils.timings import StageTimings
+
+# 每次调用 analyze_demand / analyze_batch 记录的阶段数（不含缓存阶段）
+DEMAND_STAGES = 6
+BATCH_STAGES = 4
+
+
+def instrumentation_cost(calls: int = 200000):
+    """sample() 和 since() 的单次耗时（秒）"""
+    timings = StageTimings(sample_every=1 << 30)
+    sample = timeit.timeit(timings.sample, number=calls) / calls
+    started = timings.now()
+    since = timeit.timeit(lambda: timings.since("stage", started), number=calls) / calls
+    return sample, since
+
+
+def run(size: int = 2000, rounds: int = 30):
+    demands = make_demands(size)
+    analyzers = {"off": DemandAnalyzer(timings=False), "on": DemandAnalyzer(timings=True)}
+    for analyzer in analyzers.values():
+        analyzer.analyze_batch(demands[:100])
+        analyzer.timings.reset()
+
+    paths = {
+        "analyze_demand": lambda analyzer: [analyzer.analyze_demand(demand) for demand in demands],
+        "analyze_batch": lambda analyzer: analyzer.analyze_batch(demands)
+    }
+    sample_cost, since_cost = instrumentation_cost()
+    sample_every = analyzers["on"].timings.sample_every
+    estimated_cost = {
+        "analyze_demand": size * (sample_cost + DEMAND_STAGES * since_cost / sample_every),
+        "analyze_batch": BATCH_STAGES * since_cost
+    }
+
+    print(f"⏱️  {size} demands, best of {rounds} rounds, sample() {sample_cost * 1e9:.0f} ns, "
+          f"since() {since_cost * 1e9:.0f} ns, per-item stages sampled 1/{sample_every}")
+    identical = True
+    for name, path in paths.items():
+        seconds, results = {}, {}
+        for index in range(rounds):
+            # ABBA 交替，减少先后顺序带来的偏差
+            for mode in (("off", "on") if index % 2 else ("on", "off")):
+                start = time.perf_counter()
+                results[mode] = path(analyzers[mode])
+                elapsed = time.perf_counter() - start
+                seconds[mode] = min(seconds.get(mode, elapsed), elapsed)
+        identical &= [comparable(a) for a in results["off"]] == [comparable(a) for a in results["on"]]
+        measured = seconds["on"] / seconds["off"] - 1
+        estimated = estimated_cost[name] / seconds["off"]
+        print(f"  {name:15s} off {size / seconds['off']:9,.0f}/sec   on {size / seconds['on']:9,.0f}/sec   "
+              f"measured {measured:+.2%}   estimated {estimated:.2%} {'✅' if estimated < 0.02 else '❌'}")
+
+    print(f"  identical results: {'✅' if identical else '❌'}")
+    print("  stages (timings on):")
+    for stage, stats in analyzers["on"].timings.snapshot().items():
+        print(f"    {stage:15s} n={stats['count']:7d}  mean {stats['mean_us']:9.2f} us  "
+              f"p50 {stats['p50_us']:9.2f} us  p99 {stats['p99_us']:9.2f} us  total {stats['total_ms']:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    run(size=args.size, rounds=args.rounds)
@@ -0,0 +1,99 @@
+"""需求批量写入基准 - 逐条 _save_to_database（每条一个事务）vs _save_batch（每批一条 upsert）
+
+在临时SQLite数据库中写入 --rows 条合成需求（逐条路径另写 --single-rows 条，按吞吐比较；
+约三成需求与前一条来自同一帖子，按自然键合并为一行）。然后把同一批需求再保存一遍（模拟重新爬取），
+校验表中行数不变、全部原地更新；最后混入一条坏行（problem 为空，违反 NOT NULL），
+校验整批失败后逐条重试只丢掉坏行。
+
+用法: python -m backend.benchmarks.bench_bulk_insert [--rows 20000] [--single-rows 2000] [--batch-size 500]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# 管道导入时即连接数据库：基准使用临时SQLite数据库和临时缓存目录，不触碰正式数据
+_WORK_DIR = tempfile.mkdtemp(prefix="bulk-insert-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_WORK_DIR, 'demands.sqlite3')}"
+os.environ["SCOUT_CACHE_DIR"] = os.path.join(_WORK_DIR, "cache")
+
+from backend.analysis.analysis_cache import AnalysisCache  # noqa: E402
+from backend.analysis.near_duplicates import NearDuplicateIndex  # noqa: E402
+from backend.benchmarks.bench_analyze_batch import make_demands  # noqa: E402
+from backend.database.database import db  # noqa: E402
+from backend.database.models import Demand  # noqa: E402
+from backend.utils.data_pipeline import DataPipeline  # noqa: E402
+
+
+def make_analyzed(pipeline: DataPipeline, size: int):
+    raw_demands = [dict(raw, demand_type="tool_request") for raw in make_demands(size)]
+    return [
+        {"raw": raw, "analysis": analysis, "recommendations": pipeline.analyzer.generate_recommendations(analysis)}
+        for raw, analysis in zip(raw_demands, pipeline.analyzer.analyze_batch(raw_demands))
+    ]
+
+
+def count_rows() -> int:
+    with db.get_session() as session:
+        return session.query(Demand).count()
+
+
+def run(rows: int = 20000, single_rows: int = 2000, batch_size: int = 500):
+    db.create_tables()
+    pipeline = DataPipeline(incremental=False, analysis_cache=AnalysisCache(), duplicate_index=NearDuplicateIndex(),
+                            save_batch_size=batch_size)
+    analyzed = make_analyzed(pipeline, single_rows + rows)
+    single, batched = analyzed[:single_rows], analyzed[single_rows:]
+
+    def save_batches(demands):
+        saved = []
+        for offset in range(0, len(demands), batch_size):
+            saved.extend(pipeline._save_batch([dict(demand) for demand in demands[offset:offset + batch_size]]))
+        return saved
+
+    start = time.perf_counter()
+    single_saved = sum(pipeline._save_to_database(dict(demand)) for demand in single)
+    single_seconds = time.perf_counter() - start
+
+    before = count_rows()
+    start = time.perf_counter()
+    batch_saved = len(save_batches(batched))
+    batch_seconds = time.perf_counter() - start
+    inserted = count_rows() - before
+    expected = len({demand["raw"]["source_post"]["url"] for demand in batched})
+
+    # 重新爬取：全部按自然键原地更新，不增加行
+    before = count_rows()
+    recrawled = save_batches(batched)
+    refreshed = sum(demand["refreshed"] for demand in recrawled)
+    upsert_ok = count_rows() == before and refreshed == len(batched)
+
+    # 混有坏行的一批：整批写入失败后逐条重试
+    mixed = [dict(demand) for demand in batched[:batch_size]]
+    bad = len(mixed) // 2
+    mixed[bad]["raw"] = dict(mixed[bad]["raw"], extracted_text=None)
+    mixed_saved = pipeline._save_batch(mixed)
+    fallback_ok = len(mixed_saved) == len(mixed) - 1
+
+    single_rate = single_saved / single_seconds
+    batch_rate = batch_saved / batch_seconds
+    print(f"💾 SQLite, batch size {batch_size}")
+    print(f"  per-row   {single_saved:6d} rows in {single_seconds:6.2f}s  ({single_rate:9,.0f} rows/sec)")
+    print(f"  batched   {batch_saved:6d} rows in {batch_seconds:6.2f}s  ({batch_rate:9,.0f} rows/sec)   "
+          f"speedup {batch_rate / single_rate:.1f}x")
+    print(f"  {inserted} rows inserted for {expected} distinct source items: {'✅' if inserted == expected else '❌'}")
+    print(f"  re-crawl: {refreshed}/{len(batched)} refreshed in place, row count unchanged: "
+          f"{'✅' if upsert_ok else '❌'}")
+    print(f"  bad row in a batch of {len(mixed)}: {len(mixed_saved)} saved by per-row fallback "
+          f"{'✅' if fallback_ok else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--single-rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    run(rows=args.rows, single_rows=args.single_rows, batch_size=args.batch_size)
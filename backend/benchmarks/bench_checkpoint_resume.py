@@ -0,0 +1,163 @@
+"""检查点续跑基准 - 中断的管道运行续跑时跳过已完成的页面、帖子和批次
+
+离线回放合成页面（含评论页，每个请求模拟 --latency 的网络延迟），需求保存到临时SQLite数据库。
+每种模式先完整运行一次作为基准，再模拟中途失败后续跑：
+  - 分阶段模式：保存到第 --crash-batch 批时进程被中断（KeyboardInterrupt）
+  - 流式模式：列表页第 --fail-page 页起抓取失败
+报告续跑抓取的列表页、评论页和分析的需求数，校验中断 + 续跑后保存的需求行数与完整运行相同
+（两次运行共用近似重复索引，与持久化索引的行为一致），并统计检查点写盘的次数和耗时。
+
+用法: python -m backend.benchmarks.bench_checkpoint_resume [--posts 300] [--latency 0.005] [--batch-size 5] [--crash-batch 3] [--fail-page 3]
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+
+# 管道导入时即连接数据库：基准使用临时SQLite数据库和临时缓存目录，不触碰正式数据
+_WORK_DIR = tempfile.mkdtemp(prefix="checkpoint-resume-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_WORK_DIR, 'demands.sqlite3')}"
+os.environ["SCOUT_CACHE_DIR"] = os.path.join(_WORK_DIR, "cache")
+
+from backend.analysis.analysis_cache import AnalysisCache  # noqa: E402
+from backend.analysis.near_duplicates import NearDuplicateIndex  # noqa: E402
+from backend.benchmarks.hn_fixtures import write_fixture_store  # noqa: E402
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler  # noqa: E402
+from backend.crawlers.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+from backend.crawlers.replay import FixtureStore  # noqa: E402
+from backend.database.database import db  # noqa: E402
+from backend.database.models import Demand  # noqa: E402
+from backend.utils.checkpoint import RunCheckpoint  # noqa: E402
+from backend.utils.data_pipeline import DataPipeline  # noqa: E402
+
+
+class CountingStore(FixtureStore):
+    """统计回放的列表页/评论页请求数；fail_page 起的列表页返回 404"""
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.fail_page = None
+        self.reset()
+
+    def reset(self):
+        self.listing = 0
+        self.items = 0
+
+    def get(self, url: str):
+        if "/item" in url:
+            self.items += 1
+        else:
+            self.listing += 1
+            page = int(url.rsplit("?p=", 1)[1]) if "?p=" in url else 1
+            if self.fail_page is not None and page >= self.fail_page:
+                return None
+        return super().get(url)
+
+
+def make_pipeline(store: CountingStore, latency: float, streaming: bool, batch_size: int, flush_seconds: float,
+                  duplicate_index: NearDuplicateIndex) -> DataPipeline:
+    checkpoint = RunCheckpoint(os.path.join(_WORK_DIR, "checkpoint.json"), flush_seconds=flush_seconds)
+    pipeline = DataPipeline(incremental=False, analysis_cache=AnalysisCache(), duplicate_index=duplicate_index,
+                            streaming=streaming, save_batch_size=batch_size, checkpoint=checkpoint)
+    pipeline.crawler = HackerNewsCrawler(use_cache=False, replay_store=store, replay_latency=latency,
+                                         max_comment_fetches=1000,
+                                         rate_limiter=AdaptiveRateLimiter(rate=10000, burst=10000, max_window=8))
+    return pipeline
+
+
+def count_rows() -> int:
+    with db.get_session() as session:
+        return session.query(Demand).count()
+
+
+def clear_demands():
+    with db.get_session() as session:
+        session.query(Demand).delete()
+
+
+def run_once(pipeline: DataPipeline, store: CountingStore, posts: int):
+    store.reset()
+    start = time.perf_counter()
+    try:
+        result = pipeline.run_hackernews_pipeline(max_posts=posts)
+    except KeyboardInterrupt:
+        result = {"status": "killed"}
+    return result, time.perf_counter() - start
+
+
+def report(label: str, result, seconds: float, store: CountingStore):
+    analyzed = result.get("stats", {}).get("demands_analyzed", "-")
+    print(f"    {label:12s} {result['status']:8s} {seconds:6.2f}s   listing pages {store.listing:3d}   "
+          f"comment pages {store.items:4d}   demands analyzed {analyzed}")
+
+
+def run(posts: int = 300, latency: float = 0.005, batch_size: int = 5, crash_batch: int = 3, fail_page: int = 3):
+    store = CountingStore(os.path.join(_WORK_DIR, "fixtures"))
+    write_fixture_store(store, total_pages=math.ceil(posts / 2 / HackerNewsCrawler.PAGE_SIZE), comments_per_item=20)
+    db.create_tables()
+    print(f"🔖 {posts} posts, {latency * 1000:.0f}ms per request")
+
+    for name, streaming in (("phased", False), ("streaming", True)):
+        print(f"  {name}")
+        clear_demands()
+        pipeline = make_pipeline(store, latency, streaming, batch_size, 5.0, NearDuplicateIndex())
+        full, seconds = run_once(pipeline, store, posts)
+        report("full run", full, seconds, store)
+        flushes = full["checkpoint"]
+        full_rows = count_rows()
+        full_items = store.items
+
+        # 中断：分阶段模式在第 crash_batch 批保存时被杀，流式模式从第 fail_page 页起抓取失败
+        clear_demands()
+        duplicate_index = NearDuplicateIndex()
+        pipeline = make_pipeline(store, latency, streaming, batch_size, 0, duplicate_index)
+        if streaming:
+            store.fail_page = fail_page
+        else:
+            save_batch = pipeline._save_batch
+            saved = []
+
+            def crashing_save(batch):
+                if len(saved) + 1 >= crash_batch:
+                    raise KeyboardInterrupt
+                saved.append(batch)
+                return save_batch(batch)
+            pipeline._save_batch = crashing_save
+        first, seconds = run_once(pipeline, store, posts)
+        report("interrupted", first, seconds, store)
+        first_pages = dict(pipeline.checkpoint.pages)
+        every_batch = pipeline.checkpoint.snapshot()
+        store.fail_page = None
+
+        pipeline = make_pipeline(store, latency, streaming, batch_size, 5.0, duplicate_index)
+        resumed, seconds = run_once(pipeline, store, posts)
+        report("resumed", resumed, seconds, store)
+        checkpoint = resumed["checkpoint"]
+
+        skipped = (store.items < full_items
+                   and resumed["stats"]["demands_analyzed"] < full["stats"]["demands_analyzed"])
+        rows = count_rows()
+        print(f"    resumed run {checkpoint['run_id']} skipped {resumed['crawl_stats']['resumed_posts']} finished posts "
+              f"(pages done before resuming: {first_pages}): {'✅' if skipped else '❌'}")
+        print(f"    interrupted + resumed saved {rows} rows, full run {full_rows}: {'✅' if rows == full_rows else '❌'}")
+        print(f"    checkpoint writes, full run (every 5s): {flushes['flushes']} in "
+              f"{flushes['flush_seconds'] * 1000:.1f}ms ({flushes['flush_seconds'] / full['stats']['pipeline_duration_seconds']:.2%} of the run)")
+        print(f"    checkpoint writes, interrupted run (every batch): {every_batch['flushes']} in "
+              f"{every_batch['flush_seconds'] * 1000:.1f}ms")
+        print(f"    checkpoint removed after the resumed run: "
+              f"{'✅' if not os.path.exists(pipeline.checkpoint.path) else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--crash-batch", type=int, default=3)
+    parser.add_argument("--fail-page", type=int, default=3)
+    args = parser.parse_args()
+
+    run(posts=args.posts, latency=args.latency, batch_size=args.batch_size, crash_batch=args.crash_batch,
+        fail_page=args.fail_page)
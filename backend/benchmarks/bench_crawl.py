@@ -0,0 +1,181 @@
+"""爬虫吞吐基准 - 离线回放录制页面运行完整的 crawl()，报告 pages/sec、posts/sec 和各阶段 p50/p99 耗时
+
+页面来源：
+  --fixtures DIR   使用录制的页面（RecordingAdapter 录制的 FixtureStore 目录）
+  默认             在临时目录生成一套合成页面
+传输方式：
+  --mode replay    进程内 ReplayAdapter（默认，只测爬虫本身）
+  --mode stub      本地 StubHNServer（包含真实的HTTP往返）
+
+用法:
+    python -m backend.benchmarks.bench_crawl [--posts 300] [--latency 0.02] [--repeat 5]
+    python -m backend.benchmarks.bench_crawl --check            # 与 baseline.json 比较，退化时退出码为1
+    python -m backend.benchmarks.bench_crawl --update-baseline  # 用本次结果更新 baseline.json
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+from typing import Dict, List
+
+from backend.benchmarks.hn_fixtures import write_fixture_store
+from backend.benchmarks.stub_server import StubHNServer
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler
+from backend.crawlers.rate_limiter import AdaptiveRateLimiter
+from backend.crawlers.replay import FixtureStore
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 越大越好的指标；其余（耗时）越小越好
+THROUGHPUT_METRICS = ("pages_per_sec", "posts_per_sec")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """最近秩法百分位"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def crawl_once(store: FixtureStore, mode: str, posts: int, latency: float, jitter: float) -> Dict:
+    # 基准只测爬虫本身，限流器放开到不成为瓶颈
+    limiter = AdaptiveRateLimiter(rate=10000, burst=10000, max_window=8)
+    server = None
+
+    if mode == "stub":
+        server = StubHNServer(latency=latency, jitter=jitter, fixtures=store).start()
+        crawler = HackerNewsCrawler(use_cache=False, rate_limiter=limiter)
+        crawler.BASE_URL = server.base_url
+    else:
+        crawler = HackerNewsCrawler(use_cache=False, rate_limiter=limiter, replay_store=store,
+                                    replay_latency=latency)
+        crawler.session.get_adapter("https://").jitter = jitter
+
+    try:
+        result = crawler.crawl(max_posts=posts, mark_seen=False)
+    finally:
+        if server:
+            server.stop()
+
+    stats = result["stats"]
+    if "error" in stats:
+        raise RuntimeError(f"crawl failed: {stats['error']}")
+
+    samples = {stage: list(values) for stage, values in crawler.latency_samples.items()}
+    duration = stats["crawl_duration_seconds"]
+    pages = len(samples["fetch"])
+
+    metrics = {
+        "pages": pages,
+        "posts": stats["total_posts"],
+        "demands": stats["total_demands_found"],
+        "duration_seconds": round(duration, 3),
+        "pages_per_sec": round(pages / duration, 1),
+        "posts_per_sec": round(stats["total_posts"] / duration, 1),
+    }
+    for stage, values in samples.items():
+        metrics[f"{stage}_p50_ms"] = round(percentile(values, 50) * 1000, 2)
+        metrics[f"{stage}_p99_ms"] = round(percentile(values, 99) * 1000, 2)
+    return metrics
+
+
+def run(posts: int = 300, latency: float = 0.02, jitter: float = 0.01, repeat: int = 5,
+        mode: str = "replay", fixtures: str = None) -> Dict:
+    if fixtures:
+        store = FixtureStore(fixtures)
+        source = fixtures
+    else:
+        # 两个列表页各 posts/2 条，每页30条
+        store = FixtureStore(tempfile.mkdtemp(prefix="hn-fixtures-"))
+        pages = math.ceil(posts / 2 / HackerNewsCrawler.PAGE_SIZE)
+        write_fixture_store(store, total_pages=pages)
+        source = "synthetic"
+
+    runs = [crawl_once(store, mode, posts, latency, jitter) for _ in range(repeat)]
+    # 取耗时居中的一次，避免偶发的慢/快运行影响结果
+    result = sorted(runs, key=lambda metrics: metrics["duration_seconds"])[len(runs) // 2]
+
+    config = {"mode": mode, "posts": posts, "latency": latency, "jitter": jitter, "fixtures": source}
+    print(f"🕷️  crawl() x {repeat}  mode={mode} posts={posts} latency={latency * 1000:.0f}ms "
+          f"jitter={jitter * 1000:.0f}ms fixtures={source} ({len(store)} pages)")
+    print(f"  {result['pages']} pages, {result['posts']} posts, {result['demands']} demands "
+          f"in {result['duration_seconds']:.2f}s (median run)")
+    print(f"  throughput: {result['pages_per_sec']:8.1f} pages/sec  {result['posts_per_sec']:8.1f} posts/sec")
+    for stage in ("fetch", "parse_listing", "parse_item"):
+        print(f"  {stage:14} p50 {result[f'{stage}_p50_ms']:8.2f} ms   p99 {result[f'{stage}_p99_ms']:8.2f} ms")
+
+    return {"config": config, "metrics": result, "spread_seconds": round(
+        statistics.pstdev(metrics["duration_seconds"] for metrics in runs), 3)}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, latency_floor_ms: float = 2.0) -> List[str]:
+    """与基线比较，返回退化的指标说明
+
+    只比较吞吐和p50；p99样本太少、波动大，只作参考。耗时差异小于 latency_floor_ms 的忽略。
+    stub 模式下替身服务器与爬虫在同一进程内争用GIL，各阶段耗时不稳定，只比较吞吐。
+    """
+    if current["config"] != baseline.get("config"):
+        print(f"⚠️  baseline config {baseline.get('config')} differs from this run, skipping comparison")
+        return []
+
+    regressions = []
+    for name, expected in baseline["metrics"].items():
+        actual = current["metrics"].get(name)
+        if actual is None or not expected:
+            continue
+        if name in THROUGHPUT_METRICS:
+            regressed = actual < expected * (1 - tolerance)
+        elif name.endswith("_p50_ms") and current["config"]["mode"] == "replay":
+            regressed = actual > expected * (1 + tolerance) and actual - expected > latency_floor_ms
+        else:
+            continue
+        if regressed:
+            regressions.append(f"{name}: {actual} vs baseline {expected}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="每个请求注入的延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.01, help="延迟抖动上限（秒）")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mode", choices=("replay", "stub"), default="replay")
+    parser.add_argument("--fixtures", help="录制页面目录（默认生成合成页面）")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的退化比例")
+    parser.add_argument("--check", action="store_true", help="与基线比较，退化时退出码为1")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    current = run(posts=args.posts, latency=args.latency, jitter=args.jitter, repeat=args.repeat,
+                  mode=args.mode, fixtures=args.fixtures)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        baselines[args.mode] = current
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"📌 baseline updated: {args.baseline}")
+    elif args.check:
+        if args.mode not in baselines:
+            print(f"⚠️  no baseline for mode={args.mode} in {args.baseline}")
+            sys.exit(0)
+        regressions = compare(current, baselines[args.mode], args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} metrics regressed beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ within {args.tolerance:.0%} of baseline")
@@ -0,0 +1,124 @@
+"""多数据源调度基准 - 两个调度实例同时调度同一批数据源（临时SQLite数据库，爬取为 --duration 秒的模拟任务）
+
+两个实例先各自加载数据源（看到相同的到期队列），再在各自的线程中并发调度。
+校验：每个数据源只被爬取一次（另一个实例抢占失败）、每个实例同时运行的任务不超过 --workers、
+全部爬取完后没有数据源再到期。最后用 --queue-sources 个未到期的数据源测量一次空调度的耗时
+（只看堆顶，与数据源数量无关）。
+
+用法: python -m backend.benchmarks.bench_crawl_scheduler [--sources 40] [--workers 3] [--duration 0.05] [--queue-sources 10000]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+# 调度器导入时即连接数据库：基准使用临时SQLite数据库，不触碰正式数据
+_WORK_DIR = tempfile.mkdtemp(prefix="crawl-scheduler-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_WORK_DIR, 'demands.sqlite3')}"
+os.environ["SCOUT_CACHE_DIR"] = os.path.join(_WORK_DIR, "cache")
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+from backend.database.database import db  # noqa: E402
+from backend.database.models import Source, generate_uuid  # noqa: E402
+from backend.utils.crawl_scheduler import CrawlScheduler  # noqa: E402
+
+
+def add_sources(count: int, last_crawled_at=None):
+    with db.get_session() as session:
+        session.execute(delete(Source))
+        session.execute(insert(Source), [
+            {"id": generate_uuid(), "name": f"Source {index}", "platform": "fake", "is_active": True,
+             "crawl_interval_hours": 1, "last_crawled_at": last_crawled_at}
+            for index in range(count)
+        ])
+
+
+def run(sources: int = 40, workers: int = 3, duration: float = 0.05, queue_sources: int = 10000):
+    db.create_tables()
+    add_sources(sources)
+
+    runs = Counter()
+    running = Counter()
+    peak = Counter()
+    lock = threading.Lock()
+
+    def make_runner(instance: str):
+        def crawl(source):
+            with lock:
+                runs[source["id"]] += 1
+                running[instance] += 1
+                peak[instance] = max(peak[instance], running[instance])
+            time.sleep(duration)
+            with lock:
+                running[instance] -= 1
+            return {"status": "success"}
+        return crawl
+
+    schedulers = {name: CrawlScheduler(database=db, runners={"fake": make_runner(name)}, max_workers=workers)
+                  for name in ("a", "b")}
+    for scheduler in schedulers.values():
+        scheduler.refresh()
+
+    def drive(scheduler: CrawlScheduler):
+        while True:
+            scheduler.run_pending()
+            with scheduler._lock:
+                if not scheduler._running and (not scheduler._heap or scheduler._heap[0][0] > scheduler.clock()):
+                    return
+            time.sleep(duration / 10)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=drive, args=(scheduler,)) for scheduler in schedulers.values()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = {name: scheduler.snapshot()["stats"] for name, scheduler in schedulers.items()}
+    once = len(runs) == sources and set(runs.values()) == {1}
+    capped = all(peak[name] <= workers for name in schedulers)
+    idle = sum(scheduler.run_pending() for scheduler in schedulers.values()) == 0
+    ideal = sources * duration / (2 * workers)
+
+    print(f"🗓️  {sources} sources, 2 schedulers x {workers} workers, {duration * 1000:.0f}ms per crawl")
+    for name in schedulers:
+        print(f"  scheduler {name}: claimed {stats[name]['claimed']:3d}  lost claims {stats[name]['lost_claims']:3d}  "
+              f"peak concurrent {peak[name]}")
+    print(f"  all crawls done in {elapsed:.2f}s (ideal {ideal:.2f}s)")
+    print(f"  every source crawled exactly once: {'✅' if once else '❌'}")
+    print(f"  concurrent crawls within the worker cap: {'✅' if capped else '❌'}")
+    print(f"  nothing due right after the crawls: {'✅' if idle else '❌'}")
+    for scheduler in schedulers.values():
+        scheduler.stop()
+
+    # 空调度（没有到期的数据源）的耗时
+    add_sources(queue_sources, last_crawled_at=datetime.utcnow() - timedelta(minutes=30))
+    scheduler = CrawlScheduler(database=db, runners={"fake": make_runner("c")}, max_workers=workers,
+                               refresh_seconds=float("inf"))
+    start = time.perf_counter()
+    scheduler.refresh()
+    refresh_ms = (time.perf_counter() - start) * 1000
+    ticks = 10000
+    start = time.perf_counter()
+    for _ in range(ticks):
+        scheduler.run_pending()
+    tick_us = (time.perf_counter() - start) / ticks * 1e6
+    scheduler.stop()
+    print(f"  {queue_sources} sources queued: refresh {refresh_ms:.1f}ms, idle tick {tick_us:.1f}µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=0.05)
+    parser.add_argument("--queue-sources", type=int, default=10000)
+    args = parser.parse_args()
+
+    run(sources=args.sources, workers=args.workers, duration=args.duration, queue_sources=args.queue_sources)
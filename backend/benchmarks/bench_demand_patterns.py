@@ -0,0 +1,81 @@
+"""需求模式基准 - 每条标题逐个 re.search vs 预编译的组合模式引擎（批量）
+
+同时比较只加载 default 模式集和加载全部模式集时的耗时，观察新增模式的边际成本。
+
+用法: python -m backend.benchmarks.bench_demand_patterns [--size 100000] [--batch 500]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from backend.benchmarks.hn_fixtures import SAMPLE_COMMENTS, SAMPLE_TITLES
+from backend.crawlers.demand_patterns import DemandPatternEngine, load_pattern_sets
+
+FILLER_WORDS = [
+    "rust", "postgres", "launch", "my", "side", "project", "for", "the", "kubernetes", "llm",
+    "startup", "why", "we", "moved", "to", "sqlite", "a", "faster", "compiler", "is", "dead",
+]
+
+
+def make_corpus(size: int, seed: int = 7):
+    """大约五分之一的文本带需求句式，其余是普通标题；部分评论包含换行"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        roll = rng.random()
+        if roll < 0.1:
+            text = rng.choice(SAMPLE_TITLES)
+        elif roll < 0.2:
+            text = rng.choice(SAMPLE_COMMENTS) + "\n" + rng.choice(SAMPLE_COMMENTS)
+        else:
+            text = " ".join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(4, 12)))
+        corpus.append(f"{text} #{i}".lower())
+    return corpus
+
+
+def legacy_match(text: str, patterns):
+    """原实现：每条文本对每个模式各调用一次 re.search"""
+    return [spec["demand_type"] for spec in patterns if re.search(spec["pattern"], text, re.IGNORECASE)]
+
+
+def time_engine(engine: DemandPatternEngine, corpus, batch: int):
+    start = time.perf_counter()
+    results = []
+    for offset in range(0, len(corpus), batch):
+        for matched in engine.match_batch(corpus[offset:offset + batch]):
+            results.append([spec["demand_type"] for spec in matched])
+    return time.perf_counter() - start, results
+
+
+def run(size: int = 100000, batch: int = 500):
+    corpus = make_corpus(size)
+    pattern_sets = load_pattern_sets()
+    configs = [("default",), tuple(pattern_sets)]
+
+    print(f"🧩 {size} texts, batch size {batch}")
+    for names in configs:
+        patterns = [spec for name in names for spec in pattern_sets[name]]
+        engine = DemandPatternEngine.from_config(pattern_sets=names)
+
+        start = time.perf_counter()
+        expected = [legacy_match(text, patterns) for text in corpus]
+        legacy_seconds = time.perf_counter() - start
+
+        engine_seconds, actual = time_engine(engine, corpus, batch)
+        demands = sum(len(matched) for matched in actual)
+
+        print(f"  sets={'+'.join(names)} ({len(patterns)} patterns, {demands} demands)")
+        print(f"    legacy (re.search x N): {legacy_seconds:7.2f}s  {size / legacy_seconds:10.0f} texts/sec")
+        print(f"    engine (batched):       {engine_seconds:7.2f}s  {size / engine_seconds:10.0f} texts/sec")
+        print(f"    speedup: {legacy_seconds / engine_seconds:.1f}x  identical: {'✅' if expected == actual else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    run(size=args.size, batch=args.batch)
@@ -0,0 +1,65 @@
+"""关键词匹配基准 - 逐关键词 `in` 扫描 vs 编译后的单次扫描匹配器
+
+用法: python -m backend.benchmarks.bench_keyword_matcher [--size 100000]
+"""
+
+import argparse
+import random
+import time
+
+from backend.analysis.keyword_matcher import DEFAULT_KEYWORD_DICTIONARIES, KeywordMatcher
+from backend.benchmarks.hn_fixtures import SAMPLE_COMMENTS, SAMPLE_TITLES
+
+FILLER_WORDS = [
+    "for", "my", "team", "open", "source", "real-time", "free", "cheap", "simple", "monitor",
+    "pricing", "mac", "linux", "subscription", "need", "urgent", "database", "startup", "launch",
+]
+
+
+def make_corpus(size: int, seed: int = 42):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(0, 8))]
+        text = f"{rng.choice(SAMPLE_TITLES)} {' '.join(words)} #{i}"
+        if rng.random() < 0.2:
+            text += " " + rng.choice(SAMPLE_COMMENTS)
+        corpus.append(text.lower())
+    return corpus
+
+
+def legacy_hits(text: str):
+    """原实现：每个词典、每个关键词各做一次子串扫描"""
+    return {
+        name: {group: sum(1 for keyword in keywords if keyword in text) for group, keywords in groups.items()}
+        for name, groups in DEFAULT_KEYWORD_DICTIONARIES.items()
+    }
+
+
+def run(size: int = 100000):
+    corpus = make_corpus(size)
+    # 关闭结果缓存，只比较扫描本身
+    matcher = KeywordMatcher(DEFAULT_KEYWORD_DICTIONARIES, cache_size=0)
+    keyword_count = sum(len(k) for groups in DEFAULT_KEYWORD_DICTIONARIES.values() for k in groups.values())
+
+    start = time.perf_counter()
+    expected = [legacy_hits(text) for text in corpus]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [matcher.match(text) for text in corpus]
+    matcher_seconds = time.perf_counter() - start
+
+    print(f"🔎 {size} titles, {keyword_count} keywords in {len(DEFAULT_KEYWORD_DICTIONARIES)} dictionaries")
+    print(f"  legacy  (keyword in text): {legacy_seconds:7.2f}s  {size / legacy_seconds:10.0f} texts/sec")
+    print(f"  matcher (single scan):     {matcher_seconds:7.2f}s  {size / matcher_seconds:10.0f} texts/sec")
+    print(f"  speedup: {legacy_seconds / matcher_seconds:.1f}x")
+    print(f"  identical hit counts: {'✅' if expected == actual else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    args = parser.parse_args()
+
+    run(size=args.size)
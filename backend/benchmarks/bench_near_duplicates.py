@@ -0,0 +1,97 @@
+"""近似重复索引基准 - 百万级已收录需求下的LSH查找延迟、召回率和误报率
+
+索引中先批量导入随机签名（模拟大量互不相似的历史需求，只占桶不产生候选），
+再插入 --corpus 条合成标题的真实签名。查询一半是这些标题的转帖（大小写、标点、
+个别词改动），一半是全新标题；分别报告计算签名+查找、仅查找的 p50/p99 耗时。
+
+用法: python -m backend.benchmarks.bench_near_duplicates [--stored 1000000] [--corpus 50000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from backend.analysis.near_duplicates import NearDuplicateIndex
+from backend.benchmarks.bench_crawl import percentile
+
+BULK_CHUNK = 100000
+
+
+def make_titles(count: int, rng: random.Random, vocabulary):
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 12))) for _ in range(count)]
+
+
+def repost(title: str, rng: random.Random, vocabulary) -> str:
+    """转帖：换一个词或在末尾加一个词，再改大小写和标点"""
+    words = title.split()
+    if rng.random() < 0.5:
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    else:
+        words.append(rng.choice(vocabulary))
+    return f"Ask HN: {' '.join(words).capitalize()}?"
+
+
+def run(stored: int = 1000000, corpus: int = 50000, queries: int = 2000, seed: int = 5):
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice('bcdfghjklmnpqrstvwz')}{rng.choice('aeiou')}{i:x}" for i in range(5000)]
+    titles = make_titles(corpus, rng, vocabulary)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="near-duplicates-"), NearDuplicateIndex.FILE_NAME)
+    index = NearDuplicateIndex(path=path)
+
+    start = time.perf_counter()
+    generator = np.random.RandomState(seed)
+    for offset in range(0, max(0, stored - corpus), BULK_CHUNK):
+        count = min(BULK_CHUNK, stored - corpus - offset)
+        signatures = generator.randint(0, 2 ** 32, size=(count, index.hasher.num_perm), dtype=np.uint64)
+        index.add_signatures([f"bulk-{offset + i}" for i in range(count)], signatures.astype(np.uint32))
+    bulk_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.add_many((f"title-{i}", title) for i, title in enumerate(titles))
+    insert_seconds = time.perf_counter() - start
+
+    picks = rng.sample(range(corpus), queries // 2)
+    cases = [(repost(titles[i], rng, vocabulary), f"title-{i}") for i in picks]
+    cases += [(title, None) for title in make_titles(queries - len(cases), rng, vocabulary)]
+    rng.shuffle(cases)
+
+    total, lookup = [], []
+    found = false_positives = 0
+    for text, expected in cases:
+        start = time.perf_counter()
+        signature = index.hasher.signature(text)
+        middle = time.perf_counter()
+        match = index.query_signature(signature)
+        end = time.perf_counter()
+        total.append(end - start)
+        lookup.append(end - middle)
+        if expected is not None:
+            found += match is not None and match[0] == expected
+        else:
+            false_positives += match is not None
+
+    reposts = len(picks)
+    print(f"🧬 {len(index)} stored demands ({corpus} real titles), {queries} queries, "
+          f"{os.path.getsize(path) / 2 ** 20:.0f} MiB on disk")
+    print(f"  bulk load {bulk_seconds:7.1f}s   insert {corpus} titles {insert_seconds:6.2f}s "
+          f"({corpus / insert_seconds:,.0f}/sec)")
+    print(f"  signature + lookup  p50 {percentile(total, 50) * 1000:6.3f} ms   p99 {percentile(total, 99) * 1000:6.3f} ms")
+    print(f"  lookup only         p50 {percentile(lookup, 50) * 1000:6.3f} ms   p99 {percentile(lookup, 99) * 1000:6.3f} ms")
+    print(f"  reposts found {found}/{reposts} ({found / reposts:.1%})   "
+          f"false positives {false_positives}/{queries - reposts}")
+    index.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stored", type=int, default=1000000)
+    parser.add_argument("--corpus", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    run(stored=args.stored, corpus=args.corpus, queries=args.queries)
@@ -0,0 +1,53 @@
+"""多进程分析扩展性基准 - ParallelAnalyzer 在 1/2/4/8 个工作进程下的吞吐
+
+每个进程数先预热一次进程池（进程启动和分析器初始化不计入），再计时分析整批需求，
+并校验结果与单进程 analyze_batch 完全一致、顺序不变。加速比受机器CPU核数限制。
+
+用法: python -m backend.benchmarks.bench_parallel_analysis [--size 100000] [--chunk-size 500] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import time
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.parallel import ParallelAnalyzer
+from backend.benchmarks.bench_analyze_batch import comparable, make_demands
+
+
+def run(size: int = 100000, chunk_size: int = 500, workers=(1, 2, 4, 8)):
+    demands = make_demands(size)
+    single = DemandAnalyzer()
+    # 先完整跑一遍：匹配器的缓存在进程内共享，fork 出的工作进程也会继承，各组对比的起点相同
+    single.analyze_batch(demands)
+
+    start = time.perf_counter()
+    expected = single.analyze_batch(demands)
+    single_seconds = time.perf_counter() - start
+    expected = [comparable(analysis) for analysis in expected]
+
+    print(f"🧮 {size} demands, chunk size {chunk_size}, {os.cpu_count()} CPUs")
+    print(f"  single process     {single_seconds:7.2f}s   {size / single_seconds:10,.0f} demands/sec")
+    for count in workers:
+        with ParallelAnalyzer(workers=count, chunk_size=chunk_size) as analyzer:
+            # 进程数大于1时每个进程至少分到一块，保证所有工作进程都已启动
+            analyzer.analyze_batch(demands[:chunk_size * count + 1])
+
+            start = time.perf_counter()
+            results = analyzer.analyze_batch(demands)
+            seconds = time.perf_counter() - start
+
+        identical = [comparable(analysis) for analysis in results] == expected
+        print(f"  {count:2} workers         {seconds:7.2f}s   "
+              f"{size / seconds:10,.0f} demands/sec   speedup {single_seconds / seconds:.1f}x   "
+              f"identical {'✅' if identical else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    run(size=args.size, chunk_size=args.chunk_size, workers=args.workers)
@@ -0,0 +1,53 @@
+"""列表页解析基准 - 比较 soup 与 lxml 解析器后端的吞吐量（posts/sec）
+
+用法: python -m backend.benchmarks.bench_parser [--pages 50] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from backend.benchmarks.hn_fixtures import make_listing_page
+from backend.crawlers.hn_parsers import PARSERS
+
+
+def run(pages: int = 50, repeat: int = 3):
+    documents = [make_listing_page(page=p, total_pages=pages) for p in range(1, pages + 1)]
+
+    results = {}
+    for name, parser_cls in PARSERS.items():
+        parser = parser_cls()
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parsed = [parser.parse(html) for html in documents]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        total_posts = sum(len(posts) for posts, _ in parsed)
+        results[name] = {
+            "posts": total_posts,
+            "seconds": best,
+            "posts_per_sec": total_posts / best,
+            "output": parsed
+        }
+
+    # 两个后端的解析结果必须完全一致
+    identical = results["soup"]["output"] == results["lxml"]["output"]
+
+    print(f"📄 Parsed {pages} listing pages x {repeat} runs (best run shown)")
+    for name, result in results.items():
+        print(f"  {name:5} {result['posts']:6d} posts  {result['seconds'] * 1000:8.1f} ms  "
+              f"{result['posts_per_sec']:10.0f} posts/sec")
+    print(f"  speedup (lxml vs soup): {results['soup']['seconds'] / results['lxml']['seconds']:.1f}x")
+    print(f"  identical output: {'✅' if identical else '❌'}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(pages=args.pages, repeat=args.repeat)
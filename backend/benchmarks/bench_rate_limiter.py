@@ -0,0 +1,59 @@
+"""限流器验证 - 在注入延迟和错误的本地替身服务器上运行爬虫，观察AIMD窗口和限流计数
+
+用法: python -m backend.benchmarks.bench_rate_limiter [--max-concurrent 3] [--error-rate 0.05]
+"""
+
+import argparse
+import json
+import time
+
+from backend.benchmarks.stub_server import StubHNServer
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler
+from backend.crawlers.rate_limiter import AdaptiveRateLimiter
+
+
+def run(max_posts: int = 120, latency: float = 0.05, error_rate: float = 0.05,
+        max_concurrent: int = 3, workers: int = 8):
+    server = StubHNServer(
+        latency=latency,
+        jitter=latency / 2,
+        error_rate=error_rate,
+        max_concurrent=max_concurrent,
+        overload_latency=latency,
+        retry_after=0.2
+    ).start()
+
+    try:
+        limiter = AdaptiveRateLimiter(rate=50, burst=20, max_window=workers, backoff_base=0.1)
+        crawler = HackerNewsCrawler(
+            concurrency=workers,
+            comment_workers=workers,
+            use_cache=False,
+            rate_limiter=limiter
+        )
+        crawler.BASE_URL = server.base_url
+
+        start = time.perf_counter()
+        result = crawler.crawl(max_posts=max_posts)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    stats = result["stats"]
+    print(f"🕷️  Crawled {stats.get('total_posts', 0)} posts in {elapsed:.2f}s")
+    print(f"   server: {json.dumps(server.get_stats())}")
+    print(f"   limiter: {json.dumps(stats.get('rate_limit'), indent=2)}")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-posts", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--max-concurrent", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    run(max_posts=args.max_posts, latency=args.latency, error_rate=args.error_rate,
+        max_concurrent=args.max_concurrent, workers=args.workers)
@@ -0,0 +1,123 @@
+"""内存基准 - 50k帖子的爬取结果用嵌套字典 vs 紧凑记录（Post / RawDemand / Analysis）保存时的内存占用
+
+两种表示都走同样的解析、需求匹配和分析流程，只比较最终保留下来的对象占用（tracemalloc）。
+
+用法: python -m backend.benchmarks.bench_records [--posts 50000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.benchmarks.hn_fixtures import make_listing_page
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler
+from backend.crawlers.hn_parsers import get_parser
+
+
+def legacy_post(crawler: HackerNewsCrawler, fields):
+    """原来的帖子字典（每个帖子各自生成抓取时间）"""
+    url = fields["url"]
+    if url.startswith('item?'):
+        url = f"{crawler.BASE_URL}/{url}"
+    return {
+        "title": fields["title"],
+        "url": url,
+        "score": fields["score"],
+        "comments": fields["comments"],
+        "user": fields["user"],
+        "posted_time": fields["posted_time"],
+        "platform": "hackernews",
+        "crawled_at": datetime.utcnow().isoformat(),
+        "type": crawler._classify_post(fields["title"]),
+        "item_id": fields["item_id"]
+    }
+
+
+def build_legacy(crawler, analyzer, rows):
+    posts = [legacy_post(crawler, fields) for fields in rows]
+
+    demands = []
+    texts = [post["title"].lower() for post in posts]
+    for post, text, matched in zip(posts, texts, crawler.demand_patterns.match_batch(texts)):
+        for spec in matched:
+            demands.append({
+                "source_post": post,
+                "demand_type": spec["demand_type"],
+                "extracted_text": text,
+                "confidence": 0.7,
+                "extracted_at": datetime.utcnow().isoformat(),
+                "patterns_found": [spec["pattern"]]
+            })
+
+    analyses = []
+    for demand in demands:
+        record = analyzer.analyze_demand(demand)
+        analyses.append({
+            "tool_type": record.tool_type,
+            "payment_potential": record.payment_potential,
+            "technical_complexity": record.technical_complexity,
+            "keywords": record.keywords,
+            "scores": record.scores,
+            "analyzed_at": record.analyzed_at,
+            "confidence": record.confidence,
+            "source_info": record.source_info
+        })
+    return posts, demands, analyses
+
+
+def build_records(crawler, analyzer, pages):
+    posts = []
+    for page_rows in pages:
+        crawled_at = datetime.utcnow().isoformat()
+        posts.extend(crawler._build_post(fields, crawled_at) for fields in page_rows)
+
+    demands = crawler.extract_demands_from_posts(posts)
+    analyses = [analyzer.analyze_demand(demand) for demand in demands]
+    return posts, demands, analyses
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+
+def run(posts: int = 50000):
+    per_page = 30
+    total_pages = -(-posts // per_page)
+    parser = get_parser("lxml")
+    pages = [parser.parse(make_listing_page(page=p, per_page=per_page, total_pages=total_pages))[0]
+             for p in range(1, total_pages + 1)]
+    rows = [fields for page_rows in pages for fields in page_rows]
+
+    crawler = HackerNewsCrawler(use_cache=False, crawl_comments=False)
+    analyzer = DemandAnalyzer()
+
+    print(f"🧠 {len(rows)} posts")
+    results = {}
+    for name, build in (("dicts", lambda: build_legacy(crawler, analyzer, rows)),
+                        ("records", lambda: build_records(crawler, analyzer, pages))):
+        (kept_posts, demands, analyses), retained, peak, elapsed = measure(build)
+        results[name] = retained
+        print(f"  {name:8} {len(kept_posts)} posts, {len(demands)} demands, {len(analyses)} analyses: "
+              f"retained {retained / 1e6:7.1f} MB  peak {peak / 1e6:7.1f} MB  ({elapsed:.1f}s)")
+        del kept_posts, demands, analyses
+
+    print(f"  retained memory reduction: {(1 - results['records'] / results['dicts']) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--posts", type=int, default=50000)
+    args = arg_parser.parse_args()
+
+    run(posts=args.posts)
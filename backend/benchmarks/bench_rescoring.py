@@ -0,0 +1,122 @@
+"""批量重新评分基准 - 在临时SQLite数据库中写入 --rows 条需求，修改权重后运行 rescore_demands
+
+报告重新评分的吞吐和进程内存峰值的增量（分块流式处理，不随行数增长），
+并抽样用逐条评分（_calculate_scores）和 generate_recommendations 校验写回的评分和推荐字段。
+
+用法: python -m backend.benchmarks.bench_rescoring [--rows 1000000] [--chunk-size 5000]
+"""
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.vectorized import score_batch
+from backend.benchmarks.bench_keyword_matcher import make_corpus
+from backend.database.models import Base, Demand
+from backend.utils.rescoring import DERIVED_COLUMNS, SCORE_COLUMNS, rescore_demands
+
+INSERT_CHUNK = 20000
+
+
+class TemporaryDatabase:
+    """临时SQLite数据库，接口与 Database 相同（get_session）"""
+
+    def __init__(self):
+        path = os.path.join(tempfile.mkdtemp(prefix="rescoring-"), "demands.sqlite3")
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        Base.metadata.create_all(bind=self.engine)
+
+    @contextmanager
+    def get_session(self):
+        session = self.SessionLocal()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def populate(database: TemporaryDatabase, analyzer: DemandAnalyzer, rows: int):
+    """按当前权重写入需求（文本来自合成语料，评分和推荐字段与管道写入时相同）"""
+    for offset in range(0, rows, INSERT_CHUNK):
+        texts = make_corpus(min(INSERT_CHUNK, rows - offset), seed=offset)
+        labels, scores = score_batch(analyzer, texts)
+        with database.get_session() as session:
+            session.execute(insert(Demand), [
+                dict(
+                    {column: item[name] for name, column in SCORE_COLUMNS.items()},
+                    **derived_values(analyzer, label, item),
+                    id=f"{offset + i:08d}", title=text[:500], description=text, problem=text,
+                    is_high_potential=item["overall"] >= analyzer.high_potential_threshold
+                )
+                for i, (text, label, item) in enumerate(zip(texts, labels, scores))
+            ])
+
+
+def derived_values(analyzer: DemandAnalyzer, label, scores):
+    tool_type, payment_potential, complexity = label
+    analysis = {"tool_type": tool_type, "payment_potential": payment_potential,
+                "technical_complexity": complexity, "scores": scores}
+    recommendations = analyzer.generate_recommendations(analysis)
+    return {name: get(analysis, recommendations) for name, (get, _) in DERIVED_COLUMNS.items()}
+
+
+def run(rows: int = 1000000, chunk_size: int = 5000, samples: int = 1000):
+    database = TemporaryDatabase()
+
+    start = time.perf_counter()
+    populate(database, DemandAnalyzer(), rows)
+    populate_seconds = time.perf_counter() - start
+
+    reweighted = DemandAnalyzer(scoring_config={"weights": {
+        "demand_strength": 0.35, "market_size": 0.15, "payment_willingness": 0.30,
+        "technical_feasibility": 0.10, "passive_income_fit": 0.10
+    }})
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = rescore_demands(database=database, analyzer=reweighted, chunk_size=chunk_size)
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    ids = [f"{i:08d}" for i in random.Random(3).sample(range(rows), min(samples, rows))]
+    with database.get_session() as session:
+        stored = session.execute(
+            select(Demand.problem, Demand.overall_score, Demand.is_high_potential,
+                   *[getattr(Demand, name) for name in DERIVED_COLUMNS]).where(Demand.id.in_(ids))
+        ).all()
+    mismatches = 0
+    for problem, overall, high, *derived in stored:
+        text = problem.lower()
+        hits = reweighted.matcher.match(text)
+        tool_type = reweighted._classify_tool_type(text, hits)
+        payment = reweighted._assess_payment_potential(text, hits)
+        complexity = reweighted._assess_complexity(text, hits)
+        scores = reweighted._calculate_scores(text, tool_type, payment, complexity, hits)
+        expected = scores["overall"]
+        mismatches += (overall != expected or high != (expected >= reweighted.high_potential_threshold)
+                       or derived != list(derived_values(reweighted, (tool_type, payment, complexity), scores).values()))
+
+    print(f"⚖️  {rows} demands (populated in {populate_seconds:.1f}s), chunk size {chunk_size}")
+    print(f"  rescored {result['scanned']} in {result['duration_seconds']:.1f}s "
+          f"({result['scanned'] / result['duration_seconds']:,.0f} rows/sec), {result['updated']} rows changed")
+    print(f"  peak RSS growth during rescoring: {rss_growth / 1024:.1f} MiB")
+    print(f"  sampled {len(stored)} rows, matches per-item scoring: {'✅' if not mismatches else f'❌ {mismatches}'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    run(rows=args.rows, chunk_size=args.chunk_size)
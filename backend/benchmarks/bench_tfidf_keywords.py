@@ -0,0 +1,75 @@
+"""TF-IDF关键词基准 - 逐条词频（Counter）vs 整批稀疏TF-IDF
+
+按批次输入合成需求文本（模拟多次爬取持续累积语料），报告两种方式的吞吐、
+关键词中语料高频词（前20个）所占比例，以及词表保存/重新加载与重建的耗时对比。
+
+用法: python -m backend.benchmarks.bench_tfidf_keywords [--size 50000] [--batch 1000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.tfidf_keywords import TfidfKeywordExtractor
+from backend.benchmarks.bench_keyword_matcher import make_corpus
+
+
+def common_share(keywords, common) -> float:
+    total = sum(len(words) for words in keywords)
+    return sum(word in common for words in keywords for word in words) / max(1, total)
+
+
+def run(size: int = 50000, batch: int = 1000):
+    texts = [text.lower() for text in make_corpus(size)]
+    batches = [texts[i:i + batch] for i in range(0, len(texts), batch)]
+    analyzer = DemandAnalyzer()
+
+    start = time.perf_counter()
+    frequency = [analyzer._extract_keywords(text) for text in texts]
+    frequency_seconds = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(prefix="tfidf-"), TfidfKeywordExtractor.FILE_NAME)
+    extractor = TfidfKeywordExtractor(path=path)
+    tfidf_analyzer = DemandAnalyzer(keyword_extractor=extractor)
+    start = time.perf_counter()
+    tfidf = [keywords for texts_batch in batches for keywords in tfidf_analyzer.extract_keywords_batch(texts_batch)]
+    tfidf_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extractor.save()
+    save_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    reloaded = TfidfKeywordExtractor(path=path)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    rebuilt = TfidfKeywordExtractor()
+    for texts_batch in batches:
+        rebuilt.extract_batch([analyzer._keyword_tokens(text) for text in texts_batch])
+    rebuild_seconds = time.perf_counter() - start
+
+    word_counts = Counter(token for text in texts for token in set(analyzer._keyword_tokens(text)))
+    common = {word for word, _ in word_counts.most_common(20)}
+    consistent = (reloaded.terms == extractor.terms and reloaded.df.tolist() == extractor.df.tolist()
+                  and reloaded.n_docs == extractor.n_docs)
+
+    print(f"🏷️  {size} texts in batches of {batch}, vocabulary {len(extractor)} terms")
+    print(f"  per-text Counter   {frequency_seconds:7.2f}s   {size / frequency_seconds:10,.0f} texts/sec   "
+          f"common words in keywords {common_share(frequency, common):.1%}")
+    print(f"  sparse TF-IDF      {tfidf_seconds:7.2f}s   {size / tfidf_seconds:10,.0f} texts/sec   "
+          f"common words in keywords {common_share(tfidf, common):.1%}")
+    print(f"  vocabulary save {save_seconds * 1000:.1f} ms, reload {load_seconds * 1000:.1f} ms, "
+          f"rebuild {rebuild_seconds * 1000:.1f} ms   reloaded identical: {'✅' if consistent else '❌'}")
+    print(f"  example: {texts[0]!r}")
+    print(f"    frequency {frequency[0][:5]}   tfidf {tfidf[0][:5]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(size=args.size, batch=args.batch)
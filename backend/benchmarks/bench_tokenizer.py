@@ -0,0 +1,88 @@
+"""分词基准 - 冷启动导入耗时和分词吞吐（正则分词器 vs NLTK word_tokenize）
+
+导入耗时在新的子进程中测量，避免模块缓存影响；吞吐按 tokens/sec 计算，
+并统计两种分词器提取出的关键词完全一致的比例。
+
+用法: python -m backend.benchmarks.bench_tokenizer [--size 20000] [--imports 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from backend.analysis.tokenizer import ENGLISH_STOPWORDS, RegexTokenizer
+from backend.benchmarks.bench_keyword_matcher import make_corpus
+
+
+def import_seconds(module: str, repeat: int) -> float:
+    """在新的解释器中导入模块，取多次的中位数"""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        samples.append(float(output.stdout.strip()))
+    return statistics.median(samples)
+
+
+def nltk_tokenize():
+    """NLTK的 word_tokenize；没有 punkt 语料时改用不分句的 NLTKWordTokenizer"""
+    try:
+        from nltk.tokenize import word_tokenize
+        word_tokenize("warm up")
+        return word_tokenize, "word_tokenize"
+    except ImportError:
+        return None, "not installed"
+    except LookupError:
+        from nltk.tokenize import NLTKWordTokenizer
+        return NLTKWordTokenizer().tokenize, "NLTKWordTokenizer (punkt missing)"
+
+
+def keywords(tokens, top_n: int = 10):
+    # 与 DemandAnalyzer._extract_keywords 相同的过滤，两种分词器共用同一停用词表
+    filtered = [token for token in tokens if token.isalnum() and token not in ENGLISH_STOPWORDS]
+    counts = {}
+    for token in filtered:
+        counts[token] = counts.get(token, 0) + 1
+    return sorted(counts, key=lambda token: -counts[token])[:top_n]
+
+
+def throughput(tokenize, texts):
+    start = time.perf_counter()
+    results = [tokenize(text) for text in texts]
+    seconds = time.perf_counter() - start
+    return results, sum(len(tokens) for tokens in results) / seconds
+
+
+def run(size: int = 20000, imports: int = 5):
+    print(f"📥 cold import (median of {imports})")
+    for module in ("backend.analysis.demand_analyzer", "nltk"):
+        try:
+            print(f"  {module:34} {import_seconds(module, imports) * 1000:8.1f} ms")
+        except subprocess.CalledProcessError:
+            print(f"  {module:34}   failed")
+
+    texts = [text.lower() for text in make_corpus(size)]
+    regex_tokens, regex_rate = throughput(RegexTokenizer().tokenize, texts)
+    print(f"✂️  {size} texts")
+    print(f"  regex   {regex_rate:12,.0f} tokens/sec")
+
+    tokenize, label = nltk_tokenize()
+    if tokenize is None:
+        print(f"  nltk    {label}")
+        return
+
+    nltk_tokens, nltk_rate = throughput(tokenize, texts)
+    agree = sum(keywords(a) == keywords(b) for a, b in zip(regex_tokens, nltk_tokens))
+    print(f"  nltk    {nltk_rate:12,.0f} tokens/sec   ({label})")
+    print(f"  speedup {regex_rate / nltk_rate:.1f}x   identical keywords: {agree / len(texts):.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--imports", type=int, default=5)
+    args = parser.parse_args()
+
+    run(size=args.size, imports=args.imports)
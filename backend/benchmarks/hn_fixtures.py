@@ -0,0 +1,141 @@
+"""合成HN页面 - 生成与 news.ycombinator.com 结构一致的列表页，用于离线基准测试"""
+
+import random
+import re
+import zlib
+from typing import Iterable, List
+
+SAMPLE_TITLES = [
+    "Show HN: I built a tool to automate invoice reminders for freelancers",
+    "Ask HN: Is there a tool for syncing Google Sheets to Notion?",
+    "Ask HN: Looking for a dashboard that monitors cron jobs",
+    "Ask HN: How do you handle database backups for side projects?",
+    "The problem with SaaS pricing is that nobody reads the page",
+    "Show HN: A CLI app for managing Postgres migrations",
+    "Show HN: Open source browser extension that blocks cookie banners",
+    "Why is my Rust build so slow?",
+    "Show HN: I made a simple API for real-time currency rates",
+    "Ask HN: What do you use for analytics on a small website?",
+    "Launch HN: Scheduling automation for dental clinics",
+    "Ask HN: Need advice on pricing a B2B subscription service",
+]
+
+
+def make_listing_page(page: int = 1, per_page: int = 30, total_pages: int = 5,
+                      seed: int = 0, base_id: int = 40000000) -> str:
+    """生成第 page 页的列表HTML（page 从1开始）"""
+    rng = random.Random(seed * 1000 + page)
+    rows: List[str] = []
+
+    for i in range(per_page):
+        item_id = base_id - (page - 1) * per_page - i
+        title = f"{rng.choice(SAMPLE_TITLES)} ({item_id})"
+        score = rng.randint(1, 500)
+        comments = rng.randint(0, 200)
+        user = f"user{rng.randint(1, 5000)}"
+        rank = (page - 1) * per_page + i + 1
+
+        rows.append(
+            f'<tr class="athing submission" id="{item_id}">'
+            f'<td align="right" valign="top" class="title"><span class="rank">{rank}.</span></td>'
+            f'<td valign="top" class="votelinks"><center><a id="up_{item_id}" href="vote?id={item_id}&amp;how=up">'
+            f'<div class="votearrow" title="upvote"></div></a></center></td>'
+            f'<td class="title"><span class="titleline"><a class="titlelink" href="item?id={item_id}">{title}</a>'
+            f'</span></td></tr>\n'
+            f'<tr><td colspan="2"></td><td class="subtext"><span class="subline">'
+            f'<span class="score" id="score_{item_id}">{score} points</span> by '
+            f'<a href="user?id={user}" class="hnuser">{user}</a> '
+            f'<span class="age" title="2024-01-01T00:00:00"><a href="item?id={item_id}">{rng.randint(1, 23)} hours ago</a></span> '
+            f'<span id="unv_{item_id}"></span> | <a href="hide?id={item_id}&amp;goto=show">hide</a> | '
+            f'<a href="item?id={item_id}">{comments}&nbsp;comments</a></span></td></tr>\n'
+            f'<tr class="spacer" style="height:5px"></tr>\n'
+        )
+
+    more = ""
+    if page < total_pages:
+        more = (f'<tr class="morespace" style="height:10px"></tr><tr><td colspan="2"></td>'
+                f'<td class="title"><a href="?p={page + 1}" class="morelink" rel="next">More</a></td></tr>')
+
+    return (
+        '<html lang="en" op="show"><head><meta name="referrer" content="origin">'
+        '<title>Show | Hacker News</title></head><body><center>'
+        '<table id="hnmain" border="0" cellpadding="0" cellspacing="0" width="85%" bgcolor="#f6f6ef">'
+        '<tr><td bgcolor="#ff6600"><table border="0" cellpadding="0" cellspacing="0" width="100%">'
+        '<tr><td><a href="news">Hacker News</a></td></tr></table></td></tr>'
+        '<tr id="pagespace" title="Show" style="height:10px"></tr><tr><td>'
+        '<table border="0" cellpadding="0" cellspacing="0" class="itemlist">\n'
+        + "".join(rows) + more +
+        '</table></td></tr></table></center></body></html>'
+    )
+
+
+SAMPLE_COMMENTS = [
+    "I'm looking for a tool that tracks invoices across Stripe and PayPal.",
+    "Is there a service for monitoring SSL certificate expiry across domains?",
+    "How do you handle on-call rotations in a tiny team?",
+    "The problem with most analytics dashboards is that they are way too complex.",
+    "We built an internal script for this, happy to share.",
+    "This looks great, congrats on the launch!",
+    "Pricing seems reasonable, I would pay for a team plan.",
+    "Have you considered an open source version?",
+]
+
+
+def make_item_page(item_id: int, n_comments: int = 50, seed: int = 0) -> str:
+    """生成帖子详情页（含嵌套评论树）"""
+    rng = random.Random(seed * 1000003 + item_id)
+    rows: List[str] = []
+    depth = 0
+
+    for i in range(n_comments):
+        comment_id = item_id * 1000 + i + 1
+        # 随机生成下一条评论的缩进（最多比上一条深一层）
+        depth = rng.randint(0, depth + 1) if i else 0
+        user = f"user{rng.randint(1, 5000)}"
+        text = rng.choice(SAMPLE_COMMENTS)
+
+        rows.append(
+            f'<tr class="athing comtr" id="{comment_id}"><td><table border="0"><tr>'
+            f'<td class="ind" indent="{depth}"><img src="s.gif" height="1" width="{depth * 40}"></td>'
+            f'<td valign="top" class="votelinks"><center><a id="up_{comment_id}" href="vote?id={comment_id}&amp;how=up">'
+            f'<div class="votearrow" title="upvote"></div></a></center></td>'
+            f'<td class="default"><div style="margin-top:2px; margin-bottom:-10px;"><span class="comhead">'
+            f'<a href="user?id={user}" class="hnuser">{user}</a> '
+            f'<span class="age" title="2024-01-01T00:00:00"><a href="item?id={comment_id}">{rng.randint(1, 23)} hours ago</a></span>'
+            f'</span></div><br><div class="comment"><div class="commtext c00">{text}'
+            f'<p>{rng.choice(SAMPLE_COMMENTS)}</p></div>'
+            f'<div class="reply"><p><font size="1"><u><a href="reply?id={comment_id}">reply</a></u></font></p></div>'
+            f'</div></td></tr></table></td></tr>\n'
+        )
+
+    return (
+        '<html lang="en" op="item"><head><title>Hacker News</title></head><body><center>'
+        '<table id="hnmain" border="0" cellpadding="0" cellspacing="0" width="85%" bgcolor="#f6f6ef">'
+        f'<tr><td><table class="fatitem" border="0"><tr class="athing submission" id="{item_id}">'
+        f'<td class="title"><span class="titleline"><a href="item?id={item_id}">Item {item_id}</a></span></td></tr>'
+        '</table><br><table border="0" class="comment-tree">\n'
+        + "".join(rows) +
+        '</table></td></tr></table></center></body></html>'
+    )
+
+
+def feed_base_id(path: str) -> int:
+    """每个列表页路径使用不同的id区间（crc32在不同进程间稳定）"""
+    return 40000000 - (zlib.crc32(path.encode()) % 1000) * 10000
+
+
+def write_fixture_store(store, feed_paths: Iterable[str] = ("/show", "/ask"), total_pages: int = 5,
+                        comments_per_item: int = 50, seed: int = 0) -> int:
+    """生成一套可回放的合成页面（列表页各分页 + 每个帖子的详情页），返回页面数"""
+    written = 0
+    for path in feed_paths:
+        for page in range(1, total_pages + 1):
+            html = make_listing_page(page=page, total_pages=total_pages, seed=seed, base_id=feed_base_id(path))
+            store.put(path if page == 1 else f"{path}?p={page}", html.encode("utf-8"))
+            written += 1
+
+            for item_id in re.findall(r'<tr class="athing submission" id="(\d+)"', html):
+                page_html = make_item_page(int(item_id), n_comments=comments_per_item, seed=seed)
+                store.put(f"/item?id={item_id}", page_html.encode("utf-8"))
+                written += 1
+    return written
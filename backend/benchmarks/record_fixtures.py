@@ -0,0 +1,35 @@
+"""录制回放用的页面 - 对真实站点（或 --base-url 指定的地址）运行一次 crawl()，把抓到的列表页和详情页存入 FixtureStore
+
+用法: python -m backend.benchmarks.record_fixtures --out fixtures/hn [--posts 300]
+之后: python -m backend.benchmarks.bench_crawl --fixtures fixtures/hn
+"""
+
+import argparse
+
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler
+from backend.crawlers.replay import FixtureStore, RecordingAdapter
+
+
+def record(out: str, posts: int = 300, base_url: str = None) -> FixtureStore:
+    store = FixtureStore(out)
+    crawler = HackerNewsCrawler(use_cache=False)
+    if base_url:
+        crawler.BASE_URL = base_url
+
+    # 包装爬虫原有的适配器（保留限流），成功的响应同时写入录制目录
+    for prefix in ("https://", "http://"):
+        crawler.session.mount(prefix, RecordingAdapter(store, crawler.session.get_adapter(prefix)))
+
+    result = crawler.crawl(max_posts=posts, mark_seen=False)
+    print(f"📼 recorded {len(store)} pages ({result['stats'].get('total_posts', 0)} posts) into {out}")
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--posts", type=int, default=300)
+    parser.add_argument("--base-url")
+    args = parser.parse_args()
+
+    record(out=args.out, posts=args.posts, base_url=args.base_url)
@@ -0,0 +1,140 @@
+"""本地HN替身服务器 - 提供合成的（或 FixtureStore 中录制的）列表页/详情页，可注入延迟、限流和过载错误
+
+用法:
+    server = StubHNServer(latency=0.05, error_rate=0.1, max_concurrent=4)
+    server.start()
+    crawler = HackerNewsCrawler()
+    crawler.BASE_URL = server.base_url
+    ...
+    server.stop()
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from backend.benchmarks.hn_fixtures import feed_base_id, make_item_page, make_listing_page
+from backend.crawlers.replay import FixtureStore
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """客户端提前断开连接属于正常情况，不打印异常"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class StubHNServer:
+    """在本地端口上模拟 news.ycombinator.com"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 max_concurrent: Optional[int] = None, overload_latency: float = 0.0,
+                 retry_after: Optional[float] = None, total_pages: int = 10,
+                 comments_per_item: int = 50, seed: int = 0, fixtures: Optional[FixtureStore] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_concurrent = max_concurrent
+        self.overload_latency = overload_latency
+        self.retry_after = retry_after
+        self.total_pages = total_pages
+        self.comments_per_item = comments_per_item
+        self.seed = seed
+        self.fixtures = fixtures
+
+        self.stats = {"requests": 0, "throttled": 0, "overloaded": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._server: Optional[_QuietHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubHNServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, body, headers = server.handle(self.path)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = _QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle(self, raw_path: str):
+        """处理一个请求，返回 (状态码, 内容, 响应头)"""
+        with self._lock:
+            self._in_flight += 1
+            in_flight = self._in_flight
+            self.stats["requests"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], in_flight)
+            throttle = self._rng.random() < self.error_rate
+
+        try:
+            overloaded = self.max_concurrent is not None and in_flight > self.max_concurrent
+
+            # 并发越高延迟越大，超过上限时返回503
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            if self.max_concurrent is not None:
+                delay += self.overload_latency * max(0, in_flight - self.max_concurrent)
+            time.sleep(delay)
+
+            if overloaded or throttle:
+                with self._lock:
+                    self.stats["overloaded" if overloaded else "throttled"] += 1
+                headers = {"Content-Type": "text/plain"}
+                if self.retry_after is not None:
+                    headers["Retry-After"] = str(self.retry_after)
+                return (503 if overloaded else 429), b"slow down", headers
+
+            body = self.fixtures.get(raw_path) if self.fixtures is not None else self.render(raw_path).encode("utf-8")
+            if body is None:
+                return 404, b"not recorded", {"Content-Type": "text/plain"}
+            return 200, body, {"Content-Type": "text/html; charset=utf-8"}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def render(self, raw_path: str) -> str:
+        """生成页面内容"""
+        parsed = urlparse(raw_path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path == "/item":
+            item_id = int(query.get("id", ["0"])[0])
+            return make_item_page(item_id, n_comments=self.comments_per_item, seed=self.seed)
+
+        page = int(query.get("p", ["1"])[0])
+        return make_listing_page(page=page, total_pages=self.total_pages, seed=self.seed,
+                                 base_id=feed_base_id(parsed.path))
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return self.stats.copy()
@@ -0,0 +1,203 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+# 评论页分块送入解析器的块大小
+CHUNK_SIZE = 16 * 1024
+
+
+def iter_comments(html: Union[str, Iterable[str]], item_id: str = "") -> Iterator[Dict]:
+    """增量解析评论页，按文档顺序逐条产出评论
+
+    使用lxml的pull解析器，每解析完一行评论（tr.athing.comtr）就产出，
+    并立即释放已处理的元素，内存占用与评论树大小无关。
+    html 可以是完整页面，也可以是边下载边产出的文本块（如 response.iter_content(decode_unicode=True)）。
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("end",), tag="tr")
+    parents: Dict[int, str] = {}
+
+    if isinstance(html, str):
+        html = (html[offset:offset + CHUNK_SIZE] for offset in range(0, len(html), CHUNK_SIZE))
+
+    # 分块送入解析器，评论边解析边产出
+    for chunk in html:
+        parser.feed(chunk)
+        yield from _drain(parser, parents, item_id)
+
+    parser.close()
+    yield from _drain(parser, parents, item_id)
+
+
+def _drain(parser, parents: Dict[int, str], item_id: str) -> Iterator[Dict]:
+    for _, row in parser.read_events():
+        classes = (row.get("class") or "").split()
+        if "comtr" not in classes:
+            continue
+
+        comment = _parse_comment_row(row, parents, item_id)
+
+        # 释放已处理的行
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+
+        if comment:
+            yield comment
+
+
+def _parse_comment_row(row, parents: Dict[int, str], item_id: str):
+    comment_id = row.get("id", "")
+    depth = 0
+    user = "anonymous"
+    text_elem = None
+
+    for elem in row.iter():
+        classes = (elem.get("class") or "").split()
+        if not classes:
+            continue
+        if "ind" in classes:
+            try:
+                depth = int(elem.get("indent", "0"))
+            except ValueError:
+                depth = 0
+        elif "hnuser" in classes:
+            user = "".join(elem.itertext()).strip()
+        elif "commtext" in classes:
+            text_elem = elem
+            break
+
+    # 记录各层级最近的评论，用于还原父子关系
+    parents[depth] = comment_id
+    parent_id = parents.get(depth - 1, item_id) if depth > 0 else item_id
+
+    if text_elem is None:
+        # 已删除或被标记的评论
+        return None
+
+    text = _WHITESPACE_RE.sub(" ", " ".join(text_elem.itertext())).strip()
+    if not text:
+        return None
+
+    return {
+        "comment_id": comment_id,
+        "item_id": item_id,
+        "parent_id": parent_id,
+        "depth": depth,
+        "user": user,
+        "text": text
+    }
+
+
+class CommentCrawler:
+    """评论抓取器 - 用有界线程池并发抓取高互动帖子的评论树"""
+
+    def __init__(self, fetch_page: Callable[[str], Union[str, Iterable[str]]], workers: int = 4,
+                 max_fetches: int = 20, min_comments: int = 10,
+                 on_latency: Optional[Callable[[str, float], None]] = None):
+        # fetch_page 返回完整页面，或边下载边产出的文本块（评论随下载进度解析）
+        self.fetch_page = fetch_page
+        self.on_latency = on_latency
+        self.workers = max(1, workers)
+        self.max_fetches = max_fetches
+        self.min_comments = min_comments
+        # 多个线程可能同时调用 iter_threads（流式管道的提取阶段），统计累加在锁内
+        self._stats_lock = threading.Lock()
+        self.stats = self._empty_stats()
+
+    def reset_stats(self) -> None:
+        """开始新一次爬取前清零累计统计"""
+        with self._stats_lock:
+            self.stats = self._empty_stats()
+
+    def select_posts(self, posts: List[Dict]) -> List[Dict]:
+        """挑选需要抓取评论的帖子（评论数最多的优先，受抓取预算限制）"""
+        candidates = [
+            post for post in posts
+            if post.get("item_id") and post.get("comments", 0) > self.min_comments
+        ]
+        candidates.sort(key=lambda post: post.get("comments", 0), reverse=True)
+        return candidates[:self.max_fetches]
+
+    def iter_threads(self, posts: List[Dict]) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """并发抓取评论，按完成顺序产出 (帖子, 评论列表)；统计累加到 self.stats"""
+        selected = self.select_posts(posts)
+        self._count("threads_skipped_budget", max(
+            0, sum(1 for p in posts if p.get("item_id") and p.get("comments", 0) > self.min_comments) - len(selected)
+        ))
+        if not selected:
+            return
+
+        logger.info(f"Fetching comment threads for {len(selected)} posts ({self.workers} workers)")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._fetch_thread, post): post for post in selected}
+            for future in as_completed(futures):
+                post = futures[future]
+                try:
+                    comments = future.result()
+                except Exception as e:
+                    self._count("threads_failed")
+                    logger.warning(f"Failed to fetch comments for item {post.get('item_id')}: {str(e)}")
+                    continue
+
+                self._count("threads_fetched")
+                self._count("comments_parsed", len(comments))
+                yield post, comments
+
+    def _fetch_thread(self, post: Dict) -> List[Dict]:
+        item_id = str(post["item_id"])
+        page = self.fetch_page(f"/item?id={item_id}")
+        if isinstance(page, str):
+            start = time.perf_counter()
+            comments = list(iter_comments(page, item_id))
+            parse_seconds = time.perf_counter() - start
+        else:
+            # 边下载边解析：解析耗时不含等待网络数据块的时间
+            chunks = _TimedChunks(page)
+            start = time.perf_counter()
+            comments = list(iter_comments(chunks, item_id))
+            parse_seconds = time.perf_counter() - start - chunks.wait_seconds
+        if self.on_latency:
+            self.on_latency("parse_item", parse_seconds)
+        return comments
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += value
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
+            "threads_fetched": 0,
+            "threads_failed": 0,
+            "threads_skipped_budget": 0,
+            "comments_parsed": 0
+        }
+
+
+class _TimedChunks:
+    """包装文本块迭代器，累计等待下一个数据块的时间"""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.wait_seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        start = time.perf_counter()
+        try:
+            return next(self._chunks)
+        finally:
+            self.wait_seconds += time.perf_counter() - start
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATTERNS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demand_patterns.json")
+
+# 推导字面串时一组候选串的上限（可选项、分支会让候选串成倍增加）
+MAX_LITERALS = 8
+
+# IGNORECASE 下会匹配ASCII字母、但 lower() 后不是该字母的字符
+_CASE_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def load_pattern_sets(path: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """读取需求模式配置文件，返回 {模式集名: [{demand_type, pattern, ...}]}"""
+    path = path or os.environ.get("SCOUT_DEMAND_PATTERNS") or DEFAULT_PATTERNS_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    return config.get("pattern_sets", {})
+
+
+def required_literals(pattern: str, flags: int = re.IGNORECASE) -> Optional[List[str]]:
+    """从正则的语法树推导字面串（小写）：模式命中时文本中必然出现其中之一；推导不出时返回 None"""
+    _, factor = _analyze(sre_parse.parse(pattern, flags))
+    return sorted(factor) if factor else None
+
+
+def _analyze(items) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
+    """返回 (exact, factor)：exact 为该段只能匹配的全部字符串（无法枚举时为 None），
+    factor 为命中时必然出现其一的字面串集合（没有时为 None）"""
+    run = {""}
+    exact = True
+    candidates = []
+    for op, av in items:
+        item_exact, item_factor = _analyze_item(op, av)
+        if item_exact is not None and len(run) * len(item_exact) <= MAX_LITERALS:
+            run = {left + right for left in run for right in item_exact}
+            continue
+        # 连续的可枚举片段到此为止，拼出的字符串都是必然出现的候选
+        exact = False
+        candidates.append(run)
+        run = item_exact if item_exact is not None else {""}
+        if item_factor:
+            candidates.append(item_factor)
+    candidates.append(run)
+
+    # 包含了同组另一字面串的字面串是多余的
+    factors = [{literal for literal in candidate if not any(other != literal and other in literal for other in candidate)}
+               for candidate in candidates if "" not in candidate]
+    # 最短的字面串越长预筛越准，同样长时扫描次数越少越好
+    factor = max(factors, key=lambda c: (min(map(len, c)), -len(c)), default=None)
+    return (run if exact else None), factor
+
+
+def _analyze_item(op, av) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
+    """单个语法节点的 (exact, factor)；不认识的节点按“可匹配任意内容”处理"""
+    if op is sre_constants.LITERAL:
+        char = chr(av)
+        # 非ASCII字符的大小写等价关系 lower() 表达不了，不参与字面串
+        if not char.isascii():
+            return None, None
+        return {char.lower()}, {char.lower()}
+    if op is sre_constants.AT:
+        return {""}, None
+    if op is sre_constants.SUBPATTERN:
+        return _analyze(av[-1])
+    if op is getattr(sre_constants, "ATOMIC_GROUP", None):
+        return _analyze(av)
+    if op is sre_constants.BRANCH:
+        branches = [_analyze(branch) for branch in av[1]]
+        if all(branch_exact is not None for branch_exact, _ in branches):
+            union = set().union(*(branch_exact for branch_exact, _ in branches))
+            if len(union) <= MAX_LITERALS:
+                return union, (union if "" not in union else None)
+        if all(branch_factor for _, branch_factor in branches):
+            return None, set().union(*(branch_factor for _, branch_factor in branches))
+        return None, None
+    if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+              getattr(sre_constants, "POSSESSIVE_REPEAT", None)):
+        low, high, body = av
+        body_exact, body_factor = _analyze(body)
+        if low == high == 1:
+            return body_exact, body_factor
+        if low == 0 and high == 1 and body_exact is not None:
+            return body_exact | {""}, None
+        return None, (body_factor if low >= 1 else None)
+    return None, None
+
+
+class DemandPatternEngine:
+    """需求模式引擎 - 模式只编译一次，按批匹配，结果与逐个 re.search 完全一致
+
+    加载时从每个模式的正则推导字面串（命中时文本中必然出现其中之一）。批量匹配时
+    把整批文本拼接起来，每个字面串只做一次子串扫描，定位到可能命中的文本后才运行
+    对应模式的正则；大多数文本不含任何字面串，新增模式的边际成本只是一次快速扫描。
+    """
+
+    def __init__(self, patterns: List[Dict], flags: int = re.IGNORECASE):
+        self.patterns: List[Dict] = []
+        self._compiled = []
+        self._always: List[int] = []
+        self._literals: Dict[str, List[int]] = {}
+
+        for index, spec in enumerate(patterns):
+            try:
+                self._compiled.append(re.compile(spec["pattern"], flags))
+            except re.error as e:
+                raise ValueError(f"Invalid demand pattern for {spec.get('demand_type')}: {str(e)}")
+            self.patterns.append(spec)
+
+            required = required_literals(spec["pattern"], flags)
+            if not required or any("\n" in literal for literal in required):
+                # 没有可用的字面串时每条文本都求值
+                self._always.append(index)
+                continue
+            for literal in required:
+                self._literals.setdefault(literal, []).append(index)
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None, pattern_sets: Iterable[str] = ("default",)) -> "DemandPatternEngine":
+        """从配置文件加载一个或多个模式集"""
+        available = load_pattern_sets(path)
+        patterns = []
+        for name in pattern_sets:
+            if name not in available:
+                raise ValueError(f"Unknown demand pattern set: {name}")
+            patterns.extend(available[name])
+        logger.debug(f"Loaded {len(patterns)} demand patterns from sets {list(pattern_sets)}")
+        return cls(patterns)
+
+    def match(self, text: str) -> List[Dict]:
+        """返回文本命中的全部模式（按配置顺序）"""
+        return self.match_batch([text])[0]
+
+    def match_batch(self, texts: List[str]) -> List[List[Dict]]:
+        """批量匹配，返回与 texts 一一对应的命中模式列表"""
+        candidates = self._candidates(texts)
+        results: List[List[Dict]] = []
+        for text, indexes in zip(texts, candidates):
+            if not indexes:
+                results.append([])
+                continue
+            results.append([
+                self.patterns[index] for index in sorted(indexes)
+                if self._compiled[index].search(text)
+            ])
+        return results
+
+    def _candidates(self, texts: List[str]) -> List[set]:
+        """每条文本需要求值的模式下标"""
+        candidates = [set(self._always) for _ in texts]
+        if not self._literals or not texts:
+            return candidates
+
+        # 逐条转小写后再拼接，保证偏移量与原文本对应
+        lowered = [text.lower() if text.isascii() else text.translate(_CASE_FOLD).lower() for text in texts]
+        starts = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        joined = "\n".join(lowered)
+
+        last = len(texts) - 1
+        for literal, indexes in self._literals.items():
+            pos = joined.find(literal)
+            while pos != -1:
+                # 字面串不含换行，不会跨越两条文本；命中后直接跳到下一条文本
+                text_index = bisect_right(starts, pos) - 1
+                candidates[text_index].update(indexes)
+                if text_index == last:
+                    break
+                pos = joined.find(literal, starts[text_index + 1])
+        return candidates
@@ -1,221 +1,441 @@
 import requests
-from bs4 import BeautifulSoup
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Container, List, Dict, Optional, Iterator, Tuple
+import math
 import time
-import re
+
+from backend.crawlers.http_cache import ResponseCache, CachingAdapter
+from backend.crawlers.hn_parsers import SoupListingParser, get_parser
+from backend.crawlers.comment_crawler import CHUNK_SIZE, CommentCrawler
+from backend.crawlers.seen_index import SeenIndex
+from backend.crawlers.rate_limiter import AdaptiveRateLimiter, RateLimitedAdapter
+from backend.crawlers.demand_patterns import DemandPatternEngine
+from backend.crawlers.replay import FixtureStore, ReplayAdapter
+from backend.analysis.keyword_matcher import KeywordMatcher
+from backend.utils.records import Post, RawDemand
 
 logger = logging.getLogger(__name__)
 
+
+def _run_coroutine(coro):
+    """在同步代码中运行协程（已有事件循环时放到独立线程中运行）"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # FastAPI等环境中已经存在运行中的事件循环，不能直接asyncio.run
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+class _CachingRateLimitedAdapter(CachingAdapter, RateLimitedAdapter):
+    """缓存 + 限流：缓存命中不占用限流配额，只有实际的网络请求经过限流器"""
+
+class _ReplayRateLimitedAdapter(RateLimitedAdapter, ReplayAdapter):
+    """回放模式：请求仍经过限流器，但由录制的页面响应"""
+
 class HackerNewsCrawler:
     """Hacker News爬虫 - 抓取技术工具需求"""
     
     BASE_URL = "https://news.ycombinator.com"
     
-    def __init__(self):
+    # 可抓取的列表页
+    FEEDS = {
+        "show": "/show",
+        "ask": "/ask",
+        "new": "/newest",
+        "front": "/news",
+    }
+    
+    # HN每个列表页固定30条
+    PAGE_SIZE = 30
+    
+    # 内存中保留的已解析页面数（按页面内容哈希复用解析结果）
+    PARSED_PAGE_CACHE_SIZE = 64
+    
+    # 每个阶段保留的最近耗时样本数
+    LATENCY_SAMPLE_SIZE = 10000
+    
+    def __init__(self, concurrency: int = 4, use_async: bool = True, timeout: int = 30,
+                 prefetch_pages: int = 2, max_pages: int = 20,
+                 use_cache: bool = False, cache_dir: Optional[str] = None, cache_ttl: int = 0,
+                 parser: str = "lxml", crawl_comments: bool = True, comment_workers: int = 4,
+                 max_comment_fetches: int = 20, min_comments_for_thread: int = 10,
+                 seen_index: Optional[SeenIndex] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 demand_patterns: Optional[DemandPatternEngine] = None,
+                 replay_store: Optional[FixtureStore] = None, replay_latency: float = 0.0):
+        self.concurrency = max(1, concurrency)
+        self.use_async = use_async
+        self.timeout = timeout
+        self.prefetch_pages = max(0, prefetch_pages)
+        self.max_pages = max(1, max_pages)
+        
+        self.parser = get_parser(parser)
+        self.keyword_matcher = KeywordMatcher.shared()
+        self.demand_patterns = demand_patterns or DemandPatternEngine.from_config()
+        self.seen_index = seen_index
+        self.crawl_comments = crawl_comments
+        self.comment_crawler = CommentCrawler(
+            self._stream_page,
+            workers=comment_workers,
+            max_fetches=max_comment_fetches,
+            min_comments=min_comments_for_thread,
+            on_latency=self._record_latency
+        )
+        self._parsed_pages = OrderedDict()
+        self._parsed_pages_lock = threading.Lock()
+        self.parse_stats = {"pages_parsed": 0, "pages_parse_skipped": 0}
+        # 本次爬取中抓取失败的列表页：feed -> 错误信息（失败页之前的帖子照常返回）
+        self.feed_errors: Dict[str, str] = {}
+        
+        # 各阶段耗时样本（秒）：页面下载、列表页解析、详情页（评论）解析
+        self.latency_samples: Dict[str, deque] = {
+            stage: deque(maxlen=self.LATENCY_SAMPLE_SIZE)
+            for stage in ("fetch", "parse_listing", "parse_item")
+        }
+        
+        # 连接池大小与并发上限一致，保证keep-alive连接可以复用；
+        # 限流窗口上限同时覆盖列表页和评论抓取两类并发
+        pool_size = max(self.concurrency, comment_workers)
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(max_window=pool_size)
+        
+        # 会话模板：适配器（连接池、限流、缓存）和请求头配置在这里，各线程的会话共用这些适配器；
+        # requests.Session 本身不保证线程安全，下载页面时每个线程使用自己的会话（_thread_session）
         self.session = requests.Session()
+        self._sessions = threading.local()
+        
+        # 回放模式从录制的页面响应，不访问网络也不使用HTTP缓存
+        self.replay_store = replay_store
+        self.cache = ResponseCache(cache_dir=cache_dir, ttl_seconds=cache_ttl) if use_cache and not replay_store else None
+        if replay_store is not None:
+            adapter = _ReplayRateLimitedAdapter(
+                limiter=self.rate_limiter, store=replay_store, latency=replay_latency,
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+        elif self.cache:
+            adapter = _CachingRateLimitedAdapter(
+                cache=self.cache, limiter=self.rate_limiter,
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+        else:
+            adapter = RateLimitedAdapter(self.rate_limiter, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         })
     
-    def fetch_show_hn(self, limit: int = 30) -> List[Dict]:
+    def fetch_show_hn(self, limit: int = 30) -> List[Post]:
         """抓取Show HN帖子（新产品展示）"""
+        return self.fetch_feed("show", limit=limit)
+    
+    def fetch_ask_hn(self, limit: int = 30) -> List[Post]:
+        """抓取Ask HN帖子（问题讨论）"""
+        return self.fetch_feed("ask", limit=limit)
+    
+    def fetch_feed(self, feed: str, limit: int = 30) -> List[Post]:
+        """抓取指定列表页的帖子（某一页抓取失败时返回它之前各页的帖子，失败记入 feed_errors）"""
+        posts = []
         try:
-            logger.info(f"Fetching Show HN posts (limit: {limit})")
-            
-            url = f"{self.BASE_URL}/show"
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            logger.info(f"Fetching {feed} feed posts (limit: {limit})")
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            for post in self.iter_feed(feed, limit=limit):
+                posts.append(post)
             
-            # 解析帖子
-            posts = []
-            rows = soup.select('tr.athing')
-            
-            for i, row in enumerate(rows[:limit]):
-                try:
-                    post = self._parse_post(row)
-                    if post:
-                        posts.append(post)
-                        logger.debug(f"Parsed post: {post['title'][:50]}...")
-                except Exception as e:
-                    logger.warning(f"Failed to parse post {i}: {str(e)}")
-                    continue
-            
-            logger.info(f"Successfully fetched {len(posts)} Show HN posts")
-            return posts
+            logger.info(f"Successfully fetched {len(posts)} {feed} feed posts")
             
         except Exception as e:
-            logger.error(f"Error fetching Show HN: {str(e)}")
-            return []
+            logger.error(f"Error fetching {feed} feed: {str(e)}")
+            self.feed_errors.setdefault(feed, f"after {len(posts)} posts: {e}")
+        return posts
     
-    def fetch_ask_hn(self, limit: int = 30) -> List[Dict]:
-        """抓取Ask HN帖子（问题讨论）"""
+    def iter_feed(self, feed: str, limit: int = 30, prefetch: Optional[int] = None) -> Iterator[Post]:
+        """逐条产出列表页帖子，自动翻页（?p=N）并预取后续页面
+        
+        最多同时持有 prefetch + 1 个页面，内存占用与 limit 无关。
+        帖子的 feed / page 为所在的列表页和页码。
+        """
+        prefetch = self.prefetch_pages if prefetch is None else max(0, prefetch)
+        total_pages = min(self.max_pages, math.ceil(limit / self.PAGE_SIZE))
+        if limit <= 0 or total_pages <= 0:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=prefetch + 1)
+        pending = deque()
+        next_page = 1
+        yielded = 0
+        
         try:
-            logger.info(f"Fetching Ask HN posts (limit: {limit})")
-            
-            url = f"{self.BASE_URL}/ask"
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            posts = []
-            rows = soup.select('tr.athing')
-            
-            for i, row in enumerate(rows[:limit]):
+            while yielded < limit:
+                # 补齐预取窗口
+                while next_page <= total_pages and len(pending) <= prefetch:
+                    pending.append((next_page, executor.submit(self._fetch_page, self._page_path(feed, next_page))))
+                    next_page += 1
+                
+                if not pending:
+                    break
+                
+                page, future = pending.popleft()
+                posts, has_more = self._parse_page(future.result(), feed)
+                
+                for post in posts:
+                    post.feed, post.page = feed, page
+                    yield post
+                    yielded += 1
+                    if yielded >= limit:
+                        break
+                
+                # 最后一页：丢弃已预取的后续页面
+                if not has_more or not posts:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def fetch_feeds(self, feed_limits: Dict[str, int]) -> Dict[str, List[Post]]:
+        """抓取多个列表页，异步模式（use_async）下并行抓取
+
+        并行是线程池并发：asyncio 只负责调度和预取窗口，阻塞的 requests 下载在线程池中执行，
+        每个工作线程使用自己的 Session（共用同一个连接池）。
+        """
+        if not self.use_async or len(feed_limits) <= 1:
+            return {feed: self.fetch_feed(feed, limit=limit) for feed, limit in feed_limits.items()}
+        
+        return _run_coroutine(self.fetch_feeds_async(feed_limits))
+    
+    async def fetch_feeds_async(self, feed_limits: Dict[str, int]) -> Dict[str, List[Post]]:
+        """并行抓取多个列表页，并发数受 self.concurrency 限制（下载在线程池中执行）"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = await asyncio.gather(*(
+                self._fetch_feed_async(feed, limit, semaphore, executor)
+                for feed, limit in feed_limits.items()
+            ))
+        
+        return dict(zip(feed_limits.keys(), results))
+    
+    async def _fetch_feed_async(self, feed: str, limit: int, semaphore: asyncio.Semaphore,
+                                executor: ThreadPoolExecutor) -> List[Post]:
+        """异步抓取单个列表页（分页按顺序解析，与 iter_feed 一样最多预取 prefetch_pages 页）
+        
+        某一页下载失败时保留它之前连续成功的页面，失败记入 feed_errors。
+        """
+        posts = []
+        pending = deque()
+        try:
+            logger.info(f"Fetching {feed} feed posts (limit: {limit})")
+            
+            total_pages = min(self.max_pages, math.ceil(limit / self.PAGE_SIZE))
+            next_page = 1
+            while len(posts) < limit:
+                # 补齐预取窗口：最后一页之后的页面不会被下载
+                while next_page <= total_pages and len(pending) <= self.prefetch_pages:
+                    task = asyncio.ensure_future(
+                        self._fetch_page_async(self._page_path(feed, next_page), semaphore, executor)
+                    )
+                    pending.append((next_page, task))
+                    next_page += 1
+                
+                if not pending:
+                    break
+                
+                page, task = pending.popleft()
                 try:
-                    post = self._parse_post(row)
-                    if post:
-                        posts.append(post)
+                    html = await task
                 except Exception as e:
-                    logger.warning(f"Failed to parse Ask HN post {i}: {str(e)}")
-                    continue
+                    self._record_feed_error(feed, page, e)
+                    break
+                page_posts, has_more = self._parse_page(html, feed)
+                for post in page_posts:
+                    post.feed, post.page = feed, page
+                posts.extend(page_posts[:limit - len(posts)])
+                if not has_more or not page_posts:
+                    break
             
-            logger.info(f"Successfully fetched {len(posts)} Ask HN posts")
-            return posts
+            logger.info(f"Successfully fetched {len(posts)} {feed} feed posts")
             
         except Exception as e:
-            logger.error(f"Error fetching Ask HN: {str(e)}")
-            return []
+            logger.error(f"Error fetching {feed} feed: {str(e)}")
+            self.feed_errors.setdefault(feed, str(e))
+        finally:
+            # 丢弃已预取但用不到的页面
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+        return posts
+    
+    async def _fetch_page_async(self, path: str, semaphore: asyncio.Semaphore,
+                                executor: ThreadPoolExecutor) -> str:
+        """在并发上限内把阻塞的页面下载交给线程池"""
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self._fetch_page, path)
     
-    def _parse_post(self, row) -> Optional[Dict]:
-        """解析单个帖子"""
+    def _record_feed_error(self, feed: str, page: int, error: Exception) -> None:
+        """记录列表页第N页抓取失败（只保留每个列表页的第一个错误）"""
+        logger.error(f"Error fetching {feed} feed page {page}: {str(error)}")
+        self.feed_errors.setdefault(feed, f"page {page}: {error}")
+    
+    def _page_path(self, feed: str, page: int) -> str:
+        """列表页第N页的路径"""
+        path = self.FEEDS[feed]
+        return path if page <= 1 else f"{path}?p={page}"
+    
+    def _fetch_page(self, path: str) -> str:
+        """通过当前线程的会话下载页面"""
+        url = f"{self.BASE_URL}{path}"
+        start = time.perf_counter()
+        response = self._thread_session().get(url, timeout=self.timeout)
+        response.raise_for_status()
+        text = response.text
+        self._record_latency("fetch", time.perf_counter() - start)
+        return text
+    
+    def _thread_session(self) -> requests.Session:
+        """当前线程的会话：首次使用时按 self.session 的请求头和适配器创建（适配器实例共用）"""
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers = self.session.headers.copy()
+            session.adapters.clear()
+            for prefix, adapter in self.session.adapters.items():
+                session.mount(prefix, adapter)
+            self._sessions.session = session
+        return session
+    
+    def _stream_page(self, path: str) -> Iterator[str]:
+        """通过当前线程的会话下载页面，边下载边产出解码后的文本块（评论页交给pull解析器增量解析）"""
+        url = f"{self.BASE_URL}{path}"
+        start = time.perf_counter()
+        response = self._thread_session().get(url, timeout=self.timeout, stream=True)
         try:
-            # 提取标题和链接
-            title_elem = row.select_one('a.titlelink')
-            if not title_elem:
-                return None
-            
-            title = title_elem.text.strip()
-            url = title_elem.get('href', '')
-            
-            # 处理相对链接
-            if url.startswith('item?'):
-                url = f"{self.BASE_URL}/{url}"
-            
-            # 提取分数和评论数
-            subtext_row = row.find_next_sibling('tr')
-            if not subtext_row:
-                return None
-            
-            subtext = subtext_row.select_one('.subtext')
-            if not subtext:
-                return None
-            
-            # 提取分数
-            score_elem = subtext.select_one('.score')
-            score = 0
-            if score_elem:
-                score_text = score_elem.text.strip()
-                match = re.search(r'(\d+)', score_text)
-                if match:
-                    score = int(match.group(1))
-            
-            # 提取评论数
-            comments_elem = subtext.find_all('a')[-1]
-            comments = 0
-            if comments_elem and 'comment' in comments_elem.text:
-                comments_text = comments_elem.text.strip()
-                match = re.search(r'(\d+)', comments_text)
-                if match:
-                    comments = int(match.group(1))
-            
-            # 提取用户和时间
-            user_elem = subtext.select_one('.hnuser')
-            user = user_elem.text.strip() if user_elem else "anonymous"
-            
-            time_elem = subtext.select_one('.age')
-            posted_time = time_elem.text.strip() if time_elem else ""
-            
-            # 构建帖子数据
-            post_data = {
-                "title": title,
-                "url": url,
-                "score": score,
-                "comments": comments,
-                "user": user,
-                "posted_time": posted_time,
-                "platform": "hackernews",
-                "crawled_at": datetime.utcnow().isoformat(),
-                "type": self._classify_post(title)
-            }
-            
-            return post_data
+            response.raise_for_status()
+            # 只记录到收到响应头为止的耗时，正文下载与解析交错进行
+            self._record_latency("fetch", time.perf_counter() - start)
+            yield from response.iter_content(chunk_size=CHUNK_SIZE, decode_unicode=True)
+        finally:
+            response.close()
+    
+    def _record_latency(self, stage: str, seconds: float) -> None:
+        # deque.append 是原子操作，多个抓取线程可以直接写入
+        self.latency_samples[stage].append(seconds)
+    
+    def _parse_listing(self, html: str, limit: int, feed: str = "") -> List[Post]:
+        """解析列表页中的帖子"""
+        posts, _ = self._parse_page(html, feed)
+        return posts[:limit]
+    
+    def _parse_page(self, html: str, feed: str = "") -> Tuple[List[Post], bool]:
+        """解析单个列表页，返回帖子和是否还有下一页
+        
+        页面内容未变化（304或内容哈希相同）时直接复用上次的解析结果。
+        """
+        content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        
+        with self._parsed_pages_lock:
+            cached = self._parsed_pages.get(content_hash)
+            if cached is not None:
+                self._parsed_pages.move_to_end(content_hash)
+                self.parse_stats["pages_parse_skipped"] += 1
+        
+        if cached is not None:
+            posts, has_more = cached
+            crawled_at = datetime.utcnow().isoformat()
+            return [post.replace(crawled_at=crawled_at) for post in posts], has_more
+        
+        start = time.perf_counter()
+        posts, has_more = self._parse_html(html, feed)
+        self._record_latency("parse_listing", time.perf_counter() - start)
+        
+        with self._parsed_pages_lock:
+            self.parse_stats["pages_parsed"] += 1
+            self._parsed_pages[content_hash] = ([post.replace() for post in posts], has_more)
+            while len(self._parsed_pages) > self.PARSED_PAGE_CACHE_SIZE:
+                self._parsed_pages.popitem(last=False)
+        
+        return posts, has_more
+    
+    def _parse_html(self, html: str, feed: str = "") -> Tuple[List[Post], bool]:
+        """用当前解析器后端解析列表页HTML"""
+        rows, has_more = self.parser.parse(html)
+        
+        # 同一页面的帖子共用一个抓取时间字符串
+        crawled_at = datetime.utcnow().isoformat()
+        posts = []
+        for i, fields in enumerate(rows):
+            try:
+                post = self._build_post(fields, crawled_at)
+                posts.append(post)
+                logger.debug(f"Parsed post: {post['title'][:50]}...")
+            except Exception as e:
+                logger.warning(f"Failed to parse {feed} post {i}: {str(e)}")
+                continue
+        
+        return posts, has_more
+    
+    def _parse_post(self, row) -> Optional[Post]:
+        """解析单个帖子（BeautifulSoup行元素）"""
+        try:
+            fields = SoupListingParser().parse_row(row)
+            return self._build_post(fields) if fields else None
             
         except Exception as e:
             logger.warning(f"Error parsing post: {str(e)}")
             return None
     
+    def _build_post(self, fields: Dict, crawled_at: Optional[str] = None) -> Post:
+        """根据解析出的字段构建帖子记录"""
+        url = fields["url"]
+        
+        # 处理相对链接
+        if url.startswith('item?'):
+            url = f"{self.BASE_URL}/{url}"
+        
+        return Post(
+            item_id=fields["item_id"],
+            title=fields["title"],
+            url=url,
+            score=fields["score"],
+            comments=fields["comments"],
+            user=fields["user"],
+            posted_time=fields["posted_time"],
+            platform="hackernews",
+            crawled_at=crawled_at or datetime.utcnow().isoformat(),
+            type=self._classify_post(fields["title"])
+        )
+    
     def _classify_post(self, title: str) -> str:
         """根据标题分类帖子类型"""
         title_lower = title.lower()
         
-        # 工具相关关键词
-        tool_keywords = [
-            'tool', 'app', 'website', 'platform', 'service', 'api',
-            'library', 'framework', 'cli', 'extension', 'plugin',
-            'dashboard', 'analytics', 'monitor', 'automation'
-        ]
-        
-        # 问题相关关键词
-        problem_keywords = [
-            'how to', 'why', 'what', 'which', 'help', 'advice',
-            'recommend', 'suggest', 'looking for', 'need', 'want',
-            'problem', 'issue', 'challenge', 'pain', 'annoying'
-        ]
+        # 工具/问题关键词见 DEFAULT_KEYWORD_DICTIONARIES['post_type']，一次扫描得到两组命中数
+        hits = self.keyword_matcher.match(title_lower)['post_type']
         
         # 检查是否包含工具关键词
-        if any(keyword in title_lower for keyword in tool_keywords):
+        if hits['tool']:
             return "tool_announcement"
         
         # 检查是否包含问题关键词
-        if any(keyword in title_lower for keyword in problem_keywords):
+        if hits['problem']:
             return "problem_discussion"
         
         return "other"
     
-    def extract_demands_from_post(self, post: Dict) -> List[Dict]:
-        """从帖子中提取潜在需求"""
-        demands = []
-        
+    def extract_demands_from_post(self, post: Post, comments: Optional[List[Dict]] = None) -> List[RawDemand]:
+        """从帖子（及其评论）中提取潜在需求"""
         try:
-            title = post.get('title', '').lower()
-            
-            # 识别潜在需求模式
-            demand_patterns = [
-                # "I built X to solve Y"
-                (r'(built|created|made)\s+(?:a\s+)?(.+?)\s+(?:to|for)\s+(?:solve|fix|help|automate)\s+(.+)', 'tool_solution'),
-                # "Looking for a tool that does X"
-                (r'looking for (?:a\s+)?(.+?)\s+(?:that|which)\s+(.+)', 'tool_request'),
-                # "Is there a tool for X?"
-                (r'is there (?:a\s+)?(.+?)\s+for\s+(.+)', 'tool_inquiry'),
-                # "How do you handle X?"
-                (r'how do you (?:handle|manage|deal with|solve)\s+(.+)', 'problem_question'),
-                # "The problem with X is Y"
-                (r'the problem with (.+?)\s+is\s+(.+)', 'problem_statement'),
-            ]
-            
-            for pattern, demand_type in demand_patterns:
-                match = re.search(pattern, title, re.IGNORECASE)
-                if match:
-                    demand = {
-                        "source_post": post,
-                        "demand_type": demand_type,
-                        "extracted_text": title,
-                        "confidence": 0.7,  # 置信度评分
-                        "extracted_at": datetime.utcnow().isoformat(),
-                        "patterns_found": [pattern]
-                    }
-                    demands.append(demand)
-                    logger.debug(f"Found demand pattern: {demand_type} in '{title[:50]}...'")
+            demands = self._extract_demands_from_text(post.get('title', ''), post)
             
-            # 如果帖子有很多评论，可能包含更多需求讨论
-            if post.get('comments', 0) > 10:
-                # 这里可以添加抓取评论的逻辑
-                pass
+            # 高互动帖子的评论由评论抓取器获取，每条评论作为独立的候选需求
+            if comments:
+                demands.extend(self.extract_demands_from_comments(post, comments))
             
             return demands
             
@@ -223,40 +443,154 @@ class HackerNewsCrawler:
             logger.error(f"Error extracting demands from post: {str(e)}")
             return []
     
-    def crawl(self, max_posts: int = 50) -> Dict:
-        """执行完整的爬取流程"""
+    def extract_demands_from_posts(self, posts: List[Post]) -> List[RawDemand]:
+        """批量匹配一组帖子标题"""
+        try:
+            texts = [post.get('title', '').lower() for post in posts]
+            extracted_at = datetime.utcnow().isoformat()
+            demands = []
+            for post, text, matched in zip(posts, texts, self.demand_patterns.match_batch(texts)):
+                if matched:
+                    demands.append(self._build_demand(text, post, matched, extracted_at=extracted_at))
+            return demands
+            
+        except Exception as e:
+            logger.error(f"Error extracting demands from posts: {str(e)}")
+            return []
+    
+    def extract_demands_from_comments(self, post: Post, comments: List[Dict]) -> List[RawDemand]:
+        """批量匹配一个帖子下的全部评论"""
+        texts = [comment.get('text', '').lower() for comment in comments]
+        extracted_at = datetime.utcnow().isoformat()
+        demands = []
+        for comment, text, matched in zip(comments, texts, self.demand_patterns.match_batch(texts)):
+            if matched:
+                demands.append(self._build_demand(text, post, matched, comment, extracted_at))
+        return demands
+    
+    def _extract_demands_from_text(self, text: str, post: Post, comment: Optional[Dict] = None) -> List[RawDemand]:
+        """用需求模式匹配一段文本（帖子标题或评论）"""
+        text = text.lower()
+        matched = self.demand_patterns.match(text)
+        return [self._build_demand(text, post, matched, comment)] if matched else []
+    
+    def _build_demand(self, text: str, post: Post, matched: List[Dict], comment: Optional[Dict] = None,
+                      extracted_at: Optional[str] = None) -> RawDemand:
+        """一段文本命中的全部模式合并为一条需求（只分析、保存一次）"""
+        demand_types = list(dict.fromkeys(spec["demand_type"] for spec in matched))
+        logger.debug("Found demand patterns: %s in '%.50s...'", demand_types, text)
+        # 需求只引用帖子记录，不复制帖子内容
+        return RawDemand(
+            post=post,
+            demand_types=demand_types,
+            extracted_text=text,
+            patterns=[spec["pattern"] for spec in matched],
+            extracted_at=extracted_at or datetime.utcnow().isoformat(),
+            confidence=0.7,  # 置信度评分
+            comment=comment or None
+        )
+    
+    def mark_seen(self, posts: List[Post], save: bool = True) -> None:
+        """把帖子记入已处理索引并持久化（save=False 时只记入内存，由调用方最后统一保存）"""
+        if self.seen_index is None:
+            return
+        
+        self.seen_index.mark(posts)
+        if save:
+            self.seen_index.save()
+    
+    def crawl(self, max_posts: int = 50, extra_feeds: Optional[List[str]] = None,
+              mark_seen: bool = True, exclude_ids: Optional[Container[str]] = None) -> Dict:
+        """执行完整的爬取流程
+        
+        配置了 seen_index 时只处理新帖子和互动明显变化的帖子；
+        mark_seen=False 时由调用方在处理完成后调用 mark_seen()。
+        续跑中断的运行时从第1页重新列出（排名可能已经变化），exclude_ids 中的帖子
+        （中断前已处理完）不再提取需求和抓取评论，放在结果的 resumed_posts 中。
+        """
         logger.info(f"Starting HackerNews crawl (max_posts: {max_posts})")
         
         start_time = time.time()
+        for samples in self.latency_samples.values():
+            samples.clear()
+        self.feed_errors = {}
+        self.comment_crawler.reset_stats()
         
         try:
-            # 抓取数据
-            show_hn_posts = self.fetch_show_hn(limit=max_posts//2)
-            ask_hn_posts = self.fetch_ask_hn(limit=max_posts//2)
-            
-            all_posts = show_hn_posts + ask_hn_posts
+            # 抓取数据（Show/Ask及额外列表页并行抓取）
+            feed_limits = {"show": max_posts//2, "ask": max_posts//2}
+            for feed in extra_feeds or []:
+                feed_limits[feed] = max_posts//2
+            
+            feed_posts = self.fetch_feeds(feed_limits)
+            show_hn_posts = feed_posts.get("show", [])
+            ask_hn_posts = feed_posts.get("ask", [])
+            
+            all_posts = [post for posts in feed_posts.values() for post in posts]
+            
+            resumed_posts = []
+            if exclude_ids:
+                resumed_posts = [post for post in all_posts if post.get("item_id") in exclude_ids]
+                all_posts = [post for post in all_posts if post.get("item_id") not in exclude_ids]
+            
+            # 增量模式：跳过已处理且分数/评论数没有明显变化的帖子
+            seen_stats = None
+            if self.seen_index is not None:
+                groups = self.seen_index.partition(all_posts)
+                all_posts = groups["new"] + groups["changed"]
+                seen_stats = {
+                    "new_posts": len(groups["new"]),
+                    "changed_posts": len(groups["changed"]),
+                    "skipped_posts": len(groups["unchanged"])
+                }
             
             # 提取需求
-            all_demands = []
-            for post in all_posts:
-                demands = self.extract_demands_from_post(post)
-                all_demands.extend(demands)
+            all_demands = self.extract_demands_from_posts(all_posts)
+            
+            # 并发抓取高互动帖子的评论，边抓取边提取
+            comment_demands = 0
+            if self.crawl_comments:
+                for post, comments in self.comment_crawler.iter_threads(all_posts):
+                    demands = self.extract_demands_from_comments(post, comments)
+                    comment_demands += len(demands)
+                    all_demands.extend(demands)
+            
+            if self.cache is not None:
+                self.cache.flush()
             
             # 统计信息
             stats = {
                 "total_posts": len(all_posts),
                 "show_hn_posts": len(show_hn_posts),
                 "ask_hn_posts": len(ask_hn_posts),
+                "feed_posts": {feed: len(posts) for feed, posts in feed_posts.items()},
+                # 各列表页抓取到的最后一页
+                "feed_pages": {feed: max(post.page for post in posts) for feed, posts in feed_posts.items() if posts},
+                "resumed_posts": len(resumed_posts),
+                # 抓取失败的列表页（只返回了失败页之前的帖子）
+                "feed_errors": dict(self.feed_errors),
+                "fetch_mode": "async" if self.use_async else "serial",
+                "concurrency": self.concurrency,
+                "http_cache": self.cache.get_stats() if self.cache else None,
+                "rate_limit": self.rate_limiter.snapshot(),
+                "parse_stats": self.parse_stats.copy(),
+                "parser": self.parser.name,
+                "seen_index": seen_stats,
+                "comment_stats": dict(self.comment_crawler.stats, demands_found=comment_demands) if self.crawl_comments else None,
                 "total_demands_found": len(all_demands),
                 "crawl_duration_seconds": time.time() - start_time,
                 "crawled_at": datetime.utcnow().isoformat(),
                 "platform": "hackernews"
             }
             
+            if mark_seen:
+                self.mark_seen(all_posts + resumed_posts)
+            
             logger.info(f"Crawl completed: {stats}")
             
             return {
                 "posts": all_posts,
+                "resumed_posts": resumed_posts,
                 "demands": all_demands,
                 "stats": stats
             }
@@ -292,7 +626,7 @@ if __name__ == "__main__":
     
     print(f"\n📝 Found {len(result['demands'])} potential demands:")
     for i, demand in enumerate(result["demands"][:5], 1):
-        print(f"{i}. Type: {demand['demand_type']}")
+        print(f"{i}. Types: {', '.join(demand['demand_types'])}")
         print(f"   Text: {demand['extracted_text'][:100]}...")
         print(f"   Confidence: {demand['confidence']}")
         print()
@@ -0,0 +1,196 @@
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_RE = re.compile(r'(\d+)')
+
+
+def _first_number(text: str) -> int:
+    match = _NUMBER_RE.search(text)
+    return int(match.group(1)) if match else 0
+
+
+class SoupListingParser:
+    """BeautifulSoup解析器 - 基于CSS选择器逐行解析（兼容性最好）"""
+
+    name = "soup"
+
+    def parse(self, html: str) -> Tuple[List[Dict], bool]:
+        """解析列表页，返回帖子字段列表和是否还有下一页"""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        posts = []
+        for i, row in enumerate(soup.select('tr.athing')):
+            try:
+                fields = self.parse_row(row)
+                if fields:
+                    posts.append(fields)
+            except Exception as e:
+                logger.warning(f"Failed to parse post {i}: {str(e)}")
+                continue
+
+        has_more = soup.select_one('a.morelink') is not None
+        return posts, has_more
+
+    def parse_row(self, row) -> Optional[Dict]:
+        """解析单个帖子行（tr.athing + 紧随其后的subtext行）"""
+        # 提取标题和链接
+        title_elem = row.select_one('a.titlelink') or row.select_one('span.titleline > a')
+        if not title_elem:
+            return None
+
+        # 提取分数和评论数
+        subtext_row = row.find_next_sibling('tr')
+        if not subtext_row:
+            return None
+
+        subtext = subtext_row.select_one('.subtext')
+        if not subtext:
+            return None
+
+        score_elem = subtext.select_one('.score')
+        score = _first_number(score_elem.text.strip()) if score_elem else 0
+
+        comments_elem = subtext.find_all('a')[-1]
+        comments = 0
+        if comments_elem and 'comment' in comments_elem.text:
+            comments = _first_number(comments_elem.text.strip())
+
+        # 提取用户和时间
+        user_elem = subtext.select_one('.hnuser')
+        time_elem = subtext.select_one('.age')
+
+        return {
+            "item_id": row.get('id', ''),
+            "title": title_elem.text.strip(),
+            "url": title_elem.get('href', ''),
+            "score": score,
+            "comments": comments,
+            "user": user_elem.text.strip() if user_elem else "anonymous",
+            "posted_time": time_elem.text.strip() if time_elem else ""
+        }
+
+
+class LxmlListingParser:
+    """lxml解析器 - 对 tr.athing/subtext 行做一次线性遍历，不使用CSS选择器"""
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        self._fromstring = lxml.html.fromstring
+
+    def parse(self, html: str) -> Tuple[List[Dict], bool]:
+        """解析列表页，返回帖子字段列表和是否还有下一页"""
+        root = self._fromstring(html)
+
+        posts = []
+        has_more = False
+        for i, elem in enumerate(root.iter('tr', 'a')):
+            classes = (elem.get('class') or '').split()
+
+            if elem.tag == 'a':
+                if 'morelink' in classes:
+                    has_more = True
+                continue
+
+            if 'athing' not in classes:
+                continue
+
+            try:
+                fields = self._parse_row(elem)
+                if fields:
+                    posts.append(fields)
+            except Exception as e:
+                logger.warning(f"Failed to parse post {i}: {str(e)}")
+                continue
+
+        return posts, has_more
+
+    def _parse_row(self, row) -> Optional[Dict]:
+        title_elem = None
+        fallback_title = None
+        for elem in row.iter('a', 'span'):
+            classes = (elem.get('class') or '').split()
+            if elem.tag == 'a' and 'titlelink' in classes:
+                title_elem = elem
+                break
+            if elem.tag == 'span' and 'titleline' in classes and fallback_title is None:
+                for child in elem:
+                    if child.tag == 'a':
+                        fallback_title = child
+                        break
+
+        title_elem = title_elem if title_elem is not None else fallback_title
+        if title_elem is None:
+            return None
+
+        subtext_row = row.getnext()
+        while subtext_row is not None and subtext_row.tag != 'tr':
+            subtext_row = subtext_row.getnext()
+        if subtext_row is None:
+            return None
+
+        subtext = None
+        for elem in subtext_row.iter():
+            if 'subtext' in (elem.get('class') or '').split():
+                subtext = elem
+                break
+        if subtext is None:
+            return None
+
+        # 一次遍历subtext，收集分数、用户、时间和最后一个链接（评论数）
+        score_elem = user_elem = time_elem = last_link = None
+        for elem in subtext.iter():
+            if elem.tag == 'a':
+                last_link = elem
+            classes = (elem.get('class') or '').split()
+            if not classes:
+                continue
+            if score_elem is None and 'score' in classes:
+                score_elem = elem
+            elif user_elem is None and 'hnuser' in classes:
+                user_elem = elem
+            elif time_elem is None and 'age' in classes:
+                time_elem = elem
+
+        # 与BeautifulSoup解析器保持一致：没有任何链接的subtext视为无效行
+        if last_link is None:
+            return None
+
+        comments = 0
+        comments_text = last_link.text_content()
+        if 'comment' in comments_text:
+            comments = _first_number(comments_text.strip())
+
+        return {
+            "item_id": row.get('id', ''),
+            "title": title_elem.text_content().strip(),
+            "url": title_elem.get('href', ''),
+            "score": _first_number(score_elem.text_content().strip()) if score_elem is not None else 0,
+            "comments": comments,
+            "user": user_elem.text_content().strip() if user_elem is not None else "anonymous",
+            "posted_time": time_elem.text_content().strip() if time_elem is not None else ""
+        }
+
+
+PARSERS = {
+    "soup": SoupListingParser,
+    "lxml": LxmlListingParser,
+}
+
+
+def get_parser(name: str = "lxml"):
+    """按名称创建解析器，lxml不可用时回退到BeautifulSoup"""
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser backend: {name}")
+
+    try:
+        return PARSERS[name]()
+    except ImportError:
+        logger.warning(f"Parser backend {name} is not available, falling back to soup")
+        return SoupListingParser()
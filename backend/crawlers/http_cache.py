@@ -0,0 +1,291 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    """默认缓存目录（可通过 SCOUT_CACHE_DIR 覆盖，Serverless环境下只有临时目录可写）"""
+    return os.getenv("SCOUT_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "micro-saas-scout")
+
+
+class ResponseCache:
+    """磁盘响应缓存 - 保存页面内容及ETag/Last-Modified/TTL元数据，按LRU淘汰
+
+    ttl_seconds 默认为0：每次请求都用条件请求重新校验（304时复用缓存内容），
+    大于0时TTL内直接返回缓存。索引最多每 index_flush_seconds 秒写一次盘，flush() 立即写入。
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: int = 0,
+                 max_bytes: int = 50 * 1024 * 1024, index_flush_seconds: float = 5.0):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "http")
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.index_flush_seconds = index_flush_seconds
+        self._lock = threading.Lock()
+        self._index_dirty = False
+        self._index_saved_at = time.monotonic()
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "unchanged": 0,
+            "stored": 0,
+            "evictions": 0,
+            "index_writes": 0
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """查找缓存条目（同时刷新LRU访问时间）"""
+        with self._lock:
+            entry = self._index.get(self._key(url))
+            if entry:
+                entry["last_access"] = time.time()
+            return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """条目是否仍在TTL内"""
+        return time.time() - entry.get("stored_at", 0) < self.ttl_seconds
+
+    def read_body(self, entry: Dict) -> Optional[bytes]:
+        """读取缓存的响应内容"""
+        try:
+            with open(self._body_path(entry["key"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, content: bytes, headers) -> Dict:
+        """保存响应；内容哈希未变时只刷新元数据"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        key = self._key(url)
+        now = time.time()
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and entry.get("content_hash") == content_hash:
+                self.stats["unchanged"] += 1
+            else:
+                self._write_file(self._body_path(key), content)
+                self.stats["stored"] += 1
+
+            entry = {
+                "key": key,
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "content_type": headers.get("Content-Type"),
+                "content_hash": content_hash,
+                "size": len(content),
+                "stored_at": now,
+                "last_access": now
+            }
+            self._index[key] = entry
+            self._evict()
+            self._mark_dirty()
+            return entry
+
+    def refresh(self, entry: Dict, headers) -> None:
+        """304后刷新条目的TTL和校验信息"""
+        with self._lock:
+            entry["stored_at"] = time.time()
+            entry["etag"] = headers.get("ETag") or entry.get("etag")
+            entry["last_modified"] = headers.get("Last-Modified") or entry.get("last_modified")
+            self._mark_dirty()
+
+    def record(self, name: str) -> None:
+        """累加统计计数"""
+        with self._lock:
+            self.stats[name] += 1
+
+    def flush(self) -> None:
+        """把有改动的索引立即写盘"""
+        with self._lock:
+            if self._index_dirty:
+                self._save_index()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self._save_index()
+
+    def get_stats(self) -> Dict:
+        """获取缓存统计"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats["entries"] = len(self._index)
+            stats["total_bytes"] = sum(e.get("size", 0) for e in self._index.values())
+            return stats
+
+    def _evict(self):
+        """超出容量时按最久未访问顺序淘汰"""
+        total = sum(e.get("size", 0) for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for entry in sorted(self._index.values(), key=lambda e: e.get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            total -= entry.get("size", 0)
+            self._remove(entry["key"])
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _mark_dirty(self):
+        """索引有改动：距上次写盘超过 index_flush_seconds 时写盘（调用方持有锁）"""
+        self._index_dirty = True
+        if time.monotonic() - self._index_saved_at >= self.index_flush_seconds:
+            self._save_index()
+
+    def _save_index(self):
+        self._index_dirty = False
+        self._index_saved_at = time.monotonic()
+        self.stats["index_writes"] += 1
+        try:
+            data = json.dumps(self._index).encode("utf-8")
+            self._write_file(os.path.join(self.cache_dir, self.INDEX_FILE), data)
+        except OSError as e:
+            self._index_dirty = True
+            logger.warning(f"Failed to save response cache index: {str(e)}")
+
+    def _write_file(self, path: str, data: bytes):
+        """原子写入（先写临时文件再替换）"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class CachingAdapter(HTTPAdapter):
+    """带缓存的HTTP适配器 - 挂载到requests.Session上，对GET请求透明生效
+
+    TTL内直接返回缓存；过期后发送条件请求（If-None-Match / If-Modified-Since），
+    304时复用缓存内容。返回的Response带有 from_cache 和 content_hash 属性。
+    stream=True 的请求不预先读取正文：调用方读完正文后才写入缓存（没读完的不缓存），
+    此前 content_hash 为 None。
+    """
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry and self.cache.is_fresh(entry):
+            cached = self._build_response(request, entry)
+            if cached is not None:
+                self.cache.record("hits")
+                return cached
+            entry = None
+
+        if entry:
+            if entry.get("etag"):
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            cached = self._build_response(request, entry)
+            if cached is not None:
+                self.cache.refresh(entry, response.headers)
+                self.cache.record("revalidated")
+                response.close()
+                return cached
+
+        response.from_cache = False
+        response.content_hash = None
+        if response.status_code != 200:
+            return response
+
+        self.cache.record("misses")
+        url, headers = request.url, response.headers
+
+        def store(content: bytes):
+            response.content_hash = self.cache.store(url, content, headers)["content_hash"]
+
+        if kwargs.get("stream"):
+            response.raw = _CachingBody(response.raw, store)
+        else:
+            store(response.content)
+        return response
+
+    def _build_response(self, request, entry: Dict) -> Optional[Response]:
+        """用缓存内容构造Response"""
+        body = self.cache.read_body(entry)
+        if body is None:
+            return None
+
+        response = Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = body
+        response._content_consumed = True  # 正文已在内存中，iter_content() 直接分块返回
+        response.headers = CaseInsensitiveDict({"Content-Type": entry.get("content_type") or "text/html"})
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.encoding = get_encoding_from_headers(response.headers) or "utf-8"
+        response.from_cache = True
+        response.content_hash = entry["content_hash"]
+        return response
+
+
+class _CachingBody:
+    """流式响应的正文：调用方逐块读取时收集内容，读完后交给 on_complete 写入缓存"""
+
+    def __init__(self, raw, on_complete):
+        self._raw = raw
+        self._on_complete = on_complete
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None):
+        chunks = []
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            chunks.append(chunk)
+            yield chunk
+        self._on_complete(b"".join(chunks))
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
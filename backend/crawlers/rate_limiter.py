@@ -0,0 +1,244 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# 服务端限流/过载的状态码
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class TokenBucket:
+    """令牌桶 - 限制单个主机的请求速率"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """取一个令牌，必要时阻塞；返回等待的秒数"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                delay = self._paused_until - now
+                if delay <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """服务端要求退避（Retry-After）时暂停发放令牌"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+class AIMDWindow:
+    """AIMD并发窗口 - 成功时加性增大，延迟恶化或被限流时乘性减小"""
+
+    def __init__(self, min_window: float = 1, max_window: float = 8, initial: Optional[float] = None,
+                 decrease_factor: float = 0.5, latency_factor: float = 2.0, latency_slack: float = 0.05,
+                 cooldown: float = 1.0):
+        self.min_window = min_window
+        self.max_window = max_window
+        self.window = initial if initial is not None else max(min_window, max_window / 2)
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.latency_slack = latency_slack
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.base_latency: Optional[float] = None
+        self.latency_ewma: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """等待窗口内有空位"""
+        with self._cond:
+            while self.in_flight >= int(self.window):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """根据观测延迟调整窗口"""
+        with self._cond:
+            self.base_latency = latency if self.base_latency is None else min(self.base_latency, latency)
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+            if (self.latency_ewma > self.base_latency * self.latency_factor
+                    and self.latency_ewma - self.base_latency > self.latency_slack):
+                # 排队延迟明显上升，说明服务端已经饱和
+                self._decrease()
+            else:
+                # 每个窗口的成功请求合计增加1
+                self.window = min(self.max_window, self.window + 1.0 / self.window)
+            self._cond.notify_all()
+
+    def on_congestion(self) -> None:
+        """被限流或连接出错时乘性减小"""
+        with self._cond:
+            self._decrease()
+
+    def _decrease(self):
+        # 冷却期内只减小一次，避免同一批并发失败把窗口压到最小
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.window = max(self.min_window, self.window * self.decrease_factor)
+        if self.latency_ewma is not None and self.base_latency is not None:
+            # 减小后让延迟基线重新收敛
+            self.latency_ewma = self.base_latency
+
+
+class HostLimiter:
+    """单个主机的限流状态"""
+
+    def __init__(self, rate: float, burst: float, min_window: float, max_window: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.window = AIMDWindow(min_window=min_window, max_window=max_window)
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "retries": 0,
+            "errors": 0,
+            "wait_seconds": 0.0
+        }
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.stats[name] += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stats = self.stats.copy()
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats["window"] = round(self.window.window, 2)
+        stats["in_flight"] = self.window.in_flight
+        stats["latency_ms"] = round(self.window.latency_ewma * 1000, 1) if self.window.latency_ewma else None
+        stats["rate_per_sec"] = self.bucket.rate
+        return stats
+
+
+class AdaptiveRateLimiter:
+    """自适应限流器 - 每个主机一个令牌桶和AIMD并发窗口，失败时带抖动重试"""
+
+    def __init__(self, rate: float = 5.0, burst: float = 10.0, min_window: float = 1,
+                 max_window: float = 8, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_window = min_window
+        self.max_window = max_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str) -> HostLimiter:
+        netloc = urlparse(url).netloc
+        with self._lock:
+            limiter = self._hosts.get(netloc)
+            if limiter is None:
+                limiter = HostLimiter(self.rate, self.burst, self.min_window, self.max_window)
+                self._hosts[netloc] = limiter
+            return limiter
+
+    def send(self, url: str, send_once):
+        """在限流控制下发送请求，429/503和连接错误时退避重试"""
+        limiter = self.host(url)
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                limiter.count("retries")
+
+            limiter.window.acquire()
+            error = None
+            try:
+                limiter.count("wait_seconds", limiter.bucket.acquire())
+                limiter.count("requests")
+                start = time.perf_counter()
+                response = send_once()
+                latency = time.perf_counter() - start
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            finally:
+                limiter.window.release()
+
+            if error is not None:
+                limiter.count("errors")
+                limiter.window.on_congestion()
+                if attempt >= self.max_retries:
+                    raise error
+                logger.warning(f"Request to {url} failed ({str(error)}), retrying")
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in THROTTLE_STATUS_CODES:
+                limiter.count("throttled")
+                limiter.window.on_congestion()
+                if attempt >= self.max_retries:
+                    return response
+
+                delay = max(self._retry_after(response), self._backoff(attempt))
+                limiter.bucket.pause(delay)
+                logger.warning(f"Throttled by {url} ({response.status_code}), retrying in {delay:.1f}s")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            limiter.window.on_success(latency)
+            return response
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """各主机当前窗口和限流计数"""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: limiter.snapshot() for host, limiter in hosts.items()}
+
+    def _backoff(self, attempt: int) -> float:
+        """指数退避 + 全抖动"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after(self, response) -> float:
+        try:
+            return min(self.backoff_max, float(response.headers.get("Retry-After", 0)))
+        except (TypeError, ValueError):
+            return 0.0
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """限流HTTP适配器 - 所有实际发出的网络请求都经过 AdaptiveRateLimiter"""
+
+    def __init__(self, limiter: AdaptiveRateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        return self.limiter.send(request.url, lambda: super(RateLimitedAdapter, self).send(request, **kwargs))
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_CHARS_RE = re.compile(r'[^A-Za-z0-9]+')
+
+
+def _path_key(url: str) -> str:
+    """请求的路径+查询串（与主机无关，同一份录制可以对任意BASE_URL回放）"""
+    parsed = urlparse(url)
+    path = parsed.path or "/"
+    return f"{path}?{parsed.query}" if parsed.query else path
+
+
+class FixtureStore:
+    """录制页面存储 - 按请求路径保存HTML，index.json 记录路径到文件名的映射"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index: Dict[str, str] = {}
+        self._bodies: Dict[str, bytes] = {}
+
+        try:
+            with open(os.path.join(directory, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load fixture index from {directory}: {str(e)}")
+
+    def get(self, url: str) -> Optional[bytes]:
+        """读取录制的页面（首次读取后保存在内存中，回放时不再有磁盘开销）"""
+        key = _path_key(url)
+        with self._lock:
+            body = self._bodies.get(key)
+            file_name = self._index.get(key)
+        if body is not None or file_name is None:
+            return body
+
+        try:
+            with open(os.path.join(self.directory, file_name), "rb") as f:
+                body = f.read()
+        except OSError as e:
+            logger.warning(f"Missing fixture file for {key}: {str(e)}")
+            return None
+
+        with self._lock:
+            self._bodies[key] = body
+        return body
+
+    def put(self, url: str, body: bytes) -> None:
+        """录制一个页面"""
+        key = _path_key(url)
+        file_name = (_UNSAFE_CHARS_RE.sub("_", key).strip("_") or "index") + ".html"
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f"{file_name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, os.path.join(self.directory, file_name))
+
+        with self._lock:
+            self._index[key] = file_name
+            self._bodies[key] = body
+            self._save_index()
+
+    def paths(self) -> List[str]:
+        with self._lock:
+            return sorted(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _save_index(self):
+        tmp_path = os.path.join(self.directory, f"{self.INDEX_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, os.path.join(self.directory, self.INDEX_FILE))
+
+
+class ReplayAdapter(HTTPAdapter):
+    """回放适配器 - 从 FixtureStore 返回录制的页面，不访问网络，可注入延迟
+
+    每个请求等待 latency + [0, jitter) 秒，模拟真实站点的响应时间；未录制的路径返回404。
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.stats = {"requests": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = self.store.get(request.url)
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            if body is None:
+                self.stats["misses"] += 1
+
+        response = Response()
+        response.status_code = 200 if body is not None else 404
+        response.reason = "OK" if body is not None else "Not Found"
+        response._content = body if body is not None else b""
+        response._content_consumed = True  # 正文已在内存中，iter_content() 直接分块返回
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.encoding = "utf-8"
+        return response
+
+
+class RecordingAdapter(BaseAdapter):
+    """录制适配器 - 包装实际发请求的适配器，把成功的GET响应写入 FixtureStore"""
+
+    def __init__(self, store: FixtureStore, inner: BaseAdapter):
+        super().__init__()
+        self.store = store
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        if request.method == "GET" and response.status_code == 200:
+            self.store.put(request.url, response.content)
+        return response
+
+    def close(self):
+        self.inner.close()
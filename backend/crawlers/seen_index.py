@@ -0,0 +1,140 @@
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from backend.crawlers.http_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+class SeenIndex:
+    """已处理帖子索引 - 持久化的已见item id集合（带高水位和互动快照）
+
+    文件为按id排序的文本，每行 "item_id score comments"，首行记录高水位和下限。
+    超过 max_entries 时丢弃最旧的id，低于下限的id一律视为已处理（旧帖子）。
+    """
+
+    FILE_NAME = "seen_items.txt"
+
+    def __init__(self, path: Optional[str] = None, score_delta: int = 10, comments_delta: int = 5,
+                 max_entries: int = 200000):
+        self.path = path or os.path.join(default_cache_dir(), self.FILE_NAME)
+        self.score_delta = score_delta
+        self.comments_delta = comments_delta
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self.high_watermark = 0
+        self.floor = 0
+        self._items: Dict[int, Tuple[int, int]] = {}
+        self._dirty = False
+        self._load()
+
+    def status(self, post: Dict) -> str:
+        """判断帖子状态：new / changed / unchanged"""
+        item_id = self._item_id(post)
+        if item_id is None:
+            return "new"
+
+        with self._lock:
+            if item_id > self.high_watermark:
+                return "new"
+
+            seen = self._items.get(item_id)
+            if seen is None:
+                return "unchanged" if item_id < self.floor else "new"
+
+        score, comments = seen
+        if (post.get("score", 0) - score >= self.score_delta
+                or post.get("comments", 0) - comments >= self.comments_delta):
+            return "changed"
+
+        return "unchanged"
+
+    def partition(self, posts: List[Dict]) -> Dict[str, List[Dict]]:
+        """把帖子按状态分组"""
+        groups = {"new": [], "changed": [], "unchanged": []}
+        for post in posts:
+            groups[self.status(post)].append(post)
+        return groups
+
+    def mark(self, posts: List[Dict]) -> None:
+        """记录已处理的帖子及其当前分数/评论数"""
+        with self._lock:
+            for post in posts:
+                item_id = self._item_id(post)
+                if item_id is None:
+                    continue
+                self._items[item_id] = (post.get("score", 0), post.get("comments", 0))
+                self.high_watermark = max(self.high_watermark, item_id)
+                self._dirty = True
+
+            self._prune()
+
+    def save(self) -> None:
+        """原子写入索引文件"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            lines = [f"# high_watermark={self.high_watermark} floor={self.floor}\n"]
+            lines.extend(
+                f"{item_id} {score} {comments}\n"
+                for item_id, (score, comments) in sorted(self._items.items())
+            )
+
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Failed to save seen index: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _prune(self):
+        """只保留最新的 max_entries 个id"""
+        overflow = len(self._items) - self.max_entries
+        if overflow <= 0:
+            return
+
+        oldest = sorted(self._items)[:overflow]
+        for item_id in oldest:
+            del self._items[item_id]
+        self.floor = max(self.floor, oldest[-1] + 1)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("#"):
+                        for field in line[1:].split():
+                            key, _, value = field.partition("=")
+                            if key == "high_watermark":
+                                self.high_watermark = int(value)
+                            elif key == "floor":
+                                self.floor = int(value)
+                        continue
+
+                    parts = line.split()
+                    if len(parts) == 3:
+                        self._items[int(parts[0])] = (int(parts[1]), int(parts[2]))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load seen index, starting empty: {str(e)}")
+            self._items = {}
+            self.high_watermark = 0
+            self.floor = 0
+
+    @staticmethod
+    def _item_id(post: Dict) -> Optional[int]:
+        try:
+            return int(post.get("item_id"))
+        except (TypeError, ValueError):
+            return None
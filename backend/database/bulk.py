@@ -0,0 +1,146 @@
+"""批量写入 - PostgreSQL 上用 COPY FROM STDIN，其他数据库（或驱动不支持 COPY 时）用 executemany
+
+行是列名到值的字典，所有行的键相同；主键和默认值由调用方预先填好（COPY 不会执行模型上的默认值）。
+bulk_upsert 按唯一键插入或更新（INSERT ... ON CONFLICT DO UPDATE）：PostgreSQL 上先 COPY 到
+临时表再整体 INSERT ... SELECT，SQLite 上用同样语法的 executemany。
+"""
+
+import io
+import json
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+# COPY 文本格式中需要转义的字符
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def bulk_insert(session, model, rows: List[Dict]) -> str:
+    """在当前会话的事务中批量插入，返回使用的方式（"copy" / "executemany"）"""
+    if not rows:
+        return "executemany"
+
+    if session.get_bind().dialect.name == "postgresql":
+        cursor = session.connection().connection.cursor()
+        try:
+            if _copy_rows(cursor, model.__table__, rows):
+                return "copy"
+        finally:
+            cursor.close()
+
+    session.execute(insert(model), rows)
+    return "executemany"
+
+
+def bulk_upsert(session, model, rows: List[Dict], key_columns: Sequence[str],
+                update_columns: Sequence[str]) -> List:
+    """按唯一键（key_columns）批量插入或更新 update_columns，返回与 rows 一一对应的主键
+
+    键已存在的行保留原来的主键；同一批内键相同的行只写入最后一条。键中有空值的行总是插入新行。
+    不支持 ON CONFLICT 的数据库按普通批量插入处理。
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    primary_key = table.primary_key.columns.values()[0].name
+
+    def key_of(row: Dict) -> Tuple:
+        return tuple(row[name] for name in key_columns)
+
+    # 同一条语句不能两次更新同一行
+    latest = {}
+    for row in rows:
+        key = key_of(row)
+        if None not in key:
+            latest[key] = row
+    unique_rows = [row for row in rows if None in key_of(row) or latest[key_of(row)] is row]
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stored = _upsert_postgresql(session, table, unique_rows, primary_key, key_columns, update_columns)
+    elif dialect == "sqlite":
+        stored = _upsert_returning(session, sqlite.insert(table), unique_rows, primary_key, key_columns,
+                                   update_columns)
+    else:
+        bulk_insert(session, model, unique_rows)
+        stored = {}
+
+    ids = []
+    for row in rows:
+        key = key_of(row)
+        if None in key:
+            ids.append(row[primary_key])
+        else:
+            ids.append(stored.get(key, latest[key][primary_key]))
+    return ids
+
+
+def _upsert_returning(session, statement, rows: List[Dict], primary_key: str, key_columns: Sequence[str],
+                      update_columns: Sequence[str]) -> Dict[Tuple, str]:
+    """INSERT ... ON CONFLICT DO UPDATE ... RETURNING 的 executemany，返回 {键: 主键}"""
+    table = statement.table
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={name: statement.excluded[name] for name in update_columns}
+    ).returning(table.c[primary_key], *[table.c[name] for name in key_columns])
+    result = session.execute(statement, rows)
+    return {tuple(row[1:]): row[0] for row in result}
+
+
+def _upsert_postgresql(session, table, rows: List[Dict], primary_key: str, key_columns: Sequence[str],
+                       update_columns: Sequence[str]) -> Dict[Tuple, str]:
+    """COPY 到临时表（事务结束时删除），再一条 INSERT ... SELECT ... ON CONFLICT 合并"""
+    cursor = session.connection().connection.cursor()
+    try:
+        staging = f"{table.name}_staging"
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP")
+        if _copy_rows(cursor, table, rows, target=staging):
+            names = ", ".join(rows[0])
+            updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in update_columns)
+            cursor.execute(
+                f"INSERT INTO {table.name} ({names}) SELECT {names} FROM {staging} "
+                f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates} "
+                f"RETURNING {primary_key}, {', '.join(key_columns)}"
+            )
+            return {tuple(row[1:]): row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+    return _upsert_returning(session, postgresql.insert(table), rows, primary_key, key_columns, update_columns)
+
+
+def _copy_rows(cursor, table, rows: List[Dict], target: Optional[str] = None) -> bool:
+    """用 COPY 写入 table（或结构相同的 target 表）；驱动既没有 copy()（psycopg 3）也没有
+    copy_expert()（psycopg2）时返回 False"""
+    names = list(rows[0])
+    json_columns = {name for name in names if isinstance(table.c[name].type, JSON)}
+    data = "".join(
+        "\t".join(_copy_value(row[name], name in json_columns) for name in names) + "\n"
+        for row in rows
+    )
+    sql = f"COPY {target or table.name} ({', '.join(names)}) FROM STDIN"
+
+    if hasattr(cursor, "copy"):
+        with cursor.copy(sql) as copy:
+            copy.write(data)
+        return True
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, io.StringIO(data))
+        return True
+    return False
+
+
+def _copy_value(value, is_json: bool = False) -> str:
+    if value is None:
+        return "\\N"
+    if is_json:
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
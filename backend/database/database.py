@@ -1,7 +1,7 @@
 import os
-from sqlalchemy import create_engine
+from typing import List, Optional
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError
 from contextlib import contextmanager
 import logging
 from .models import Base
@@ -16,6 +16,8 @@ class Database:
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        # 已有表中缺少的列和索引（None 表示还没检查）
+        self.schema_problems: Optional[List[str]] = None
         self._initialize()
     
     def _initialize(self):
@@ -54,14 +56,61 @@ class Database:
             raise
     
     def create_tables(self):
-        """创建所有表（如果不存在）"""
+        """创建所有表（如果不存在）
+
+        新数据库建表后标记为最新的迁移版本；已有的表缺少模型中的列或索引时只记录警告
+        （需要运行 alembic upgrade head），依赖它们的写入操作调用 require_schema() 时才失败。
+        """
         try:
+            fresh = not inspect(self.engine).has_table("demands")
             Base.metadata.create_all(bind=self.engine)
+            if fresh:
+                self._stamp_head()
+            self.schema_problems = self._check_schema()
+            if self.schema_problems:
+                logger.warning(f"Database schema is out of date (missing {', '.join(self.schema_problems)}): "
+                               f"run `alembic upgrade head` before crawling; saving demands is disabled until then")
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Failed to create tables: {str(e)}")
             raise
     
+    def require_schema(self):
+        """保存需求前调用：表结构落后于模型（缺少自然键的列或唯一索引，ON CONFLICT 依赖它们）时报错"""
+        if self.schema_problems is None:
+            self.schema_problems = self._check_schema()
+        if self.schema_problems:
+            raise RuntimeError(f"Database schema is out of date (missing {', '.join(self.schema_problems)}), "
+                               f"run `alembic upgrade head` first")
+    
+    def _check_schema(self) -> List[str]:
+        """create_all 不会修改已有的表：返回已有表中缺少的列和索引"""
+        inspector = inspect(self.engine)
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            missing.extend(f"column {table.name}.{column.name}" for column in table.columns if column.name not in columns)
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            missing.extend(f"index {index.name}" for index in table.indexes if index.name not in indexes)
+        return missing
+    
+    def _stamp_head(self):
+        """新建的数据库已是最新结构：记录为最新的迁移版本，以后只需运行之后的迁移"""
+        try:
+            from alembic import command
+            from alembic.config import Config
+        except ImportError:
+            logger.debug("alembic is not installed, skipping migration stamp")
+            return
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        ini_path = os.path.join(root, "alembic.ini")
+        if not os.path.exists(ini_path):
+            return
+        config = Config(ini_path)
+        with self.engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.stamp(config, "head")
+    
     @contextmanager
     def get_session(self):
         """获取数据库会话的上下文管理器"""
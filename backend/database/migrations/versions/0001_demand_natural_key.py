@@ -0,0 +1,134 @@
+"""需求自然键 - 补上新增的列，回填已有行的 source_item_id / demand_type，合并重复行后建唯一索引
+
+已有的 demands 表缺少 demand_types、source_item_id、source_score、source_comments、demand_type 列。
+旧行的自然键按以下规则回填：
+  - source_item_id：source_url 是 HN 帖子页（item?id=N）时取 N，否则为 source_url，都没有时为行id
+  - demand_type：demand_types 的第一个，没有记录时为 unknown
+自然键相同的行只保留最早创建的一行（保留原来的id和审核状态），analysis_results 改为指向保留的行。
+新数据库由 create_tables() 按模型建表，这里直接跳过。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_demands_source_item"
+NATURAL_KEY = ["source_platform", "source_item_id", "demand_type"]
+NEW_COLUMNS = [
+    ("demand_types", sa.JSON),
+    ("source_item_id", lambda: sa.String(500)),
+    ("source_score", sa.Integer),
+    ("source_comments", sa.Integer),
+    ("demand_type", lambda: sa.String(100))
+]
+CHUNK_SIZE = 5000
+
+_ITEM_ID_RE = re.compile(r"news\.ycombinator\.com/item\?(?:.*&)?id=(\d+)")
+
+demands = sa.table(
+    "demands",
+    sa.column("id", sa.String),
+    sa.column("source_url", sa.String),
+    sa.column("source_platform", sa.String),
+    sa.column("source_item_id", sa.String),
+    sa.column("demand_type", sa.String),
+    sa.column("demand_types", sa.JSON),
+    sa.column("created_at", sa.DateTime)
+)
+analysis_results = sa.table("analysis_results", sa.column("demand_id", sa.String))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("demands"):
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("demands")}
+    with op.batch_alter_table("demands") as batch:
+        for name, type_ in NEW_COLUMNS:
+            if name not in existing:
+                batch.add_column(sa.Column(name, type_()))
+
+    _backfill(bind)
+    _merge_duplicates(bind, inspector.has_table("analysis_results"))
+
+    if INDEX_NAME not in {index["name"] for index in sa.inspect(bind).get_indexes("demands")}:
+        op.create_index(INDEX_NAME, "demands", NATURAL_KEY, unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="demands")
+    with op.batch_alter_table("demands") as batch:
+        for name, _ in reversed(NEW_COLUMNS):
+            batch.drop_column(name)
+
+
+def _item_id(source_url, demand_id: str) -> str:
+    match = _ITEM_ID_RE.search(source_url or "")
+    if match:
+        return match.group(1)
+    return source_url or demand_id
+
+
+def _backfill(bind) -> None:
+    """分块回填自然键为空的行（每块更新后这些行不再满足条件，下一块从头查询即可）"""
+    missing = sa.or_(demands.c.source_item_id.is_(None), demands.c.demand_type.is_(None))
+    while True:
+        rows = bind.execute(
+            sa.select(demands.c.id, demands.c.source_url, demands.c.source_item_id,
+                      demands.c.demand_type, demands.c.demand_types)
+            .where(missing)
+            .limit(CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            demands.update()
+            .where(demands.c.id == sa.bindparam("row_id"))
+            .values(source_item_id=sa.bindparam("item_id"), demand_type=sa.bindparam("type_")),
+            [
+                {
+                    "row_id": row.id,
+                    "item_id": row.source_item_id or _item_id(row.source_url, row.id),
+                    "type_": row.demand_type or (row.demand_types[0] if row.demand_types else "unknown")
+                }
+                for row in rows
+            ]
+        )
+
+
+def _merge_duplicates(bind, has_analysis_results: bool) -> None:
+    """自然键相同的行保留最早创建的一行，其余行的分析结果转给保留的行后删除"""
+    key = [demands.c[name] for name in NATURAL_KEY]
+    groups = bind.execute(
+        sa.select(*key)
+        .where(*[column.isnot(None) for column in key])
+        .group_by(*key)
+        .having(sa.func.count() > 1)
+    ).all()
+
+    for group in groups:
+        ids = bind.execute(
+            sa.select(demands.c.id)
+            .where(*[column == value for column, value in zip(key, group)])
+            .order_by(demands.c.created_at, demands.c.id)
+        ).scalars().all()
+        keeper, duplicates = ids[0], ids[1:]
+        if has_analysis_results:
+            bind.execute(
+                analysis_results.update()
+                .where(analysis_results.c.demand_id.in_(duplicates))
+                .values(demand_id=keeper)
+            )
+        bind.execute(demands.delete().where(demands.c.id.in_(duplicates)))
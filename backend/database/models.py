@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -9,9 +9,15 @@ Base = declarative_base()
 def generate_uuid():
     return str(uuid.uuid4())
 
+# 需求的自然键：同一来源条目（帖子或评论）的同一需求类型只保存一行，重新爬取时原地更新
+DEMAND_NATURAL_KEY = ("source_platform", "source_item_id", "demand_type")
+
 class Demand(Base):
     """需求表 - 存储挖掘到的工具需求"""
     __tablename__ = "demands"
+    __table_args__ = (
+        Index("uq_demands_source_item", *DEMAND_NATURAL_KEY, unique=True),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     title = Column(String(500), nullable=False)
@@ -61,11 +67,16 @@ class Demand(Base):
     # 来源信息
     source_platform = Column(String(100))
     source_url = Column(String(500))
+    source_item_id = Column(String(500))  # 帖子或评论的id（没有id时为帖子链接）
+    source_score = Column(Integer)  # 帖子分数（互动数据，重新爬取时刷新）
+    source_comments = Column(Integer)  # 帖子评论数
     discovered_at = Column(DateTime, default=datetime.utcnow)
     
     # 标签和分类
     tags = Column(JSON)
     tool_type = Column(String(100))
+    demand_type = Column(String(100))  # 主要需求类型（demand_types 的第一个）
+    demand_types = Column(JSON)  # 命中的全部需求模式类型（JSON数组）
     
     # 状态
     status = Column(String(50), default="new")  # new, reviewed, validated, rejected
@@ -0,0 +1,8 @@
+"""测试公共配置 - 数据库和缓存目录指向临时目录（必须在导入 backend.database 之前设置）"""
+
+import os
+import tempfile
+
+_WORK_DIR = tempfile.mkdtemp(prefix="scout-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_WORK_DIR, 'demands.sqlite3')}"
+os.environ["SCOUT_CACHE_DIR"] = os.path.join(_WORK_DIR, "cache")
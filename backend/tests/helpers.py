@@ -0,0 +1,89 @@
+"""测试辅助 - 合成需求、分析结果的比较键和临时SQLite数据库（测试不依赖基准脚本）"""
+
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database.models import Base
+
+SAMPLE_TEXTS = [
+    "Show HN: I built a tool to automate invoice reminders for freelancers",
+    "Ask HN: Is there a tool for syncing Google Sheets to Notion?",
+    "Ask HN: Looking for a dashboard that monitors cron jobs",
+    "Ask HN: How do you handle database backups for side projects?",
+    "The problem with SaaS pricing is that nobody reads the page",
+    "Show HN: A CLI app for managing Postgres migrations",
+    "Show HN: Open source browser extension that blocks cookie banners",
+    "Show HN: I made a simple API for real-time currency rates",
+    "Ask HN: Need advice on pricing a B2B subscription service",
+    "Is there a service for monitoring SSL certificate expiry across domains?",
+    "Pricing seems reasonable, I would pay for a team plan.",
+    "This looks great, congrats on the launch!",
+]
+
+FILLER_WORDS = [
+    "for", "my", "team", "open", "source", "real-time", "free", "cheap", "simple", "monitor",
+    "pricing", "mac", "linux", "subscription", "need", "urgent", "database", "startup", "launch",
+]
+
+
+def make_demands(size: int, seed: int = 11) -> List[Dict]:
+    """合成需求（文本已转小写）；约十分之一是超过50个词的长文本，约三成文本同时命中两个需求模式（文本相同）"""
+    rng = random.Random(seed)
+    demands = []
+    i = 0
+    while len(demands) < size:
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(0, 8))]
+        text = f"{rng.choice(SAMPLE_TEXTS)} {' '.join(words)} #{i}".lower()
+        if rng.random() < 0.1:
+            text += " " + " ".join(rng.choice(FILLER_WORDS) for _ in range(60))
+        post = {"platform": "hackernews", "title": text[:40], "url": f"https://example.com/{i}"}
+        for _ in range(2 if rng.random() < 0.3 else 1):
+            demands.append({"extracted_text": text, "confidence": 0.7, "source_post": post})
+        i += 1
+    return demands[:size]
+
+
+def comparable(analysis):
+    """分析结果中应当与逐条分析完全一致的字段"""
+    return (analysis["tool_type"], analysis["payment_potential"], analysis["technical_complexity"],
+            analysis["keywords"], analysis["scores"], analysis["source_info"])
+
+
+def derived_values(analyzer, label, scores) -> Dict:
+    """按分类和评分计算需求行的推荐字段（与重新评分写回的值相同）"""
+    # rescoring 依赖 NumPy，只在用到时导入
+    from backend.utils.rescoring import DERIVED_COLUMNS
+
+    tool_type, payment_potential, complexity = label
+    analysis = {"tool_type": tool_type, "payment_potential": payment_potential,
+                "technical_complexity": complexity, "scores": scores}
+    recommendations = analyzer.generate_recommendations(analysis)
+    return {name: get(analysis, recommendations) for name, (get, _) in DERIVED_COLUMNS.items()}
+
+
+class TemporaryDatabase:
+    """临时SQLite数据库，接口与 Database 相同（get_session）"""
+
+    def __init__(self, path: Optional[str] = None):
+        path = path or os.path.join(tempfile.mkdtemp(prefix="scout-tests-"), "demands.sqlite3")
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        Base.metadata.create_all(bind=self.engine)
+
+    @contextmanager
+    def get_session(self):
+        session = self.SessionLocal()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
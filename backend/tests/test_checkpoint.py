@@ -0,0 +1,82 @@
+"""运行检查点测试 - 续跑条件、已完成页的推进和运行结束后删除检查点"""
+
+import json
+import os
+import time
+
+from backend.utils.checkpoint import RunCheckpoint
+from backend.utils.records import Post
+
+PARAMS = {"max_posts": 30}
+
+
+def post(item_id: str, page: int, feed: str = "show") -> Post:
+    return Post(item_id, f"Post {item_id}", f"https://example.com/{item_id}", feed=feed, page=page)
+
+
+def test_begin_resumes_only_a_matching_fresh_checkpoint(tmp_path):
+    path = str(tmp_path / "run.json")
+    first = RunCheckpoint(path)
+    assert first.begin(PARAMS) is False
+    first.record_pages({"show": 1}, [post("1", 1), post("2", 1)])
+    first.mark_processed([post("1", 1)])
+    first.flush(force=True)
+
+    resumed = RunCheckpoint(path)
+    assert resumed.begin(PARAMS) is True
+    assert resumed.run_id == first.run_id
+    assert resumed.is_processed(post("1", 1)) and not resumed.is_processed(post("2", 1))
+    # 续跑从第1页重新列出，已完成页只记录本次尝试的进度
+    assert resumed.pages == {}
+
+    assert RunCheckpoint(path).begin({"max_posts": 60}) is False
+
+
+def test_begin_discards_a_stale_checkpoint(tmp_path):
+    path = str(tmp_path / "run.json")
+    checkpoint = RunCheckpoint(path, max_age_hours=1)
+    checkpoint.begin(PARAMS)
+    checkpoint.mark_processed([post("1", 1)])
+    checkpoint.flush(force=True)
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    state["updated_at"] = time.time() - 2 * 3600
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+    stale = RunCheckpoint(path, max_age_hours=1)
+    assert stale.begin(PARAMS) is False
+    assert not stale.is_processed(post("1", 1))
+
+
+def test_pages_advance_past_fully_processed_pages_only(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "run.json"))
+    checkpoint.begin(PARAMS)
+    checkpoint.record_pages({"show": 3}, [post("1", 1), post("2", 2), post("3", 3), post("4", 1, feed="ask")])
+    assert checkpoint.pages == {}
+
+    checkpoint.mark_processed([post("2", 2)])
+    assert checkpoint.pages == {}
+    checkpoint.mark_processed([post("1", 1)])
+    assert checkpoint.pages == {"show": 2}
+    checkpoint.mark_processed([post("3", 3)])
+    assert checkpoint.pages == {"show": 3}
+
+    # 列出的页没有待处理的帖子时直接完成；还没列出的页不推进
+    checkpoint.record_pages({"show": 4}, [])
+    assert checkpoint.pages == {"show": 4}
+    checkpoint.mark_processed([post("4", 1, feed="ask")])
+    assert "ask" not in checkpoint.pages
+
+
+def test_complete_removes_the_checkpoint(tmp_path):
+    path = str(tmp_path / "run.json")
+    checkpoint = RunCheckpoint(path)
+    checkpoint.begin(PARAMS)
+    checkpoint.mark_processed([post("1", 1)])
+    checkpoint.flush(force=True)
+    assert os.path.exists(path)
+
+    checkpoint.complete()
+    assert not os.path.exists(path)
+    assert RunCheckpoint(path).begin(PARAMS) is False
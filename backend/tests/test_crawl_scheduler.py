@@ -0,0 +1,134 @@
+"""爬取调度测试 - 多个调度实例抢占同一数据源、抢占失败后的重新排队和手动爬取"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from backend.database.database import Database
+from backend.database.models import Source
+from backend.utils.crawl_scheduler import CrawlScheduler
+
+NOW = datetime(2026, 1, 1, 12)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'demands.sqlite3'}")
+    database = Database()
+    database.create_tables()
+    with database.get_session() as session:
+        session.add(Source(id="hn", name="Hacker News", platform="fake", crawl_interval_hours=6,
+                           last_crawled_at=NOW - timedelta(days=1)))
+    yield database
+    database.engine.dispose()
+
+
+def make_scheduler(database, calls, clock=lambda: NOW):
+    def runner(source):
+        calls.append(source["id"])
+        return {"status": "success"}
+    return CrawlScheduler(database=database, runners={"fake": runner}, clock=clock)
+
+
+def crawled_at(database):
+    with database.get_session() as session:
+        return session.get(Source, "hn").last_crawled_at
+
+
+def test_only_one_scheduler_claims_a_due_source(database):
+    calls = []
+    first = make_scheduler(database, calls)
+    second = make_scheduler(database, calls, clock=lambda: NOW + timedelta(minutes=1))
+    first.refresh()
+    second.refresh()
+
+    assert first.run_pending() == 1
+    first.stop()
+    assert second.run_pending() == 0
+    second.stop()
+
+    assert calls == ["hn"]
+    assert second.stats["lost_claims"] == 1
+    # 抢占失败后按数据库中新的 last_crawled_at 排下一次
+    assert second._heap == [(NOW + timedelta(hours=6), "hn")]
+
+
+def test_source_busy_with_a_manual_run_is_retried(database):
+    calls = []
+    now = [NOW]
+    scheduler = make_scheduler(database, calls, clock=lambda: now[0])
+    scheduler.retry_seconds = 30
+    scheduler.refresh()
+
+    lock = scheduler._source_lock("hn")
+    with lock:
+        assert scheduler.run_pending() == 0
+    assert scheduler._heap == [(NOW + timedelta(seconds=30), "hn")]
+
+    now[0] = NOW + timedelta(seconds=30)
+    assert scheduler.run_pending() == 1
+    scheduler.stop()
+    assert calls == ["hn"]
+
+
+def test_lost_claim_without_a_crawl_time_is_rescheduled(database):
+    with database.get_session() as session:
+        session.execute(update(Source).where(Source.id == "hn").values(last_crawled_at=None))
+    scheduler = make_scheduler(database, [])
+    scheduler.refresh()
+    # 另一个实例抢占后又停用了数据源：条件更新失败，重新读取也没有爬取时间
+    with database.get_session() as session:
+        session.execute(update(Source).where(Source.id == "hn").values(is_active=False))
+
+    assert scheduler.run_pending() == 0
+    scheduler.stop()
+    assert scheduler._heap == [(NOW + timedelta(hours=6), "hn")]
+
+
+def test_run_platform_skips_when_another_scheduler_claims_first(database):
+    calls = []
+    scheduler = make_scheduler(database, calls)
+    source_info = scheduler._source_info
+
+    def read_then_lose_race(source):
+        info = source_info(source)
+        with database.get_session() as session:
+            session.execute(update(Source).where(Source.id == "hn").values(last_crawled_at=NOW))
+        return info
+    scheduler._source_info = read_then_lose_race
+
+    assert scheduler.run_platform("fake", max_posts=5) == {"status": "skipped",
+                                                           "reason": "claimed by another scheduler"}
+    assert calls == []
+
+
+def test_run_platform_claims_the_source_row(database):
+    calls = []
+    scheduler = make_scheduler(database, calls)
+
+    assert scheduler.run_platform("fake", max_posts=5) == {"status": "success"}
+    assert calls == ["hn"]
+    assert crawled_at(database) == NOW
+
+
+def test_runs_sharing_a_pipeline_are_serialized(database):
+    class SlowPipeline:
+        active = peak = 0
+
+        def run_hackernews_pipeline(self, max_posts):
+            SlowPipeline.active += 1
+            SlowPipeline.peak = max(SlowPipeline.peak, SlowPipeline.active)
+            time.sleep(0.05)
+            SlowPipeline.active -= 1
+            return {"status": "success"}
+
+    runner = CrawlScheduler(database=database, pipeline=SlowPipeline()).runners["hackernews"]
+    threads = [threading.Thread(target=runner, args=({"config": {}},)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert SlowPipeline.peak == 1
@@ -0,0 +1,186 @@
+"""数据库测试 - 已有数据库的结构迁移（alembic）、建表时的结构检查、按自然键的批量 upsert 和多模式命中只存一行"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import MetaData, Table, create_engine, insert, inspect, select
+
+from backend.database.bulk import bulk_upsert
+from backend.database.database import Database
+from backend.database.models import DEMAND_NATURAL_KEY, AnalysisResult, Base, Demand
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 迁移 0001 之前 demands 表还没有的列
+NEW_COLUMNS = {"demand_types", "source_item_id", "source_score", "source_comments", "demand_type"}
+
+
+@pytest.fixture
+def old_database(tmp_path, monkeypatch):
+    """迁移前结构的SQLite数据库（没有自然键相关的列和唯一索引）"""
+    url = f"sqlite:///{tmp_path / 'old.sqlite3'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    old = MetaData()
+    for table in Base.metadata.sorted_tables:
+        Table(table.name, old, *[column._copy() for column in table.columns if column.name not in NEW_COLUMNS])
+    engine = create_engine(url)
+    old.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def old_demand(demand_id: str, source_url: str, created_at: datetime, status: str = "new"):
+    return dict(id=demand_id, title="t", description="d", problem="p", source_platform="hackernews",
+                source_url=source_url, created_at=created_at, status=status)
+
+
+def test_outdated_schema_warns_and_blocks_only_saving(old_database, caplog):
+    database = Database()
+    database.create_tables()
+
+    assert "alembic upgrade head" in caplog.text
+    assert "column demands.source_item_id" in database.schema_problems
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        database.require_schema()
+
+
+def test_new_database_is_stamped_at_the_latest_migration(tmp_path, monkeypatch):
+    pytest.importorskip("alembic")
+    from alembic.runtime.migration import MigrationContext
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'new.sqlite3'}")
+    database = Database()
+    database.create_tables()
+    database.require_schema()
+    with database.engine.connect() as connection:
+        assert MigrationContext.configure(connection).get_current_revision() == "0001"
+    database.engine.dispose()
+
+
+def test_migration_backfills_natural_keys_and_merges_duplicates(old_database):
+    command = pytest.importorskip("alembic.command")
+    from alembic.config import Config
+
+    now = datetime(2026, 1, 1)
+    item_url = "https://news.ycombinator.com/item?id=42"
+    with old_database.begin() as connection:
+        connection.execute(insert(Table("demands", MetaData(), autoload_with=connection)), [
+            old_demand("a", item_url, now, status="reviewed"),
+            old_demand("b", item_url, now + timedelta(hours=1)),
+            old_demand("c", "https://example.com/tool", now),
+            old_demand("d", None, now)
+        ])
+        connection.execute(insert(Table("analysis_results", MetaData(), autoload_with=connection)), [
+            {"id": "r1", "demand_id": "b"}
+        ])
+
+    config = Config(os.path.join(REPO_ROOT, "alembic.ini"))
+    command.upgrade(config, "head")
+
+    with old_database.connect() as connection:
+        rows = {row.id: row for row in connection.execute(
+            select(Demand.id, Demand.source_item_id, Demand.demand_type, Demand.status)
+        )}
+        result_owner = connection.execute(select(AnalysisResult.demand_id)).scalar_one()
+
+    # 同一帖子的两行合并为最早创建的一行，审核状态和分析结果都保留
+    assert set(rows) == {"a", "c", "d"}
+    assert (rows["a"].source_item_id, rows["a"].demand_type, rows["a"].status) == ("42", "unknown", "reviewed")
+    assert rows["c"].source_item_id == "https://example.com/tool"
+    assert rows["d"].source_item_id == "d"
+    assert result_owner == "a"
+    assert "uq_demands_source_item" in {index["name"] for index in inspect(old_database).get_indexes("demands")}
+
+    # 迁移后建表检查通过；再次升级不做任何事
+    database = Database()
+    database.create_tables()
+    database.require_schema()
+    command.upgrade(config, "head")
+
+
+def demand_row(demand_id: str, item_id: str, overall: float, demand_type="wish"):
+    now = datetime.utcnow()
+    return dict(id=demand_id, title="t", description="d", problem="p", source_platform="hackernews",
+                source_item_id=item_id, demand_type=demand_type, overall_score=overall, status="new",
+                discovered_at=now, created_at=now, updated_at=now)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'demands.sqlite3'}")
+    database = Database()
+    database.create_tables()
+    yield database
+    database.engine.dispose()
+
+
+def test_bulk_upsert_is_idempotent(database):
+    with database.get_session() as session:
+        ids = bulk_upsert(session, Demand, [demand_row("a", "1", 5.0), demand_row("b", "2", 6.0)],
+                          DEMAND_NATURAL_KEY, ["overall_score"])
+        session.execute(Demand.__table__.update().where(Demand.id == "a").values(status="reviewed"))
+    assert ids == ["a", "b"]
+
+    # 重新爬取同一批条目：新生成的主键被忽略，返回已保存的主键，评分原地更新，审核状态不变
+    with database.get_session() as session:
+        ids = bulk_upsert(session, Demand, [demand_row("x", "1", 8.0), demand_row("y", "2", 9.0)],
+                          DEMAND_NATURAL_KEY, ["overall_score"])
+    assert ids == ["a", "b"]
+
+    with database.get_session() as session:
+        rows = session.execute(select(Demand.id, Demand.overall_score, Demand.status).order_by(Demand.id)).all()
+    assert [tuple(row) for row in rows] == [("a", 8.0, "reviewed"), ("b", 9.0, "new")]
+
+
+def test_bulk_upsert_keeps_the_last_row_per_key_within_a_batch(database):
+    with database.get_session() as session:
+        ids = bulk_upsert(session, Demand, [
+            demand_row("a", "1", 5.0),
+            demand_row("b", "1", 7.0),
+            demand_row("c", "1", 4.0, demand_type="pain_point"),
+            demand_row("d", None, 3.0),
+            demand_row("e", None, 3.0)
+        ], DEMAND_NATURAL_KEY, ["overall_score"])
+    # 同一批内键相同的行写入最后一条；键中有空值的行各自插入
+    assert ids == ["b", "b", "c", "d", "e"]
+
+    with database.get_session() as session:
+        rows = dict(session.execute(select(Demand.id, Demand.overall_score)).all())
+    assert rows == {"b": 7.0, "c": 4.0, "d": 3.0, "e": 3.0}
+
+
+def test_pattern_matches_from_one_item_are_saved_as_one_row(database, monkeypatch):
+    pytest.importorskip("numpy")
+    from backend.analysis.analysis_cache import AnalysisCache
+    from backend.utils import data_pipeline
+    from backend.utils.records import Post
+
+    monkeypatch.setattr(data_pipeline, "db", database)
+    pipeline = data_pipeline.DataPipeline(incremental=False, analysis_cache=AnalysisCache())
+    post = Post("42", "Ask HN: Is there a tool for invoices? Looking for a service that sends reminders",
+                "https://news.ycombinator.com/item?id=42", score=10, comments=2, platform="hackernews")
+    comments = [{"comment_id": "c1", "text": "The problem with invoices is chasing them. How do you handle late payers?"}]
+
+    raw_demands = pipeline.crawler.extract_demands_from_post(post, comments)
+    # 帖子标题和评论各命中两个模式，各自合并为一条需求
+    assert [raw.demand_types for raw in raw_demands] == [["tool_request", "tool_inquiry"],
+                                                         ["problem_question", "problem_statement"]]
+
+    def analyzed():
+        analyses = pipeline.analyzer.analyze_batch(raw_demands)
+        return [{"raw": raw, "analysis": analysis, "recommendations": pipeline.analyzer.generate_recommendations(analysis)}
+                for raw, analysis in zip(raw_demands, analyses)]
+
+    assert len(pipeline._save_batch(analyzed())) == 2
+    # 重新爬取同一帖子：按自然键原地更新，不新增行
+    saved = pipeline._save_batch(analyzed())
+    assert all(analyzed_demand["refreshed"] for analyzed_demand in saved)
+
+    with database.get_session() as session:
+        rows = session.execute(select(Demand.source_item_id, Demand.demand_type, Demand.demand_types)
+                               .order_by(Demand.source_item_id)).all()
+    assert [tuple(row) for row in rows] == [
+        ("42", "tool_request", ["tool_request", "tool_inquiry"]),
+        ("c1", "problem_question", ["problem_question", "problem_statement"])
+    ]
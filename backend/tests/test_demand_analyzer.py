@@ -0,0 +1,61 @@
+"""需求分析测试 - analyze_batch（NumPy向量化评分）与逐条 analyze_demand 的结果一致"""
+
+import pytest
+
+from backend.analysis.analysis_cache import AnalysisCache
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.tests.helpers import comparable, make_demands
+
+
+def analyze_both(analyzer: DemandAnalyzer, demands):
+    expected = [analyzer.analyze_demand(demand) for demand in demands]
+
+    # 批量路径出错时会静默退回逐条分析，这里禁止退回，保证比较的是向量化结果
+    def no_fallback(raw_demand):
+        raise AssertionError("analyze_batch fell back to analyze_demand")
+    analyzer.analyze_demand = no_fallback
+    try:
+        actual = analyzer.analyze_batch(demands)
+    finally:
+        del analyzer.analyze_demand
+    return expected, actual
+
+
+@pytest.mark.parametrize("scoring_config", [
+    {},
+    {"weights": {"demand_strength": 0.4, "market_size": 0.1, "passive_income_fit": 0.3}, "high_potential_threshold": 6.5}
+])
+def test_analyze_batch_matches_analyze_demand(scoring_config):
+    pytest.importorskip("numpy")
+    demands = make_demands(2000)
+    demands += [
+        {"extracted_text": "", "confidence": 0.5, "source_post": {"platform": "hackernews"}},
+        {"extracted_text": "I would PAY for an API that automates invoices", "confidence": 0.9,
+         "source_post": {"platform": "hackernews", "title": "Ask HN", "url": "https://example.com/x"}}
+    ]
+    analyzer = DemandAnalyzer(scoring_config=scoring_config)
+
+    expected, actual = analyze_both(analyzer, demands)
+
+    assert len(actual) == len(expected)
+    for one, batched in zip(expected, actual):
+        assert comparable(batched) == comparable(one)
+        assert batched["confidence"] == one["confidence"]
+        assert analyzer.generate_recommendations(batched) == analyzer.generate_recommendations(one)
+
+
+def test_analyze_batch_reuses_cached_features():
+    pytest.importorskip("numpy")
+    demands = make_demands(300)
+    analyzer = DemandAnalyzer(cache=AnalysisCache())
+
+    first = analyzer.analyze_batch(demands)
+    hits_before = analyzer.cache.stats["hits"]
+    second = analyzer.analyze_batch(demands)
+
+    assert [comparable(a) for a in second] == [comparable(a) for a in first]
+    assert analyzer.cache.stats["hits"] > hits_before
+
+
+def test_analyze_batch_empty():
+    assert DemandAnalyzer().analyze_batch([]) == []
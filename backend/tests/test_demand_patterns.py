@@ -0,0 +1,110 @@
+"""需求模式引擎测试 - 字面串预筛后的批量匹配与逐个 re.search 完全一致，字面串从正则推导"""
+
+import re
+
+import pytest
+
+from backend.crawlers.demand_patterns import DemandPatternEngine, load_pattern_sets, required_literals
+
+PATTERN_SETS = load_pattern_sets()
+
+EDGE_TEXTS = [
+    "",
+    " ",
+    "\n",
+    "rust compiler is dead",
+    "is there",
+    "is there a",
+    "IS THERE A LINTER FOR YAML",
+    "Is there\na tool for this",
+    "is there a tool for x\nlooking for a host that scales",
+    "the problem with",
+    "The problem with CI is flaky tests",
+    "how do you\nhandle on-call",
+    "How do you deal with alert fatigue",
+    "we made it",
+    "I built a CLI to automate releases",
+    "madeupword for solve nothing",
+    "Looking for a bookkeeping app which handles receipts",
+    "looking for",
+    "I wish there were a good diff viewer",
+    "wish someone would make an offline maps app",
+    "We'd gladly pay good money for a decent scheduler",
+    "i would pay for",
+    "pay for it",
+    # IGNORECASE 下与ASCII字母等价、lower() 后却不相同的字符
+    "İs there a tool for this",
+    "ıs there a tool for this",
+    "LooKing for a host that scales",
+    "I wiſh there was a tool",
+    "café is there a menu for vegans",
+    "🚀 how do you manage secrets",
+]
+
+
+def corpus():
+    texts = list(EDGE_TEXTS)
+    for specs in PATTERN_SETS.values():
+        for spec in specs:
+            texts.append(spec["example"])
+            texts.append(spec["example"].upper())
+            texts.append(f"prefix {spec['example']} suffix")
+    return texts
+
+
+def expected(patterns, texts):
+    return [[spec["demand_type"] for spec in patterns if re.search(spec["pattern"], text, re.IGNORECASE)]
+            for text in texts]
+
+
+@pytest.mark.parametrize("name", sorted(PATTERN_SETS))
+def test_match_batch_equals_re_search_for_every_shipped_set(name):
+    patterns = PATTERN_SETS[name]
+    engine = DemandPatternEngine(patterns)
+    texts = corpus()
+    want = expected(patterns, texts)
+
+    assert engine._always == []
+    for batch in (1, 2, 7, len(texts)):
+        got = []
+        for offset in range(0, len(texts), batch):
+            got.extend([spec["demand_type"] for spec in matched]
+                       for matched in engine.match_batch(texts[offset:offset + batch]))
+        assert got == want, f"batch size {batch}"
+    assert [[spec["demand_type"] for spec in engine.match(text)] for text in texts] == want
+
+
+def test_all_sets_together_match_like_re_search():
+    patterns = [spec for specs in PATTERN_SETS.values() for spec in specs]
+    engine = DemandPatternEngine.from_config(pattern_sets=PATTERN_SETS)
+    texts = corpus()
+    got = [[spec["demand_type"] for spec in matched] for matched in engine.match_batch(texts)]
+    assert got == expected(patterns, texts)
+    assert engine.match_batch([]) == []
+
+
+@pytest.mark.parametrize("pattern, literals", [
+    ("is there (?:a\\s+)?(.+?)\\s+for", ["is there "]),
+    ("(built|created|made)\\s+(.+)", ["built", "created", "made"]),
+    ("^Foo(bar)?baz", ["foobarbaz", "foobaz"]),
+    ("(?:ab)+c", ["ab"]),
+    ("\\bcat\\b", ["cat"]),
+    ("(?:i'?d|we'?d) pay", ["i'd pay", "id pay", "we'd pay", "wed pay"]),
+    ("a|b.*", ["a", "b"]),
+    ("x?y*", None),
+    (".+", None),
+    ("café", ["caf"]),
+])
+def test_required_literals_are_derived_from_the_regex(pattern, literals):
+    assert required_literals(pattern) == literals
+
+
+def test_patterns_without_literals_are_evaluated_for_every_text():
+    engine = DemandPatternEngine([{"demand_type": "anything", "pattern": "\\d+\\s*\\w+"}])
+    assert engine._always == [0]
+    assert [len(matched) for matched in engine.match_batch(["12 users", "no digits"])] == [1, 0]
+
+
+def test_invalid_pattern_is_rejected():
+    with pytest.raises(ValueError):
+        DemandPatternEngine([{"demand_type": "broken", "pattern": "(unclosed"}])
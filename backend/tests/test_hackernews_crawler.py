@@ -0,0 +1,41 @@
+"""HackerNews爬虫测试 - 已有事件循环时的协程运行和每个线程独立的会话"""
+
+import asyncio
+import threading
+
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler, _run_coroutine
+
+
+async def current_thread() -> int:
+    await asyncio.sleep(0)
+    return threading.get_ident()
+
+
+def test_run_coroutine_without_a_running_loop_runs_in_this_thread():
+    assert _run_coroutine(current_thread()) == threading.get_ident()
+
+
+def test_run_coroutine_inside_a_running_loop_uses_another_thread():
+    async def caller():
+        # FastAPI 等环境中：同步代码在事件循环线程里调用 _run_coroutine
+        return _run_coroutine(current_thread()), threading.get_ident()
+
+    worker_thread, loop_thread = asyncio.run(caller())
+    assert worker_thread != loop_thread
+
+
+def test_each_thread_gets_its_own_session_sharing_the_adapters():
+    crawler = HackerNewsCrawler(crawl_comments=False)
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(crawler._thread_session())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 3
+    assert crawler._thread_session() is crawler._thread_session()
+    for session in sessions:
+        assert session is not crawler.session
+        assert session.get_adapter("https://") is crawler.session.get_adapter("https://")
+        assert session.headers["User-Agent"] == crawler.session.headers["User-Agent"]
@@ -0,0 +1,78 @@
+"""列表页解析测试 - soup 和 lxml 两个后端解析保存的HN页面得到相同的帖子，lxml不可用时回退"""
+
+import os
+import sys
+
+import pytest
+
+from backend.crawlers.hackernews_crawler import HackerNewsCrawler
+from backend.crawlers.hn_parsers import LxmlListingParser, SoupListingParser, get_parser
+
+LISTING_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "hn_listing.html")
+
+
+@pytest.fixture(scope="module")
+def listing_html():
+    with open(LISTING_PATH, encoding="utf-8") as f:
+        return f.read()
+
+
+def parse_posts(parser: str, html: str):
+    crawler = HackerNewsCrawler(parser=parser, crawl_comments=False)
+    assert crawler.parser.name == parser
+    posts, has_more = crawler._parse_html(html, feed="news")
+    # 抓取时间取自当前时间，比较时忽略
+    return [post.replace(crawled_at="") for post in posts], has_more
+
+
+def test_soup_and_lxml_build_the_same_posts(listing_html):
+    pytest.importorskip("lxml")
+    soup_posts, soup_more = parse_posts("soup", listing_html)
+    lxml_posts, lxml_more = parse_posts("lxml", listing_html)
+
+    assert soup_posts == lxml_posts
+    assert soup_more is lxml_more is True
+    # [dead] 行没有标题链接，两个后端都跳过
+    assert [post["item_id"] for post in soup_posts] == [str(item_id) for item_id in range(41000001, 41000007)]
+
+
+def test_listing_fields_for_special_rows(listing_html):
+    pytest.importorskip("lxml")
+    posts = {post["item_id"]: post for post in LxmlListingParser().parse(listing_html)[0]}
+
+    assert posts["41000001"]["score"] == 312 and posts["41000001"]["comments"] == 128
+    # 没有评论时最后一个链接是 "discuss"
+    assert posts["41000002"]["comments"] == 0
+    # 招聘帖：没有分数、作者和评论链接
+    assert posts["41000003"] == {
+        "item_id": "41000003", "title": "Acme (YC W21) Is Hiring a Founding Engineer",
+        "url": "https://jobs.example.org/careers", "score": 0, "comments": 0,
+        "user": "anonymous", "posted_time": "4 hours ago"
+    }
+    # 被标记的帖子：没有分数和评论链接
+    assert (posts["41000004"]["score"], posts["41000004"]["comments"], posts["41000004"]["user"]) == (0, 0, "carol")
+    assert posts["41000005"]["title"] == 'How do you handle "on-call" & burnout?'
+    assert posts["41000005"]["url"] == "https://example.com/'quotes'?a=1&b=2"
+    assert posts["41000005"]["comments"] == 1
+
+
+def test_last_page_has_no_more_link(listing_html):
+    pytest.importorskip("lxml")
+    html = listing_html.replace('class="morelink"', 'class="other"')
+    assert SoupListingParser().parse(html)[1] is False
+    assert LxmlListingParser().parse(html)[1] is False
+
+
+def test_get_parser_falls_back_to_soup_without_lxml(monkeypatch):
+    # sys.modules 中为 None 的模块在导入时抛出 ImportError
+    monkeypatch.setitem(sys.modules, "lxml", None)
+    monkeypatch.setitem(sys.modules, "lxml.html", None)
+
+    parser = get_parser("lxml")
+    assert isinstance(parser, SoupListingParser)
+    assert HackerNewsCrawler(parser="lxml", crawl_comments=False).parser.name == "soup"
+
+
+def test_get_parser_rejects_unknown_backends():
+    with pytest.raises(ValueError):
+        get_parser("html5lib")
@@ -0,0 +1,130 @@
+"""HTTP响应缓存测试 - ETag条件请求（304）、内容哈希未变、流式请求读完后才缓存和索引写盘"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from backend.crawlers.http_cache import CachingAdapter, ResponseCache
+
+
+class PageServer(ThreadingHTTPServer):
+    """返回可配置正文的本地服务器；etag 为 None 时不支持条件请求"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PageHandler)
+        self.body = b"<html>page</html>"
+        self.etag = '"v1"'
+        self.status = 200
+        self.requests = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/page"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+        if server.etag is not None and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(server.status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(server.body)))
+        if server.etag is not None:
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = PageServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def cached_session(cache: ResponseCache) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", CachingAdapter(cache))
+    return session
+
+
+def test_etag_revalidation_reuses_the_cached_body(server, tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    session = cached_session(cache)
+
+    first = session.get(server.url)
+    second = session.get(server.url)
+
+    assert server.requests == [None, '"v1"']
+    assert first.text == second.text == "<html>page</html>"
+    assert not first.from_cache and second.from_cache
+    assert second.content_hash == first.content_hash
+    assert cache.stats["misses"] == 1 and cache.stats["revalidated"] == 1 and cache.stats["hits"] == 0
+
+
+def test_fresh_entries_are_served_without_a_request_when_ttl_is_set(server, tmp_path):
+    session = cached_session(ResponseCache(cache_dir=str(tmp_path), ttl_seconds=60))
+    session.get(server.url)
+    assert session.get(server.url).from_cache
+    assert len(server.requests) == 1
+
+
+def test_unchanged_content_hash_only_refreshes_metadata(server, tmp_path):
+    server.etag = None
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    session = cached_session(cache)
+
+    first = session.get(server.url)
+    second = session.get(server.url)
+    server.body = b"<html>changed</html>"
+    third = session.get(server.url)
+
+    assert first.content_hash == second.content_hash != third.content_hash
+    assert cache.stats["stored"] == 2 and cache.stats["unchanged"] == 1
+    assert cache.read_body(cache.get(server.url)) == b"<html>changed</html>"
+
+
+def test_errors_are_not_cached_or_counted_as_misses(server, tmp_path):
+    server.status = 503
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    response = cached_session(cache).get(server.url)
+
+    assert response.status_code == 503
+    assert cache.get(server.url) is None
+    assert cache.stats["misses"] == 0
+
+
+def test_streamed_responses_are_cached_after_the_body_is_read(server, tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    response = cached_session(cache).get(server.url, stream=True)
+
+    assert cache.get(server.url) is None and response.content_hash is None
+    body = b"".join(response.iter_content(4))
+    assert body == b"<html>page</html>"
+    assert cache.read_body(cache.get(server.url)) == body
+    assert response.content_hash == cache.get(server.url)["content_hash"]
+
+
+def test_index_writes_are_batched_until_flush(server, tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), index_flush_seconds=3600)
+    session = cached_session(cache)
+    for _ in range(5):
+        session.get(server.url)
+    assert cache.stats["index_writes"] == 0
+    assert ResponseCache(cache_dir=str(tmp_path)).get(server.url) is None
+
+    cache.flush()
+    assert cache.stats["index_writes"] == 1
+    assert ResponseCache(cache_dir=str(tmp_path)).get(server.url)["etag"] == '"v1"'
@@ -0,0 +1,107 @@
+"""关键词匹配器测试 - 前缀树正则的逐关键词命中与原来的 `keyword in text` 扫描一致"""
+
+import random
+
+import pytest
+
+from backend.analysis.keyword_matcher import DEFAULT_KEYWORD_DICTIONARIES, KeywordMatcher
+
+EDGE_DICTIONARIES = {
+    "overlap": {
+        # 互相重叠但不是前缀关系：同一段文本里都要计数
+        "chain": ["abc", "bcd", "cde", "b", "d"],
+        "repeat": ["aa", "aaa", "a"]
+    },
+    "prefix": {
+        "words": ["app", "apple", "application", "apps", "ap"],
+        "phrases": ["how to", "how", "how to fix"]
+    },
+    "meta": {
+        "symbols": ["c++", "c#", ".net", "node.js", "a.b", "(beta)", "[tag]", "$5/mo", "x|y", "^_^", "\\n", "?", "*"],
+        "spaces": [" ", "  ", "real-time", "open source"]
+    },
+    "duplicates": {
+        "first": ["free", "api"],
+        "second": ["free", "cheap"]
+    }
+}
+
+EDGE_TEXTS = [
+    "",
+    "a",
+    "aaaa",
+    "abcde",
+    "bcd abc",
+    "apple application apps",
+    "ap",
+    "how to fix how to",
+    "c++ and c# on .net",
+    "nodexjs is not node.js",
+    "axb a.b",
+    "(beta) [tag] $5/mo",
+    "x|y ^_^ \\n",
+    "what? *",
+    "open  source real-time",
+    "free api, cheap",
+    "日本語 app 🚀 c++",
+]
+
+ALPHABET = "abcdeptx.+#()[]$|^\\?* -"
+
+
+def legacy_keywords(dictionaries, text):
+    return sorted({keyword for groups in dictionaries.values() for words in groups.values()
+                   for keyword in words if keyword in text})
+
+
+def legacy_counts(dictionaries, text):
+    return {name: {group: sum(1 for keyword in words if keyword in text) for group, words in groups.items()}
+            for name, groups in dictionaries.items()}
+
+
+def random_texts(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 24))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("text", EDGE_TEXTS)
+def test_edge_keywords_match_the_substring_scan(text):
+    matcher = KeywordMatcher(EDGE_DICTIONARIES, cache_size=0)
+    assert matcher.keywords_in(text) == legacy_keywords(EDGE_DICTIONARIES, text)
+    assert matcher.match(text) == legacy_counts(EDGE_DICTIONARIES, text)
+
+
+def test_random_texts_over_metacharacters_match_the_substring_scan():
+    matcher = KeywordMatcher(EDGE_DICTIONARIES, cache_size=0)
+    for text in random_texts(2000):
+        assert matcher.keywords_in(text) == legacy_keywords(EDGE_DICTIONARIES, text), text
+        assert matcher.match(text) == legacy_counts(EDGE_DICTIONARIES, text), text
+
+
+def test_default_dictionaries_match_the_substring_scan():
+    matcher = KeywordMatcher(DEFAULT_KEYWORD_DICTIONARIES)
+    words = [keyword for groups in DEFAULT_KEYWORD_DICTIONARIES.values()
+             for group in groups.values() for keyword in group]
+    rng = random.Random(11)
+    texts = [" ".join(rng.choice(words + ["the", "x", "-"]) for _ in range(rng.randint(0, 10)))
+             for _ in range(500)]
+    # 拼在一起的关键词（"appi"、"saasapi"）会产生跨词的子串命中
+    texts += ["".join(rng.sample(words, 3)) for _ in range(200)]
+
+    for text in texts:
+        assert matcher.keywords_in(text) == legacy_keywords(DEFAULT_KEYWORD_DICTIONARIES, text)
+        assert matcher.match(text) == legacy_counts(DEFAULT_KEYWORD_DICTIONARIES, text)
+
+
+def test_match_counts_follow_group_order():
+    matcher = KeywordMatcher(EDGE_DICTIONARIES)
+    counts = matcher.match_counts("free api")
+    start, end, groups = matcher.group_slice("duplicates")
+    assert dict(zip(groups, counts[start:end])) == {"first": 2, "second": 1}
+    assert len(counts) == len(matcher.groups)
+
+
+def test_empty_dictionaries_match_nothing():
+    matcher = KeywordMatcher({"empty": {"none": []}})
+    assert matcher.keywords_in("anything") == []
+    assert matcher.match("anything") == {"empty": {"none": 0}}
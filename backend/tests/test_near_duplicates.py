@@ -0,0 +1,71 @@
+"""近似重复测试 - 查询全部候选、同一键替换签名，以及重新爬取的需求原地更新而不被当成重复"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from backend.analysis.analysis_cache import AnalysisCache  # noqa: E402
+from backend.analysis.near_duplicates import NearDuplicateIndex  # noqa: E402
+from backend.utils.data_pipeline import DataPipeline  # noqa: E402
+
+TEXT = "i wish there was a simple tool to track invoices and send reminders to clients every month"
+CLOSER = TEXT + " automatically"
+UNRELATED = "looking for a self hosted kanban board with offline sync for small teams and mobile apps"
+
+
+def test_query_all_returns_every_match_above_threshold():
+    index = NearDuplicateIndex()
+    index.add_many([("a", TEXT), ("b", CLOSER), ("c", UNRELATED)])
+
+    matches = index.query_all(CLOSER)
+    assert [key for key, _ in matches] == ["b", "a"]
+    assert matches[0][1] > matches[1][1] >= index.threshold
+    assert index.query(CLOSER)[0] == "b"
+
+
+def test_add_replaces_signature_of_existing_key():
+    index = NearDuplicateIndex()
+    index.add("a", TEXT)
+    index.add("a", UNRELATED)
+
+    assert len(index) == 1
+    assert index.query(TEXT) is None
+    assert index.query(UNRELATED)[0] == "a"
+
+
+def analyzed(item_id: str, text: str, overall: float = 5.0):
+    return {
+        "raw": {"extracted_text": text, "demand_type": "wish",
+                "source_post": {"platform": "hackernews", "item_id": item_id}},
+        "analysis": {"scores": {"overall": overall}, "source_info": {"platform": "hackernews"}}
+    }
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = DataPipeline(incremental=False, analysis_cache=AnalysisCache(), duplicate_index=NearDuplicateIndex())
+    yield pipeline
+    pipeline.duplicate_index.close()
+
+
+def test_recrawled_item_is_refreshed_even_when_closer_to_another_key(pipeline):
+    mine, other = analyzed("1", TEXT), analyzed("2", CLOSER)
+    pipeline.duplicate_index.add_many([(pipeline._natural_key(mine), TEXT), (pipeline._natural_key(other), CLOSER)])
+
+    # 重新爬取的条目 1 变成了与条目 2 几乎相同的文本：仍然原地更新，不算重复
+    recrawled = analyzed("1", CLOSER)
+    kept, merged, existing = pipeline._drop_near_duplicates([recrawled])
+    assert kept == [recrawled]
+    assert (merged, existing) == (0, 0)
+
+    # 新条目与已收录的条目近似：丢弃
+    kept, merged, existing = pipeline._drop_near_duplicates([analyzed("3", CLOSER)])
+    assert kept == []
+    assert existing == 1
+
+
+def test_near_duplicates_within_a_run_keep_the_best_score(pipeline):
+    low, high = analyzed("1", TEXT, overall=4), analyzed("2", CLOSER, overall=8)
+    kept, merged, existing = pipeline._drop_near_duplicates([low, high, analyzed("3", UNRELATED)])
+    assert [demand["raw"]["source_post"]["item_id"] for demand in kept] == ["2", "3"]
+    assert (merged, existing) == (1, 0)
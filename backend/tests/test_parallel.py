@@ -0,0 +1,30 @@
+"""多进程分析测试 - 进程池路径与单进程 analyze_batch 的结果一致（包括非默认的评分配置）"""
+
+import pytest
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.parallel import ParallelAnalyzer
+from backend.tests.helpers import comparable, make_demands
+
+SCORING_CONFIG = {"weights": {"demand_strength": 0.1, "market_size": 0.5, "passive_income_fit": 0.05},
+                  "high_potential_threshold": 5.5}
+
+
+def test_parallel_scores_match_serial_under_a_custom_config():
+    pytest.importorskip("numpy")
+    demands = make_demands(120)
+    serial = DemandAnalyzer(scoring_config=SCORING_CONFIG).analyze_batch(demands)
+    default = DemandAnalyzer(scoring_config={}).analyze_batch(demands)
+
+    with ParallelAnalyzer(workers=2, chunk_size=30, scoring_config=SCORING_CONFIG) as analyzer:
+        local = analyzer._local_analyzer()
+
+        # 进程池出错时会静默退回本进程分析，这里禁止退回，保证比较的是工作进程的结果
+        def no_fallback(raw_demands):
+            raise AssertionError("ParallelAnalyzer fell back to the local analyzer")
+        local.analyze_batch = no_fallback
+        parallel = analyzer.analyze_batch(demands)
+
+    assert [comparable(analysis) for analysis in parallel] == [comparable(analysis) for analysis in serial]
+    assert [analysis["scores"] for analysis in serial] != [analysis["scores"] for analysis in default]
+    assert local.score_weights == DemandAnalyzer(scoring_config=SCORING_CONFIG).score_weights
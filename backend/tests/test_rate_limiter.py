@@ -0,0 +1,192 @@
+"""限流器测试 - 令牌桶补充、AIMD窗口退避与恢复、Retry-After 暂停和重试耗尽（请求发往本地替身服务器）"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from backend.crawlers.rate_limiter import AdaptiveRateLimiter, AIMDWindow, RateLimitedAdapter, TokenBucket
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    """本地服务器：前 throttle_first 个请求返回429（throttle_first 为 None 时全部返回429），其余返回200"""
+
+    daemon_threads = True
+
+    def __init__(self, throttle_first=0, retry_after=None):
+        super().__init__(("127.0.0.1", 0), ThrottlingHandler)
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "throttled": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def respond(self):
+        """处理一个请求，返回 (状态码, 内容, 响应头)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            throttle = self.throttle_first is None or self.stats["requests"] <= self.throttle_first
+            if throttle:
+                self.stats["throttled"] += 1
+        if not throttle:
+            return 200, b"<html>ok</html>", {"Content-Type": "text/html; charset=utf-8"}
+        headers = {"Content-Type": "text/plain"}
+        if self.retry_after is not None:
+            headers["Retry-After"] = str(self.retry_after)
+        return 429, b"slow down", headers
+
+    def get_stats(self):
+        with self._lock:
+            return self.stats.copy()
+
+    def handle_error(self, request, client_address):
+        # 客户端提前断开连接属于正常情况
+        pass
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status, body, headers = self.server.respond()
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(server: ThrottlingServer) -> ThrottlingServer:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_session(limiter: AdaptiveRateLimiter) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", RateLimitedAdapter(limiter))
+    return session
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    # 桶已空：下一个令牌约 1/rate 秒后补充
+    waited = bucket.acquire()
+    assert 0.02 < waited < 0.2
+
+    time.sleep(0.2)
+    # 空闲期间补满（不超过容量）
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0
+
+
+def test_token_bucket_limits_request_rate(serve):
+    server = serve(ThrottlingServer())
+    limiter = AdaptiveRateLimiter(rate=50, burst=5)
+    session = make_session(limiter)
+
+    start = time.perf_counter()
+    for _ in range(15):
+        assert session.get(f"{server.base_url}/show").status_code == 200
+    elapsed = time.perf_counter() - start
+
+    # 前5个请求用掉突发容量，其余10个按每秒50个补充
+    assert elapsed >= 10 / 50 * 0.9
+    assert limiter.snapshot()[server.base_url.split("//")[1]]["requests"] == 15
+
+
+def test_aimd_window_backs_off_and_recovers(serve):
+    server = serve(ThrottlingServer(throttle_first=1))
+    limiter = AdaptiveRateLimiter(rate=1000, burst=1000, max_window=8, backoff_base=0.001)
+    session = make_session(limiter)
+    window = limiter.host(server.base_url).window
+    assert window.window == 4
+
+    # 第一次请求被限流后重试成功：窗口乘性减半
+    assert session.get(f"{server.base_url}/show").status_code == 200
+    assert window.window == pytest.approx(2 + 1 / 2)
+
+    # 后续请求全部成功：窗口加性增大，直到上限
+    for _ in range(60):
+        assert session.get(f"{server.base_url}/show").status_code == 200
+    assert window.window == 8
+
+
+def test_aimd_window_shrinks_when_latency_rises():
+    window = AIMDWindow(min_window=1, max_window=8, initial=8, cooldown=0)
+    for _ in range(5):
+        window.on_success(0.01)
+    assert window.window == 8
+
+    # 排队延迟明显上升：多次减半，不低于下限
+    for _ in range(10):
+        window.on_success(0.5)
+    assert window.window == 1
+
+
+def test_retry_after_pauses_the_host(serve):
+    server = serve(ThrottlingServer(throttle_first=1, retry_after=0.3))
+    limiter = AdaptiveRateLimiter(rate=1000, burst=1000, backoff_base=0.001)
+    session = make_session(limiter)
+
+    start = time.perf_counter()
+    response = session.get(f"{server.base_url}/show")
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    assert elapsed >= 0.3
+    stats = limiter.host(server.base_url).stats
+    assert stats["throttled"] == 1
+    assert stats["retries"] == 1
+    assert server.get_stats()["requests"] == 2
+
+
+def test_throttled_retries_are_exhausted(serve):
+    server = serve(ThrottlingServer(throttle_first=None))
+    limiter = AdaptiveRateLimiter(rate=1000, burst=1000, max_retries=2, backoff_base=0.001)
+    session = make_session(limiter)
+
+    # 重试用完后把最后一个429交给调用方
+    response = session.get(f"{server.base_url}/show")
+    assert response.status_code == 429
+    assert server.get_stats()["requests"] == 3
+    stats = limiter.host(server.base_url).stats
+    assert stats["throttled"] == 3
+    assert stats["retries"] == 2
+
+
+def test_connection_errors_are_retried_then_raised():
+    # 绑定后立即关闭的端口：连接被拒绝
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    limiter = AdaptiveRateLimiter(rate=1000, burst=1000, max_retries=2, backoff_base=0.001)
+    session = make_session(limiter)
+
+    with pytest.raises(requests.ConnectionError):
+        session.get(f"http://127.0.0.1:{port}/show", timeout=1)
+    stats = limiter.host(f"http://127.0.0.1:{port}").stats
+    assert stats["errors"] == 3
+    assert stats["retries"] == 2
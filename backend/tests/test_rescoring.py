@@ -0,0 +1,40 @@
+"""批量重新评分测试 - 评分、高潜力标记和推荐字段都按新的评分配置重新计算"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from backend.analysis.demand_analyzer import DemandAnalyzer  # noqa: E402
+from backend.analysis.vectorized import score_batch  # noqa: E402
+from backend.database.models import Demand  # noqa: E402
+from backend.tests.helpers import TemporaryDatabase, derived_values  # noqa: E402
+from backend.utils.rescoring import DERIVED_COLUMNS, SCORE_COLUMNS, rescore_demands  # noqa: E402
+
+TEXT = "I would pay for a chrome extension that automates my invoices, an api would be great too"
+
+
+def test_rescoring_updates_scores_and_derived_fields():
+    database = TemporaryDatabase()
+    with database.get_session() as session:
+        session.execute(insert(Demand), [{
+            "id": "1", "title": "t", "description": TEXT, "problem": TEXT,
+            "tool_type": "stale", "technical_complexity": "stale", "recommended_pricing": "$0/month",
+            "mvp_features": [], "main_tech_stack": [], "dev_time_weeks": 0, "overall_score": 0.0
+        }])
+
+    analyzer = DemandAnalyzer(scoring_config={"weights": {"payment_willingness": 0.6, "market_size": 0.1}})
+    stats = rescore_demands(database=database, analyzer=analyzer)
+    assert stats["updated"] == 1
+
+    labels, scores = score_batch(analyzer, [TEXT.lower()])
+    expected = derived_values(analyzer, labels[0], scores[0])
+    with database.get_session() as session:
+        row = session.execute(select(Demand)).scalar_one()
+        assert {name: getattr(row, name) for name in DERIVED_COLUMNS} == expected
+        assert {name: getattr(row, column) for name, column in SCORE_COLUMNS.items()} == scores[0]
+        assert row.is_high_potential == (scores[0]["overall"] >= analyzer.high_potential_threshold)
+
+    # 再次运行：没有变化的行不再写回
+    assert rescore_demands(database=database, analyzer=analyzer)["updated"] == 0
@@ -0,0 +1,55 @@
+"""分阶段耗时统计测试 - 多线程共用一个实例时计数不丢失，reset 后从零开始"""
+
+import threading
+
+from backend.utils.timings import StageTimings
+
+THREADS = 8
+CALLS = 20000
+
+
+def hammer(timings: StageTimings, barrier: threading.Barrier):
+    barrier.wait()
+    for i in range(CALLS):
+        if timings.sample():
+            timings.record("sampled", 1000)
+        timings.record("every", i + 1)
+
+
+def test_concurrent_records_are_not_lost():
+    timings = StageTimings(sample_every=16)
+    barrier = threading.Barrier(THREADS)
+    threads = [threading.Thread(target=hammer, args=(timings, barrier)) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = timings.snapshot()
+    assert snapshot["every"]["count"] == THREADS * CALLS
+    assert snapshot["every"]["total_ms"] == round(THREADS * CALLS * (CALLS + 1) / 2 / 1e6, 3)
+    assert snapshot["every"]["max_us"] == CALLS / 1e3
+    assert snapshot["sampled"]["count"] == THREADS * (CALLS // 16)
+
+
+def test_reset_discards_records_from_every_thread():
+    timings = StageTimings()
+    thread = threading.Thread(target=timings.record, args=("stage", 500))
+    thread.start()
+    thread.join()
+    timings.record("stage", 500)
+    assert timings.snapshot()["stage"]["count"] == 2
+
+    timings.reset()
+    assert timings.snapshot() == {}
+    timings.record("stage", 500)
+    assert timings.snapshot()["stage"]["count"] == 1
+    # 抽样计数也从零开始
+    assert [timings.sample() for _ in range(16)][-1] is True
+
+
+def test_disabled_timings_record_nothing():
+    timings = StageTimings(enabled=False)
+    assert not any(timings.sample() for _ in range(32))
+    timings.record("stage", 500)
+    assert timings.snapshot() == {}
@@ -0,0 +1,206 @@
+"""管道运行检查点 - 长时间运行中断后，下一次运行跳过已完成的部分
+
+记录三类进度：
+  - pages: 本次尝试中每个列表页已完成到第几页（该页及之前各页的帖子都已处理），只用于报告进度
+  - processed: 需求全部保存成功（或无需保存）的帖子id。续跑时列表页从第1页重新抓取（排名在
+    中断期间会变化，按页码续跑会漏掉排名下移的帖子），这些帖子不再提取需求、抓取评论和分析
+  - saved_offset / batches: 分阶段模式下本次尝试已写入数据库的需求偏移（续跑时需求列表不同，
+    偏移重新计数，续跑靠 processed 跳过已保存的帖子）和累计写入的批数
+
+进度先记在内存里，flush() 最多每 flush_seconds 秒写一次文件（JSON，先写临时文件再
+os.replace，中途被杀也不会留下半个文件）。运行正常结束时 complete() 删除检查点；
+参数不同或超过 max_age_hours 的检查点不会被续跑。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RunCheckpoint:
+    """单个管道的运行检查点（同一时间只有一次运行）"""
+
+    DIR_NAME = "checkpoints"
+
+    def __init__(self, path: str, flush_seconds: float = 5.0, max_age_hours: float = 24):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.max_age_hours = max_age_hours
+        self._lock = threading.Lock()
+        self._reset({})
+        self.resumed = False
+        self.stats = {"flushes": 0, "flush_seconds": 0.0}
+
+    @classmethod
+    def persistent(cls, name: str, **kwargs) -> "RunCheckpoint":
+        """放在爬虫缓存目录下的检查点文件"""
+        from backend.crawlers.http_cache import default_cache_dir
+        return cls(os.path.join(default_cache_dir(), cls.DIR_NAME, f"{name}.json"), **kwargs)
+
+    def begin(self, params: Dict) -> bool:
+        """开始一次运行：有参数相同且未过期的检查点时续跑（返回 True），否则从头开始"""
+        state = self._read()
+        fresh = (
+            state is not None
+            and state.get("params") == params
+            and time.time() - state.get("updated_at", 0) <= self.max_age_hours * 3600
+        )
+        with self._lock:
+            self._reset(params)
+            if fresh:
+                self.run_id = state["run_id"]
+                self.started_at = state["started_at"]
+                self.processed = set(state.get("processed", []))
+                self.batches = state.get("batches", 0)
+            self.resumed = fresh
+            self._dirty = True
+
+        if fresh:
+            logger.info(f"Resuming run {self.run_id}: {len(self.processed)} posts already processed")
+        elif state is not None:
+            logger.info("Discarding checkpoint from a different or stale run")
+        self.flush(force=True)
+        return fresh
+
+    def is_processed(self, post) -> bool:
+        return self._item_id(post) in self.processed
+
+    def record_pages(self, last_pages: Dict[str, int], posts: Iterable) -> None:
+        """各列表页到 last_pages[feed] 页为止已全部列出，posts 为其中还需要处理的帖子"""
+        with self._lock:
+            for post in posts:
+                item_id = self._item_id(post)
+                if item_id is None or item_id in self.processed or item_id in self._pending:
+                    continue
+                key = (post.feed, post.page)
+                self._pending[item_id] = key
+                self._page_pending[key] = self._page_pending.get(key, 0) + 1
+            for feed, last_page in last_pages.items():
+                self._listed[feed] = max(self._listed.get(feed, 0), last_page)
+                self._advance(feed)
+
+    def mark_processed(self, posts: Iterable) -> None:
+        """帖子的需求已全部保存（或没有需要保存的需求）"""
+        with self._lock:
+            feeds = set()
+            for post in posts:
+                item_id = self._item_id(post)
+                if item_id is None or item_id in self.processed:
+                    continue
+                self.processed.add(item_id)
+                key = self._pending.pop(item_id, None)
+                if key is not None:
+                    self._page_pending[key] -= 1
+                    feeds.add(key[0])
+                self._dirty = True
+            for feed in feeds:
+                self._advance(feed)
+
+    def mark_batch(self, offset: int) -> None:
+        """分阶段模式：offset 之前的需求已写入数据库"""
+        with self._lock:
+            self.saved_offset = max(self.saved_offset, offset)
+            self.batches += 1
+            self._dirty = True
+
+    def flush(self, force: bool = False) -> None:
+        """把进度写入文件；距上次写入不到 flush_seconds 秒时跳过（force 除外）"""
+        with self._lock:
+            if not self._dirty or (not force and time.monotonic() - self._flushed_at < self.flush_seconds):
+                return
+            state = {
+                "run_id": self.run_id,
+                "params": self.params,
+                "started_at": self.started_at,
+                "updated_at": time.time(),
+                "pages": self.pages,
+                "processed": sorted(self.processed),
+                "saved_offset": self.saved_offset,
+                "batches": self.batches
+            }
+            self._dirty = False
+            self._flushed_at = time.monotonic()
+
+        start = time.perf_counter()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save checkpoint: {str(e)}")
+            with self._lock:
+                self._dirty = True
+        with self._lock:
+            self.stats["flushes"] += 1
+            self.stats["flush_seconds"] += time.perf_counter() - start
+
+    def complete(self) -> None:
+        """运行正常结束，删除检查点"""
+        with self._lock:
+            self._dirty = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove checkpoint: {str(e)}")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "resumed": self.resumed,
+                "pages": dict(self.pages),
+                "processed": len(self.processed),
+                "saved_offset": self.saved_offset,
+                "batches": self.batches,
+                **self.stats
+            }
+
+    def _reset(self, params: Dict) -> None:
+        self.run_id = uuid.uuid4().hex[:8]
+        self.params = params
+        self.started_at = datetime.utcnow().isoformat()
+        self.pages: Dict[str, int] = {}
+        self.processed: Set[str] = set()
+        self.saved_offset = 0
+        self.batches = 0
+        # 已列出但还没处理完的帖子：id -> (列表页, 页码)，以及每页剩余的帖子数
+        self._pending: Dict[str, Tuple[str, int]] = {}
+        self._page_pending: Dict[Tuple[str, int], int] = {}
+        self._listed: Dict[str, int] = {}
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+
+    def _advance(self, feed: str) -> None:
+        """已完成页推进到第一个还有未处理帖子（或还没列出）的页之前"""
+        page = self.pages.get(feed, 0)
+        while page < self._listed.get(feed, 0) and not self._page_pending.get((feed, page + 1)):
+            page += 1
+        if page != self.pages.get(feed, 0):
+            self.pages[feed] = page
+            self._dirty = True
+
+    def _read(self) -> Optional[Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load checkpoint, starting over: {str(e)}")
+            return None
+
+    @staticmethod
+    def _item_id(post) -> Optional[str]:
+        item_id = post.get("item_id")
+        return str(item_id) if item_id is not None else None
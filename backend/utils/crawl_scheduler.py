@@ -0,0 +1,365 @@
+"""多数据源爬取调度 - 按 Source.crawl_interval_hours 定期爬取所有活跃的数据源
+
+到期时间（last_crawled_at + crawl_interval_hours，从未爬取过的立即到期）放在小顶堆里，
+每次只检查堆顶。到期的数据源先用条件更新抢占：
+
+    UPDATE sources SET last_crawled_at = :now
+    WHERE id = :id AND is_active AND last_crawled_at IS NOT DISTINCT FROM :seen
+
+只有一个调度实例能更新成功（其余实例看到的 last_crawled_at 已经过期），因此多个实例
+同时运行也不会重复爬取同一个数据源。抢占成功后交给有上限的线程池执行；
+同一进程内每个数据源另有一把锁。手动触发的爬取（run_source / run_platform）同样先抢占
+数据源行，抢占失败时跳过。多个数据源共用同一个 DataPipeline 时按管道串行运行
+（爬虫、检查点和统计都属于管道实例）。
+
+用法: python -m backend.utils.crawl_scheduler [--workers 2] [--poll-interval 60]
+"""
+
+import argparse
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from backend.database.models import Source
+
+logger = logging.getLogger(__name__)
+
+# 平台 -> 爬取函数（参数为数据源信息字典，返回管道结果）
+Runner = Callable[[Dict], Dict]
+
+
+class CrawlScheduler:
+    """到期时间优先队列 + 全局工作线程上限 + 每个数据源互斥"""
+
+    def __init__(self, database=None, runners: Optional[Dict[str, Runner]] = None, pipeline=None,
+                 max_workers: int = 2, refresh_seconds: float = 300, retry_seconds: float = 60,
+                 clock: Callable[[], datetime] = datetime.utcnow):
+        if database is None:
+            from backend.database.database import db as database
+        self.database = database
+        self.max_workers = max(1, max_workers)
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+
+        self.runners: Dict[str, Runner] = {}
+        if pipeline is not None:
+            self.runners["hackernews"] = self._pipeline_runner(pipeline)
+        self.runners.update(runners or {})
+
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[datetime, str]] = []
+        self._sources: Dict[str, Dict] = {}
+        self._source_locks: Dict[str, threading.Lock] = {}
+        self._running: Dict[str, datetime] = {}
+        self._refreshed_at = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawl")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            "claimed": 0,
+            "lost_claims": 0,
+            "completed": 0,
+            "failed": 0,
+            "skipped_no_runner": 0
+        }
+
+    def refresh(self) -> None:
+        """从数据库重新加载活跃的数据源，重建到期队列（正在运行的不入队）"""
+        with self.database.get_session() as session:
+            rows = session.execute(
+                select(Source.id, Source.name, Source.platform, Source.config,
+                       Source.crawl_interval_hours, Source.last_crawled_at)
+                .where(Source.is_active == True)  # noqa: E712
+            ).all()
+
+        sources = {row.id: self._source_info(row) for row in rows}
+        with self._lock:
+            self._sources = sources
+            self._heap = [(self._due_at(source), source_id) for source_id, source in sources.items()
+                          if source_id not in self._running]
+            heapq.heapify(self._heap)
+            self._refreshed_at = time.monotonic()
+
+    def run_pending(self) -> int:
+        """启动所有已到期的爬取（受工作线程上限限制），返回本次启动的数量"""
+        if time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+            self.refresh()
+
+        started = 0
+        now = self.clock()
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > now or len(self._running) >= self.max_workers:
+                    break
+                _, source_id = heapq.heappop(self._heap)
+                source = self._sources.get(source_id)
+            if source is None:
+                continue
+            if self._start(source, now):
+                started += 1
+        return started
+
+    def run_source(self, source_id: str, force: bool = True) -> Dict:
+        """立即在当前线程爬取一个数据源（手动触发）；force 为 False 时只在到期后执行"""
+        with self.database.get_session() as session:
+            source = session.get(Source, source_id)
+            if source is None:
+                raise ValueError(f"Unknown source: {source_id}")
+            info = self._source_info(source)
+
+        if not force and self._due_at(info) > self.clock():
+            return {"status": "skipped", "reason": "not due"}
+        return self._run_now(info)
+
+    def run_platform(self, platform: str, **options) -> Dict:
+        """用平台对应的爬取函数爬取一次（供 /api/crawl/start 使用），options 覆盖数据源配置
+
+        平台有活跃的数据源时与定时爬取一样抢占该数据源行（锁也按数据源id），
+        被其他调度实例抢占时返回 skipped；还没有数据源记录时直接爬取。
+        """
+        runner = self.runners.get(platform)
+        if runner is None:
+            raise ValueError(f"Unsupported platform: {platform}")
+
+        with self.database.get_session() as session:
+            source = session.execute(
+                select(Source)
+                .where(Source.platform == platform, Source.is_active == True)  # noqa: E712
+                .order_by(Source.created_at, Source.id)
+                .limit(1)
+            ).scalar()
+            info = self._source_info(source) if source is not None else None
+
+        if info is None:
+            with self._source_lock(f"platform:{platform}"):
+                return runner({"platform": platform, "config": options})
+        info["config"] = dict(info["config"] or {}, **options)
+        return self._run_now(info)
+
+    def start(self, poll_seconds: float = 60) -> None:
+        """在后台线程中定期调度"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(poll_seconds,), name="crawl-scheduler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=wait)
+
+    def snapshot(self) -> Dict:
+        """调度状态（可直接JSON序列化）"""
+        with self._lock:
+            queue = sorted(self._heap)[:20]
+            return {
+                "max_workers": self.max_workers,
+                "sources": len(self._sources),
+                "running": {source_id: started.isoformat() for source_id, started in self._running.items()},
+                "next_due": [
+                    {"source_id": source_id, "platform": self._sources[source_id]["platform"],
+                     "due_at": due.isoformat()}
+                    for due, source_id in queue if source_id in self._sources
+                ],
+                "stats": dict(self.stats)
+            }
+
+    def next_due(self, limit: int = 20) -> List[Dict]:
+        """按数据库中的 last_crawled_at 计算各活跃数据源的下次到期时间（不依赖本实例的调度状态）"""
+        with self.database.get_session() as session:
+            rows = session.execute(
+                select(Source.id, Source.name, Source.platform, Source.config,
+                       Source.crawl_interval_hours, Source.last_crawled_at)
+                .where(Source.is_active == True)  # noqa: E712
+            ).all()
+
+        now = self.clock()
+        sources = sorted((self._source_info(row) for row in rows), key=lambda source: (self._due_at(source), source["id"]))
+        return [
+            {
+                "source_id": source["id"],
+                "name": source["name"],
+                "platform": source["platform"],
+                "last_crawled_at": source["last_crawled_at"].isoformat() if source["last_crawled_at"] else None,
+                "due_at": self._due_at(source).isoformat() if source["last_crawled_at"] else None,
+                "overdue": self._due_at(source) <= now
+            }
+            for source in sources[:limit]
+        ]
+
+    def _loop(self, poll_seconds: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Crawl scheduler tick failed: {str(e)}")
+            # 有到期项但线程池已满时也在这里等待，任务结束后下一轮再启动
+            self._stop.wait(min(poll_seconds, self._seconds_until_next_due()))
+
+    def _seconds_until_next_due(self) -> float:
+        with self._lock:
+            if not self._heap or len(self._running) >= self.max_workers:
+                return float("inf")
+            return max(0.0, (self._heap[0][0] - self.clock()).total_seconds())
+
+    def _start(self, source: Dict, now: datetime) -> bool:
+        lock = self._source_lock(source["id"])
+        if not lock.acquire(blocking=False):
+            # 正在手动爬取：retry_seconds 后再检查
+            self._push(source, now + timedelta(seconds=self.retry_seconds))
+            return False
+        if source["platform"] not in self.runners:
+            lock.release()
+            logger.warning(f"No crawler for platform {source['platform']}, skipping source {source['name']}")
+            self._count("skipped_no_runner")
+            self._reschedule(source, now)
+            return False
+        if not self._claim(source, now):
+            lock.release()
+            # 另一个实例刚爬取过：按数据库中新的 last_crawled_at 排下一次
+            self._reload_crawled_at(source)
+            self._reschedule(source, source["last_crawled_at"] or now)
+            return False
+
+        with self._lock:
+            self._running[source["id"]] = now
+        future = self._executor.submit(self._run, source)
+        future.add_done_callback(lambda _: self._finish(source, lock))
+        return True
+
+    def _claim(self, source: Dict, now: datetime) -> bool:
+        """条件更新 last_crawled_at 抢占数据源；其他实例已抢占（值已变化）时返回 False"""
+        seen = source["last_crawled_at"]
+        condition = Source.last_crawled_at.is_(None) if seen is None else Source.last_crawled_at == seen
+        with self.database.get_session() as session:
+            result = session.execute(
+                update(Source)
+                .where(Source.id == source["id"], Source.is_active == True, condition)  # noqa: E712
+                .values(last_crawled_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            claimed = result.rowcount == 1
+
+        if claimed:
+            source["last_crawled_at"] = now
+            self._count("claimed")
+        else:
+            self._count("lost_claims")
+            logger.info(f"Source {source['name']} was claimed by another scheduler")
+        return claimed
+
+    def _run(self, source: Dict) -> Dict:
+        logger.info(f"Crawling source {source['name']} ({source['platform']})")
+        try:
+            result = self.runners[source["platform"]](source)
+        except Exception as e:
+            logger.error(f"Crawl of source {source['name']} failed: {str(e)}")
+            result = {"status": "error", "error": str(e)}
+        self._count("completed" if result.get("status") == "success" else "failed")
+        return result
+
+    def _run_now(self, source: Dict) -> Dict:
+        """在当前线程抢占并爬取数据源（手动触发）"""
+        lock = self._source_lock(source["id"])
+        if not lock.acquire(blocking=False):
+            return {"status": "skipped", "reason": "already running"}
+        try:
+            if not self._claim(source, self.clock()):
+                return {"status": "skipped", "reason": "claimed by another scheduler"}
+            return self._run(source)
+        finally:
+            lock.release()
+
+    def _finish(self, source: Dict, lock: threading.Lock) -> None:
+        # 管道结束时会再次更新 last_crawled_at（_update_source_status），按数据库中的值排下一次
+        self._reload_crawled_at(source)
+        with self._lock:
+            self._running.pop(source["id"], None)
+        lock.release()
+        self._reschedule(source, source["last_crawled_at"])
+
+    def _reload_crawled_at(self, source: Dict) -> None:
+        """从数据库读取数据源当前的 last_crawled_at"""
+        try:
+            with self.database.get_session() as session:
+                crawled_at = session.execute(
+                    select(Source.last_crawled_at).where(Source.id == source["id"])
+                ).scalar()
+            if crawled_at is not None:
+                source["last_crawled_at"] = crawled_at
+        except Exception as e:
+            logger.warning(f"Error reloading source {source['name']}: {str(e)}")
+
+    def _reschedule(self, source: Dict, crawled_at: datetime) -> None:
+        self._push(source, crawled_at + timedelta(hours=source["crawl_interval_hours"]))
+
+    def _push(self, source: Dict, due: datetime) -> None:
+        with self._lock:
+            if source["id"] in self._sources:
+                heapq.heappush(self._heap, (due, source["id"]))
+
+    def _source_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._source_locks.setdefault(key, threading.Lock())
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def _pipeline_runner(pipeline) -> Runner:
+        """DataPipeline 的爬取函数：同一个管道同一时间只运行一次（共用爬虫、检查点和统计）"""
+        lock = threading.Lock()
+
+        def run(source: Dict) -> Dict:
+            with lock:
+                return pipeline.run_hackernews_pipeline(max_posts=(source.get("config") or {}).get("max_posts", 30))
+        return run
+
+    @staticmethod
+    def _source_info(source) -> Dict:
+        return {
+            "id": source.id,
+            "name": source.name,
+            "platform": source.platform,
+            "config": source.config,
+            "crawl_interval_hours": source.crawl_interval_hours or 24,
+            "last_crawled_at": source.last_crawled_at
+        }
+
+    @staticmethod
+    def _due_at(source: Dict) -> datetime:
+        last = source["last_crawled_at"]
+        if last is None:
+            return datetime.min
+        return last + timedelta(hours=source["crawl_interval_hours"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="同时运行的爬取任务上限")
+    parser.add_argument("--poll-interval", type=float, default=60, help="检查到期数据源的间隔（秒）")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from backend.utils.data_pipeline import DataPipeline
+
+    scheduler = CrawlScheduler(pipeline=DataPipeline(), max_workers=args.workers)
+    scheduler.start(poll_seconds=args.poll_interval)
+    print(f"🗓️  Crawl scheduler running with {args.workers} workers, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop(wait=False)
@@ -1,49 +1,143 @@
 import logging
+import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import time
 
+from backend.database.bulk import bulk_upsert
 from backend.database.database import db
-from backend.database.models import Demand, Source
+from backend.database.models import DEMAND_NATURAL_KEY, Demand, Source, generate_uuid
 from backend.crawlers.hackernews_crawler import HackerNewsCrawler
+from backend.crawlers.seen_index import SeenIndex
+from backend.analysis.analysis_cache import AnalysisCache
 from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.near_duplicates import NearDuplicateIndex
+from backend.analysis.parallel import ParallelAnalyzer
+from backend.utils.checkpoint import RunCheckpoint
+from backend.utils.staged_pipeline import Stage, StagedPipeline
 
 logger = logging.getLogger(__name__)
 
+# 重新爬取到已保存的需求时原地更新的列（主键、首次发现时间和人工审核状态保持不变）
+UPSERT_COLUMNS = [
+    column.name for column in Demand.__table__.columns
+    if column.name not in ("id", "created_at", "discovered_at", "status", *DEMAND_NATURAL_KEY)
+]
+
 class DataPipeline:
     """数据管道 - 连接爬虫、分析和数据库"""
     
-    def __init__(self):
-        self.crawler = HackerNewsCrawler()
-        self.analyzer = DemandAnalyzer()
+    # 流式模式各阶段的默认工作线程数（crawl 为同时抓取的列表页数）
+    DEFAULT_STAGE_WORKERS = {"crawl": 2, "extract": 1, "analyze": 1, "persist": 1}
+    
+    def __init__(self, incremental: bool = True, analysis_workers: Optional[int] = None,
+                 analysis_chunk_size: int = ParallelAnalyzer.DEFAULT_CHUNK_SIZE,
+                 analysis_cache: Optional[AnalysisCache] = None,
+                 duplicate_index: Optional[NearDuplicateIndex] = None,
+                 streaming: Optional[bool] = None, stage_workers: Optional[Dict[str, int]] = None,
+                 queue_size: int = 4, stream_batch_size: int = HackerNewsCrawler.PAGE_SIZE,
+                 save_batch_size: Optional[int] = None, resume: Optional[bool] = None,
+                 checkpoint: Optional[RunCheckpoint] = None):
+        # 增量模式下跳过已处理过的帖子
+        self.crawler = HackerNewsCrawler(seen_index=SeenIndex() if incremental else None)
+        
+        # 相邻几次爬取的标题大多相同，分析结果按文本缓存（默认持久化到缓存目录）
+        self.analysis_cache = analysis_cache if analysis_cache is not None else AnalysisCache.persistent()
+        
+        # 关键词按全部已分析需求的TF-IDF加权（词表持久化）；没有安装scikit-learn/SciPy时按词频
+        try:
+            from backend.analysis.tfidf_keywords import TfidfKeywordExtractor
+            self.keyword_extractor = TfidfKeywordExtractor.persistent()
+        except ImportError as e:
+            logger.warning(f"TF-IDF keywords not available, using term frequency: {str(e)}")
+            self.keyword_extractor = None
+        
+        self.analyzer = DemandAnalyzer(cache=self.analysis_cache, keyword_extractor=self.keyword_extractor)
+        
+        # 分析进程数（默认 SCOUT_ANALYSIS_WORKERS 或 1，0 表示按CPU核数）；大于1时用进程池并行分析
+        if analysis_workers is None:
+            analysis_workers = int(os.getenv("SCOUT_ANALYSIS_WORKERS", "1"))
+        self.parallel_analyzer = None
+        if analysis_workers != 1:
+            self.parallel_analyzer = ParallelAnalyzer(workers=analysis_workers, chunk_size=analysis_chunk_size,
+                                                      cache=self.analysis_cache,
+                                                      keyword_extractor=self.keyword_extractor,
+                                                      scoring_config={
+                                                          "weights": self.analyzer.score_weights,
+                                                          "high_potential_threshold": self.analyzer.high_potential_threshold
+                                                      })
+        
+        # 已保存需求的近似重复索引（MinHash/LSH，持久化到缓存目录）
+        self.duplicate_index = duplicate_index if duplicate_index is not None else NearDuplicateIndex.persistent()
+        
+        # 流式模式（默认 SCOUT_PIPELINE_STREAMING）：爬取、提取、分析、保存各自并发，用有界队列串联，
+        # 每个队列最多 queue_size 批、每批 stream_batch_size 个帖子
+        if streaming is None:
+            streaming = os.getenv("SCOUT_PIPELINE_STREAMING", "0").lower() in ("1", "true", "yes")
+        self.streaming = streaming
+        self.stage_workers = dict(self.DEFAULT_STAGE_WORKERS, **(stage_workers or {}))
+        self.queue_size = queue_size
+        self.stream_batch_size = max(1, stream_batch_size)
+        
+        # 需求按批写入数据库（默认 SCOUT_SAVE_BATCH_SIZE 或 500 条一批）
+        if save_batch_size is None:
+            save_batch_size = int(os.getenv("SCOUT_SAVE_BATCH_SIZE", "500"))
+        self.save_batch_size = max(1, save_batch_size)
+        
+        # 运行检查点（默认 SCOUT_PIPELINE_RESUME 开启）：中断的运行下次从中断处继续，不重新抓取和分析
+        if resume is None:
+            resume = os.getenv("SCOUT_PIPELINE_RESUME", "1").lower() in ("1", "true", "yes")
+        if checkpoint is None and resume:
+            checkpoint = RunCheckpoint.persistent("hackernews")
+        self.checkpoint = checkpoint
+        
         self.stats = {
             "total_processed": 0,
             "successful_saves": 0,
             "failed_saves": 0,
+            "analysis_cache_hits": 0,
+            "analysis_cache_misses": 0,
+            "duplicates_merged": 0,
+            "duplicates_existing": 0,
             "last_run": None,
             "run_duration": 0
         }
     
     def run_hackernews_pipeline(self, max_posts: int = 30) -> Dict:
         """运行完整的HackerNews数据管道"""
+        if self.streaming:
+            return self.run_hackernews_pipeline_streaming(max_posts=max_posts)
+        
         logger.info(f"Starting HackerNews data pipeline (max_posts: {max_posts})")
         
         start_time = time.time()
+        checkpoint = self.checkpoint
         
         try:
-            # 1. 爬取数据
-            crawl_result = self.crawler.crawl(max_posts=max_posts)
+            # 表结构落后时（还没运行 alembic upgrade head）不爬取，需求无法按自然键保存
+            db.require_schema()
+            
+            # 1. 爬取数据（续跑时跳过中断前已处理完的帖子）
+            resumed = checkpoint is not None and checkpoint.begin({"max_posts": max_posts})
+            crawl_result = self.crawler.crawl(
+                max_posts=max_posts, mark_seen=False,
+                exclude_ids=checkpoint.processed if resumed else None
+            )
             posts = crawl_result.get("posts", [])
             raw_demands = crawl_result.get("demands", [])
+            if checkpoint is not None:
+                checkpoint.record_pages(crawl_result["stats"].get("feed_pages", {}), posts)
             
             logger.info(f"Crawled {len(posts)} posts, found {len(raw_demands)} potential demands")
             
-            # 2. 分析需求
+            # 2. 分析需求（整批向量化评分，配置了多个分析进程时分块并行）
+            analyzer = self.parallel_analyzer or self.analyzer
+            cache_hits = self.analysis_cache.stats["hits"]
+            cache_misses = self.analysis_cache.stats["misses"]
             analyzed_demands = []
-            for raw_demand in raw_demands:
+            for raw_demand, analysis in zip(raw_demands, analyzer.analyze_batch(raw_demands)):
                 try:
-                    analysis = self.analyzer.analyze_demand(raw_demand)
-                    
                     if "error" not in analysis:
                         analyzed_demand = {
                             "raw": raw_demand,
@@ -56,26 +150,63 @@ class DataPipeline:
                     logger.warning(f"Error analyzing demand: {str(e)}")
                     continue
             
-            logger.info(f"Successfully analyzed {len(analyzed_demands)} demands")
+            if self.keyword_extractor is not None:
+                self.keyword_extractor.save()
             
-            # 3. 保存到数据库
-            saved_count = 0
-            for analyzed_demand in analyzed_demands:
-                try:
-                    if self._save_to_database(analyzed_demand):
-                        saved_count += 1
-                except Exception as e:
-                    logger.warning(f"Error saving demand to database: {str(e)}")
-                    continue
+            cache_hits = self.analysis_cache.stats["hits"] - cache_hits
+            cache_misses = self.analysis_cache.stats["misses"] - cache_misses
+            logger.info(f"Successfully analyzed {len(analyzed_demands)} demands "
+                        f"(analysis cache: {cache_hits} hits, {cache_misses} misses)")
+            
+            # 3. 近似重复：本次运行内的合并为一条，与已保存需求重复的不再保存
+            unique_demands, merged_count, existing_count = self._drop_near_duplicates(analyzed_demands)
+            logger.info(f"Near-duplicates: {merged_count} merged, {existing_count} already stored")
+            
+            # 4. 分批保存到数据库；帖子的需求全部保存成功后记入检查点
+            saved_demands = []
+            failed_posts = set()
+            first_save_seconds = None
+            finish_offsets = self._finish_offsets(posts, unique_demands)
+            self._checkpoint_saved(finish_offsets, 0, failed_posts)
+            for offset in range(0, len(unique_demands), self.save_batch_size):
+                end = min(offset + self.save_batch_size, len(unique_demands))
+                batch_saved = self._save_batch(unique_demands[offset:end])
+                saved_demands.extend(batch_saved)
+                failed_posts.update(self._unsaved_posts(unique_demands[offset:end], batch_saved))
+                if saved_demands and first_save_seconds is None:
+                    first_save_seconds = time.time() - start_time
+                # 保存成功的需求逐批计入近似重复索引（运行中断时与已保存的需求一致），之后的运行据此跳过重复；
+                # 原地更新的需求替换索引中的旧文本
+                self.duplicate_index.add_many(
+                    (self._natural_key(analyzed_demand), analyzed_demand["raw"].get("extracted_text", ""))
+                    for analyzed_demand in batch_saved
+                )
+                self._checkpoint_saved(finish_offsets, end, failed_posts)
+            saved_count = len(saved_demands)
+            refreshed_count = sum(1 for analyzed_demand in saved_demands if analyzed_demand["refreshed"])
+            
+            # 保存完成后才记入已处理索引，失败的运行和保存失败的帖子下次会重新处理
+            self.crawler.mark_seen([post for post in posts if post.get("item_id") not in failed_posts]
+                                   + crawl_result.get("resumed_posts", []))
+            # 有列表页抓取失败或需求保存失败时保留检查点，下次运行补上缺失的部分
+            if checkpoint is not None:
+                if crawl_result["stats"].get("feed_errors") or saved_count != len(unique_demands):
+                    checkpoint.flush(force=True)
+                else:
+                    checkpoint.complete()
             
-            # 4. 更新统计
+            # 5. 更新统计
             self.stats["total_processed"] += len(analyzed_demands)
             self.stats["successful_saves"] += saved_count
-            self.stats["failed_saves"] += len(analyzed_demands) - saved_count
+            self.stats["failed_saves"] += len(unique_demands) - saved_count
+            self.stats["duplicates_merged"] += merged_count
+            self.stats["duplicates_existing"] += existing_count
+            self.stats["analysis_cache_hits"] += cache_hits
+            self.stats["analysis_cache_misses"] += cache_misses
             self.stats["last_run"] = datetime.utcnow().isoformat()
             self.stats["run_duration"] = time.time() - start_time
             
-            # 5. 更新数据源状态
+            # 6. 更新数据源状态
             self._update_source_status("hackernews", len(analyzed_demands))
             
             result = {
@@ -85,9 +216,16 @@ class DataPipeline:
                     "demands_found": len(raw_demands),
                     "demands_analyzed": len(analyzed_demands),
                     "demands_saved": saved_count,
+                    "demands_refreshed": refreshed_count,
+                    "duplicates_merged": merged_count,
+                    "duplicates_existing": existing_count,
+                    "analysis_cache_hits": cache_hits,
+                    "analysis_cache_misses": cache_misses,
+                    "first_save_seconds": first_save_seconds,
                     "pipeline_duration_seconds": self.stats["run_duration"]
                 },
                 "crawl_stats": crawl_result.get("stats", {}),
+                "checkpoint": checkpoint.snapshot() if checkpoint is not None else None,
                 "pipeline_stats": self.stats.copy()
             }
             
@@ -96,92 +234,441 @@ class DataPipeline:
             
         except Exception as e:
             logger.error(f"Pipeline failed: {str(e)}")
+            if checkpoint is not None:
+                checkpoint.flush(force=True)
             return {
                 "status": "error",
                 "error": str(e),
                 "pipeline_duration_seconds": time.time() - start_time
             }
     
-    def _save_to_database(self, analyzed_demand: Dict) -> bool:
-        """保存分析后的需求到数据库"""
+    def run_hackernews_pipeline_streaming(self, max_posts: int = 30) -> Dict:
+        """流式运行HackerNews数据管道：爬取 -> 提取 -> 分析 -> 保存 四个阶段并发
+
+        帖子按 stream_batch_size 分批流过各阶段，第一批分析完就开始保存；下游处理不过来时
+        队列写满，爬虫随之暂停翻页。帖子在所属批次保存完成后才记入已处理索引。
+        """
+        logger.info(f"Starting streaming HackerNews data pipeline (max_posts: {max_posts}, "
+                    f"workers: {self.stage_workers}, queue size: {self.queue_size})")
+        
+        start_time = time.time()
+        crawler = self.crawler
+        analyzer = self.parallel_analyzer or self.analyzer
+        checkpoint = self.checkpoint
+        run_index = self.duplicate_index.scratch()
+        cache_hits = self.analysis_cache.stats["hits"]
+        cache_misses = self.analysis_cache.stats["misses"]
+        
+        lock = threading.Lock()
+        counts = {
+            "posts_crawled": 0,
+            "posts_skipped": 0,
+            "posts_resumed": 0,
+            "comment_threads": 0,
+            "demands_found": 0,
+            "demands_analyzed": 0,
+            "demands_saved": 0,
+            "demands_refreshed": 0,
+            "failed_saves": 0,
+            "duplicates_merged": 0,
+            "duplicates_existing": 0
+        }
+        first_save_seconds = None
+        comment_budget = crawler.comment_crawler.max_fetches
+        crawler.comment_crawler.reset_stats()
+        
+        def add(**values):
+            with lock:
+                for key, value in values.items():
+                    counts[key] += value
+        
+        def fresh(posts: List) -> List:
+            add(posts_crawled=len(posts))
+            # 续跑：中断前已处理完的帖子直接记入已处理索引
+            if resumed:
+                done = [post for post in posts if checkpoint.is_processed(post)]
+                if done:
+                    crawler.mark_seen(done, save=False)
+                    posts = [post for post in posts if not checkpoint.is_processed(post)]
+                    add(posts_resumed=len(done))
+            # 增量模式：跳过已处理且分数/评论数没有明显变化的帖子
+            if crawler.seen_index is None:
+                return posts
+            groups = crawler.seen_index.partition(posts)
+            add(posts_skipped=len(groups["unchanged"]))
+            return groups["new"] + groups["changed"]
+        
+        def listed(feed: str, page: Optional[int], posts: List):
+            if checkpoint is not None and page is not None:
+                checkpoint.record_pages({feed: page}, posts)
+        
+        def crawl(feed_limit: Tuple[str, int]):
+            # 逐页产出帖子批次（批次不跨页，检查点按页记录进度）；下游队列满时在 yield 处阻塞，不再翻页
+            # 续跑时也从第1页开始（排名可能已经变化），已处理的帖子由 fresh() 跳过
+            feed, limit = feed_limit
+            batch, page_posts, page = [], [], None
+            error = None
+            try:
+                for post in crawler.iter_feed(feed, limit=limit):
+                    if batch and (post.page != page or len(batch) >= self.stream_batch_size):
+                        posts = fresh(batch)
+                        page_posts.extend(posts)
+                        if posts:
+                            yield posts
+                        batch = []
+                    if post.page != page:
+                        listed(feed, page, page_posts)
+                        page_posts, page = [], post.page
+                    batch.append(post)
+            except Exception as e:
+                # 翻页失败时之前的页面已完整产出：照常处理已抓取的部分，再把错误交给管道记录
+                error = e
+            posts = fresh(batch) if batch else []
+            page_posts.extend(posts)
+            if posts:
+                yield posts
+            listed(feed, page, page_posts)
+            if error is not None:
+                raise error
+        
+        def extract(posts: List):
+            nonlocal comment_budget
+            demands = crawler.extract_demands_from_posts(posts)
+            if crawler.crawl_comments:
+                # 评论抓取预算由整次运行共享
+                with lock:
+                    selected = crawler.comment_crawler.select_posts(posts)[:max(0, comment_budget)]
+                    comment_budget -= len(selected)
+                for post, comments in crawler.comment_crawler.iter_threads(selected):
+                    demands.extend(crawler.extract_demands_from_comments(post, comments))
+                add(comment_threads=len(selected))
+            add(demands_found=len(demands))
+            yield {"posts": posts, "demands": demands}
+        
+        def analyze(batch: Dict):
+            analyzed = []
+            analyses = analyzer.analyze_batch(batch["demands"]) if batch["demands"] else []
+            for raw_demand, analysis in zip(batch["demands"], analyses):
+                if "error" not in analysis:
+                    analyzed.append({
+                        "raw": raw_demand,
+                        "analysis": analysis,
+                        "recommendations": self.analyzer.generate_recommendations(analysis)
+                    })
+            unique_demands, merged_count, existing_count = self._drop_near_duplicates(analyzed, run_index)
+            add(demands_analyzed=len(analyzed), duplicates_merged=merged_count, duplicates_existing=existing_count)
+            batch["analyzed"] = unique_demands
+            yield batch
+        
+        def persist(batch: Dict):
+            nonlocal first_save_seconds
+            saved_demands = []
+            for offset in range(0, len(batch["analyzed"]), self.save_batch_size):
+                saved_demands.extend(self._save_batch(batch["analyzed"][offset:offset + self.save_batch_size]))
+            self.duplicate_index.add_many(
+                (self._natural_key(analyzed_demand), analyzed_demand["raw"].get("extracted_text", ""))
+                for analyzed_demand in saved_demands
+            )
+            # 已处理索引在运行结束时统一写盘，检查点按间隔写盘；有需求保存失败的帖子下次重新处理
+            failed_posts = self._unsaved_posts(batch["analyzed"], saved_demands)
+            done = [post for post in batch["posts"] if post.get("item_id") not in failed_posts]
+            crawler.mark_seen(done, save=False)
+            if checkpoint is not None:
+                checkpoint.mark_processed(done)
+                checkpoint.flush()
+            with lock:
+                counts["demands_saved"] += len(saved_demands)
+                counts["demands_refreshed"] += sum(1 for analyzed_demand in saved_demands if analyzed_demand["refreshed"])
+                counts["failed_saves"] += len(batch["analyzed"]) - len(saved_demands)
+                if saved_demands and first_save_seconds is None:
+                    first_save_seconds = time.time() - start_time
+        
         try:
-            raw = analyzed_demand["raw"]
-            analysis = analyzed_demand["analysis"]
-            recommendations = analyzed_demand["recommendations"]
-            
-            # 构建需求数据
-            demand_data = {
-                "title": raw.get("source_post", {}).get("title", "Untitled Demand")[:500],
-                "description": f"Extracted from {analysis['source_info']['platform']}: {raw.get('extracted_text', '')}"[:2000],
-                "problem": raw.get("extracted_text", "No problem description"),
-                
-                # 用户画像（基于分析）
-                "user_role": "developer/tech_user",  # 可以从文本中提取
-                "company_size": "individual/small_team",
-                "tech_level": "intermediate",
-                "budget_range": self._get_budget_range(analysis.get("payment_potential")),
-                
-                # 使用场景
-                "scenario": f"Found on {analysis['source_info']['platform']} discussion",
-                
-                # 痛点分析
-                "pain_points": ["Manual process", "Time consuming", "Lack of existing solutions"],
-                
-                # 现有解决方案
-                "existing_solutions": ["Manual work", "Complex existing tools"],
-                
-                # 付费信号
-                "pricing_signals": [f"Payment potential: {analysis.get('payment_potential', 'medium')}"],
-                
-                # 市场数据（估算）
-                "search_volume": self._estimate_search_volume(analysis.get("tool_type")),
-                "competitor_users": self._estimate_competitor_users(analysis.get("tool_type")),
-                "growth_rate": self._estimate_growth_rate(analysis.get("tool_type")),
-                
-                # 技术评估
-                "technical_complexity": analysis.get("technical_complexity", "medium"),
-                "dev_time_weeks": recommendations.get("time_estimate_weeks", 4),
-                "main_tech_stack": recommendations.get("suggested_tech_stack", []),
-                
-                # 评分
-                "demand_strength_score": analysis["scores"].get("demand_strength", 5.0),
-                "market_size_score": analysis["scores"].get("market_size", 5.0),
-                "willingness_to_pay_score": analysis["scores"].get("payment_willingness", 5.0),
-                "technical_feasibility_score": analysis["scores"].get("technical_feasibility", 5.0),
-                "passive_income_fit_score": analysis["scores"].get("passive_income_fit", 5.0),
-                "overall_score": analysis["scores"].get("overall", 5.0),
-                
-                # 推荐信息
-                "recommended_pricing": recommendations.get("recommended_pricing", "$15-25/month"),
-                "mvp_features": recommendations.get("mvp_features", []),
-                
-                # 来源信息
-                "source_platform": analysis["source_info"]["platform"],
-                "source_url": analysis["source_info"]["post_url"],
-                "discovered_at": datetime.utcnow(),
-                
-                # 标签和分类
-                "tags": analysis.get("keywords", [])[:5],
-                "tool_type": analysis.get("tool_type", "unknown"),
-                
-                # 状态
-                "status": "new",
-                "is_high_potential": analysis["scores"].get("overall", 0) >= 7.0
+            db.require_schema()
+            resumed = checkpoint is not None and checkpoint.begin({"max_posts": max_posts})
+            workers = self.stage_workers
+            pipeline = StagedPipeline([
+                Stage("crawl", crawl, workers["crawl"]),
+                Stage("extract", extract, workers["extract"]),
+                Stage("analyze", analyze, workers["analyze"]),
+                Stage("persist", persist, workers["persist"])
+            ], queue_size=self.queue_size)
+            stage_stats = pipeline.run([("show", max_posts // 2), ("ask", max_posts // 2)])
+            
+            if self.keyword_extractor is not None:
+                self.keyword_extractor.save()
+            if crawler.seen_index is not None:
+                crawler.seen_index.save()
+            if crawler.cache is not None:
+                crawler.cache.flush()
+            # 有阶段出错（如某一页抓取失败）时保留检查点，下次运行补上缺失的部分
+            if checkpoint is not None:
+                if any(stats["errors"] for stats in stage_stats.values()):
+                    checkpoint.flush(force=True)
+                else:
+                    checkpoint.complete()
+            
+            cache_hits = self.analysis_cache.stats["hits"] - cache_hits
+            cache_misses = self.analysis_cache.stats["misses"] - cache_misses
+            duration = time.time() - start_time
+            
+            self.stats["total_processed"] += counts["demands_analyzed"]
+            self.stats["successful_saves"] += counts["demands_saved"]
+            self.stats["failed_saves"] += counts["failed_saves"]
+            self.stats["duplicates_merged"] += counts["duplicates_merged"]
+            self.stats["duplicates_existing"] += counts["duplicates_existing"]
+            self.stats["analysis_cache_hits"] += cache_hits
+            self.stats["analysis_cache_misses"] += cache_misses
+            self.stats["last_run"] = datetime.utcnow().isoformat()
+            self.stats["run_duration"] = duration
+            
+            self._update_source_status("hackernews", counts["demands_analyzed"])
+            
+            result = {
+                "status": "success",
+                "stats": {
+                    "posts_crawled": counts["posts_crawled"] - counts["posts_skipped"] - counts["posts_resumed"],
+                    "demands_found": counts["demands_found"],
+                    "demands_analyzed": counts["demands_analyzed"],
+                    "demands_saved": counts["demands_saved"],
+                    "demands_refreshed": counts["demands_refreshed"],
+                    "duplicates_merged": counts["duplicates_merged"],
+                    "duplicates_existing": counts["duplicates_existing"],
+                    "analysis_cache_hits": cache_hits,
+                    "analysis_cache_misses": cache_misses,
+                    "first_save_seconds": first_save_seconds,
+                    "pipeline_duration_seconds": duration
+                },
+                "crawl_stats": {
+                    "listed_posts": counts["posts_crawled"],
+                    "skipped_posts": counts["posts_skipped"],
+                    "resumed_posts": counts["posts_resumed"],
+                    "comment_threads": counts["comment_threads"],
+                    # 多个提取线程并发抓取评论，统计累加在同一个 CommentCrawler 上
+                    "comment_stats": dict(crawler.comment_crawler.stats),
+                    "platform": "hackernews"
+                },
+                "stage_stats": stage_stats,
+                "checkpoint": checkpoint.snapshot() if checkpoint is not None else None,
+                "pipeline_stats": self.stats.copy()
+            }
+            
+            logger.info(f"Streaming pipeline completed: {result['stats']}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Streaming pipeline failed: {str(e)}")
+            if checkpoint is not None:
+                checkpoint.flush(force=True)
+            return {
+                "status": "error",
+                "error": str(e),
+                "pipeline_duration_seconds": time.time() - start_time
             }
+        finally:
+            run_index.close()
+    
+    @staticmethod
+    def _finish_offsets(posts: List, unique_demands: List[Dict]) -> Dict[int, List]:
+        """每个帖子在保存完前几条需求后完成：{偏移: [帖子]}（没有需求要保存的帖子偏移为0）"""
+        last = {}
+        for index, analyzed_demand in enumerate(unique_demands):
+            last[analyzed_demand["raw"].get("source_post", {}).get("item_id")] = index + 1
+        finish_offsets = {}
+        for post in posts:
+            finish_offsets.setdefault(last.get(post.get("item_id"), 0), []).append(post)
+        return finish_offsets
+    
+    @staticmethod
+    def _unsaved_posts(analyzed_demands: List[Dict], saved_demands: List[Dict]) -> set:
+        """有需求保存失败的帖子id"""
+        saved = {id(analyzed_demand) for analyzed_demand in saved_demands}
+        return {analyzed_demand["raw"].get("source_post", {}).get("item_id")
+                for analyzed_demand in analyzed_demands if id(analyzed_demand) not in saved}
+    
+    def _checkpoint_saved(self, finish_offsets: Dict[int, List], end: int, failed_posts: set):
+        """前 end 条需求已处理：需求全部保存成功的帖子记入检查点（failed_posts 中的不记入），按间隔写盘"""
+        if self.checkpoint is None:
+            return
+        done = [post for offset in sorted(finish_offsets) if offset <= end for post in finish_offsets.pop(offset)
+                if post.get("item_id") not in failed_posts]
+        self.checkpoint.mark_processed(done)
+        if end:
+            self.checkpoint.mark_batch(end)
+        self.checkpoint.flush()
+    
+    def _save_batch(self, analyzed_demands: List[Dict]) -> List[Dict]:
+        """批量保存一批需求（一个事务），返回保存成功的需求
+
+        整批写入失败时逐条重试，个别坏行不影响同批的其他需求。
+        """
+        if not analyzed_demands:
+            return []
+        
+        try:
+            rows = [self._demand_row(analyzed_demand) for analyzed_demand in analyzed_demands]
+            with db.get_session() as session:
+                ids = bulk_upsert(session, Demand, rows, DEMAND_NATURAL_KEY, UPSERT_COLUMNS)
+            for analyzed_demand, row, demand_id in zip(analyzed_demands, rows, ids):
+                analyzed_demand["demand_id"] = demand_id
+                analyzed_demand["refreshed"] = demand_id != row["id"]
+            
+            logger.debug(f"Saved {len(rows)} demands to database")
+            return list(analyzed_demands)
+            
+        except Exception as e:
+            logger.warning(f"Bulk save of {len(analyzed_demands)} demands failed, saving one by one: {str(e)}")
+            return [analyzed_demand for analyzed_demand in analyzed_demands
+                    if self._save_to_database(analyzed_demand)]
+    
+    def _save_to_database(self, analyzed_demand: Dict) -> bool:
+        """保存分析后的需求到数据库（同一来源条目已保存过时原地更新）"""
+        try:
+            demand_data = self._demand_row(analyzed_demand)
             
             # 保存到数据库
             with db.get_session() as session:
-                demand = Demand(**demand_data)
-                session.add(demand)
-                session.commit()
-                
-                logger.debug(f"Saved demand to database: {demand.id} - {demand.title[:50]}...")
-                return True
+                (demand_id,) = bulk_upsert(session, Demand, [demand_data], DEMAND_NATURAL_KEY, UPSERT_COLUMNS)
+            analyzed_demand["demand_id"] = demand_id
+            analyzed_demand["refreshed"] = demand_id != demand_data["id"]
+            
+            logger.debug(f"Saved demand to database: {demand_id} - {demand_data['title'][:50]}...")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving to database: {str(e)}")
             return False
     
+    def _demand_row(self, analyzed_demand: Dict) -> Dict:
+        """分析后的需求 -> Demand 的列值（主键和时间戳预先生成，批量写入时不依赖模型默认值）"""
+        raw = analyzed_demand["raw"]
+        analysis = analyzed_demand["analysis"]
+        recommendations = analyzed_demand["recommendations"]
+        post = raw.get("source_post", {})
+        now = datetime.utcnow()
+        
+        # 构建需求数据
+        demand_data = {
+            "id": generate_uuid(),
+            "title": raw.get("source_post", {}).get("title", "Untitled Demand")[:500],
+            "description": f"Extracted from {analysis['source_info']['platform']}: {raw.get('extracted_text', '')}"[:2000],
+            "problem": raw.get("extracted_text", "No problem description"),
+            
+            # 用户画像（基于分析）
+            "user_role": "developer/tech_user",  # 可以从文本中提取
+            "company_size": "individual/small_team",
+            "tech_level": "intermediate",
+            "budget_range": self._get_budget_range(analysis.get("payment_potential")),
+            
+            # 使用场景
+            "scenario": f"Found on {analysis['source_info']['platform']} discussion",
+            
+            # 痛点分析
+            "pain_points": ["Manual process", "Time consuming", "Lack of existing solutions"],
+            
+            # 现有解决方案
+            "existing_solutions": ["Manual work", "Complex existing tools"],
+            
+            # 付费信号
+            "pricing_signals": [f"Payment potential: {analysis.get('payment_potential', 'medium')}"],
+            
+            # 市场数据（估算）
+            "search_volume": self._estimate_search_volume(analysis.get("tool_type")),
+            "competitor_users": self._estimate_competitor_users(analysis.get("tool_type")),
+            "growth_rate": self._estimate_growth_rate(analysis.get("tool_type")),
+            
+            # 技术评估
+            "technical_complexity": analysis.get("technical_complexity", "medium"),
+            "dev_time_weeks": recommendations.get("time_estimate_weeks", 4),
+            "main_tech_stack": recommendations.get("suggested_tech_stack", []),
+            
+            # 评分
+            "demand_strength_score": analysis["scores"].get("demand_strength", 5.0),
+            "market_size_score": analysis["scores"].get("market_size", 5.0),
+            "willingness_to_pay_score": analysis["scores"].get("payment_willingness", 5.0),
+            "technical_feasibility_score": analysis["scores"].get("technical_feasibility", 5.0),
+            "passive_income_fit_score": analysis["scores"].get("passive_income_fit", 5.0),
+            "overall_score": analysis["scores"].get("overall", 5.0),
+            
+            # 推荐信息
+            "recommended_pricing": recommendations.get("recommended_pricing", "$15-25/month"),
+            "mvp_features": recommendations.get("mvp_features", []),
+            
+            # 来源信息
+            "source_platform": analysis["source_info"]["platform"],
+            "source_url": analysis["source_info"]["post_url"],
+            "source_item_id": self._source_item_id(raw),
+            "source_score": post.get("score", 0),
+            "source_comments": post.get("comments", 0),
+            "discovered_at": now,
+            
+            # 标签和分类
+            "tags": analysis.get("keywords", [])[:5],
+            "tool_type": analysis.get("tool_type", "unknown"),
+            "demand_type": raw.get("demand_type"),
+            "demand_types": raw.get("demand_types", []),
+            
+            # 状态
+            "status": "new",
+            "is_high_potential": analysis["scores"].get("overall", 0) >= self.analyzer.high_potential_threshold,
+            
+            # 时间戳
+            "created_at": now,
+            "updated_at": now
+        }
+        
+        return demand_data
+    
+    @staticmethod
+    def _source_item_id(raw) -> Optional[str]:
+        """需求来源条目的id：评论中的需求为评论id，否则为帖子id（没有id时用帖子链接）"""
+        comment = raw.get("source_comment")
+        if comment and comment.get("comment_id"):
+            return str(comment["comment_id"])
+        post = raw.get("source_post", {})
+        item_id = post.get("item_id")
+        return str(item_id) if item_id else post.get("url") or None
+    
+    def _natural_key(self, analyzed_demand: Dict) -> str:
+        """自然键的字符串形式（近似重复索引的键）"""
+        raw = analyzed_demand["raw"]
+        return "|".join((analyzed_demand["analysis"]["source_info"]["platform"],
+                         self._source_item_id(raw) or "", raw.get("demand_type") or ""))
+    
+    def _drop_near_duplicates(self, analyzed_demands: List[Dict],
+                              run_index: Optional[NearDuplicateIndex] = None) -> Tuple[List[Dict], int, int]:
+        """近似重复检测，返回 (保留的需求, 本次运行内合并的数量, 与已保存需求重复的数量)
+
+        同一组近似重复只保留综合评分最高的一条，保留的需求维持原来的顺序。
+        与已保存的同一来源条目近似（重新爬取）的不算重复，即使它与其他条目更相似，保存时原地更新。
+        流式模式下各批共用调用方传入的 run_index（批与批之间先到先得）。
+        """
+        own_index = run_index is None
+        if own_index:
+            run_index = self.duplicate_index.scratch()
+        order = sorted(range(len(analyzed_demands)),
+                       key=lambda i: -analyzed_demands[i]["analysis"]["scores"].get("overall", 0))
+        
+        kept = set()
+        merged_count = 0
+        existing_count = 0
+        for i in order:
+            text = analyzed_demands[i]["raw"].get("extracted_text", "")
+            signature = self.duplicate_index.hasher.signature(text)
+            existing = {key for key, _ in self.duplicate_index.query_all_signature(signature)}
+            if existing and self._natural_key(analyzed_demands[i]) not in existing:
+                existing_count += 1
+            elif run_index.query_signature(signature):
+                merged_count += 1
+            else:
+                run_index.add_signatures([str(i)], signature[None, :])
+                kept.add(i)
+        
+        if own_index:
+            run_index.close()
+        return [analyzed_demand for i, analyzed_demand in enumerate(analyzed_demands) if i in kept], \
+            merged_count, existing_count
+    
     def _update_source_status(self, platform: str, demands_found: int):
         """更新数据源状态"""
         try:
@@ -197,7 +684,9 @@ class DataPipeline:
                         platform=platform,
                         url=self._get_platform_url(platform),
                         is_active=True,
-                        crawl_interval_hours=24
+                        crawl_interval_hours=24,
+                        total_demands_found=0,
+                        success_rate=0.0
                     )
                     session.add(source)
                 
@@ -289,9 +778,14 @@ class DataPipeline:
             "total_processed": 0,
             "successful_saves": 0,
             "failed_saves": 0,
+            "analysis_cache_hits": 0,
+            "analysis_cache_misses": 0,
+            "duplicates_merged": 0,
+            "duplicates_existing": 0,
             "last_run": None,
             "run_duration": 0
         }
+        self.analyzer.timings.reset()
 
 # 使用示例
 if __name__ == "__main__":
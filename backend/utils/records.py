@@ -0,0 +1,171 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class Record:
+    """紧凑记录基类 - 字段存放在 __slots__ 中，同时保留 dict 风格的只读访问
+
+    get() / [] / in 的行为与原来的字典一致，已有调用方无需修改；
+    to_dict() 生成可直接 JSON 序列化的字典（供API返回）。
+    """
+
+    __slots__ = ()
+
+    # dict 风格访问时可见的键（可以包含属性）
+    _keys: Tuple[str, ...] = ()
+
+    def get(self, key: str, default=None):
+        if key in self._keys:
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def __getitem__(self, key: str):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys and getattr(self, key) is not None
+
+    def keys(self) -> List[str]:
+        return [key for key in self._keys if key in self]
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Post(Record):
+    """列表页上的一个帖子（feed / page 为所在的列表页和页码，只在内部使用，不出现在 dict 风格的键中）"""
+
+    __slots__ = ("item_id", "title", "url", "score", "comments", "user", "posted_time",
+                 "platform", "crawled_at", "type", "feed", "page")
+    _keys = ("title", "url", "score", "comments", "user", "posted_time", "platform",
+             "crawled_at", "type", "item_id")
+
+    def __init__(self, item_id: Optional[str], title: str, url: str, score: int = 0, comments: int = 0,
+                 user: str = "", posted_time: str = "", platform: str = "hackernews",
+                 crawled_at: str = "", type: str = "general", feed: str = "", page: int = 0):
+        self.item_id = item_id
+        self.title = title
+        self.url = url
+        self.score = score
+        self.comments = comments
+        self.user = user
+        self.posted_time = posted_time
+        self.platform = platform
+        self.crawled_at = crawled_at
+        self.type = type
+        self.feed = feed
+        self.page = page
+
+    def replace(self, **changes) -> "Post":
+        """复制一份并修改部分字段"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return Post(**fields)
+
+
+class RawDemand(Record):
+    """从帖子标题或评论中提取的候选需求，只引用所属帖子，不复制帖子内容
+
+    同一段文本命中多个需求模式时只生成一条，demand_types / patterns 按配置顺序记录全部命中，
+    demand_type 为第一个（主要）类型。
+    """
+
+    __slots__ = ("post", "demand_types", "extracted_text", "confidence", "extracted_at", "patterns", "comment")
+    _keys = ("source_post", "demand_type", "demand_types", "extracted_text", "confidence", "extracted_at",
+             "patterns_found", "source_comment")
+
+    def __init__(self, post: Post, demand_types: List[str], extracted_text: str, patterns: List[str],
+                 extracted_at: str, confidence: float = 0.7, comment: Optional[Dict] = None):
+        self.post = post
+        self.demand_types = demand_types
+        self.extracted_text = extracted_text
+        self.confidence = confidence
+        self.extracted_at = extracted_at
+        self.patterns = patterns
+        self.comment = comment
+
+    @property
+    def demand_type(self) -> Optional[str]:
+        return self.demand_types[0] if self.demand_types else None
+
+    @property
+    def source_post(self) -> Post:
+        return self.post
+
+    @property
+    def source_comment(self) -> Optional[Dict]:
+        return self.comment
+
+    @property
+    def patterns_found(self) -> List[str]:
+        return list(self.patterns)
+
+    @property
+    def post_id(self) -> Optional[str]:
+        return self.post.get("item_id") if self.post is not None else None
+
+    def to_dict(self) -> Dict:
+        """帖子按id引用，评论只保留id"""
+        data = {
+            "source_post_id": self.post_id,
+            "demand_type": self.demand_type,
+            "demand_types": list(self.demand_types),
+            "extracted_text": self.extracted_text,
+            "confidence": self.confidence,
+            "extracted_at": self.extracted_at,
+            "patterns_found": self.patterns_found
+        }
+        if self.comment is not None:
+            data["source_comment_id"] = self.comment.get("comment_id")
+        return data
+
+
+class Analysis(Record):
+    """单个需求的分析结果"""
+
+    __slots__ = ("post", "tool_type", "payment_potential", "technical_complexity", "keywords",
+                 "scores", "analyzed_at", "confidence")
+    _keys = ("tool_type", "payment_potential", "technical_complexity", "keywords", "scores",
+             "analyzed_at", "confidence", "source_info")
+
+    def __init__(self, post: Optional[Post], tool_type: str, payment_potential: str,
+                 technical_complexity: str, keywords: List[str], scores: Dict[str, float],
+                 analyzed_at: str, confidence: float = 0.5):
+        self.post = post
+        self.tool_type = tool_type
+        self.payment_potential = payment_potential
+        self.technical_complexity = technical_complexity
+        self.keywords = keywords
+        self.scores = scores
+        self.analyzed_at = analyzed_at
+        self.confidence = confidence
+
+    @property
+    def source_info(self) -> Dict[str, str]:
+        """来源信息按需从帖子生成，不单独存储"""
+        post = self.post or {}
+        return {
+            "platform": post.get("platform", "unknown"),
+            "post_title": post.get("title", ""),
+            "post_url": post.get("url", "")
+        }
+
+    @property
+    def post_id(self) -> Optional[str]:
+        return self.post.get("item_id") if self.post is not None else None
+
+    def to_dict(self) -> Dict:
+        data = super().to_dict()
+        data["source_post_id"] = self.post_id
+        return data
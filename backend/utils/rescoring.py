@@ -0,0 +1,153 @@
+"""批量重新评分 - 评分配置（权重、关键词词典等）修改后重新计算已保存需求的评分
+
+按主键顺序分块流式读取 (id, problem, 现有评分和分类)，每块用向量化评分（score_batch）整体计算，
+同时重新生成由分类和评分决定的推荐字段（工具类型、技术复杂度、推荐定价、MVP功能、技术栈、开发周期），
+只把有变化的行批量写回：PostgreSQL 上是一条 UPDATE ... FROM (VALUES ...)，
+其他数据库按主键批量 UPDATE。内存中始终只有一块数据。
+管道按工具类型估算的市场数据（search_volume 等）和按付费潜力生成的 budget_range 不重新计算。
+
+用法: python -m backend.utils.rescoring [--chunk-size 5000] [--dry-run]
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, String, cast, column, select, update, values
+
+from backend.analysis.demand_analyzer import DemandAnalyzer
+from backend.analysis.vectorized import score_batch
+from backend.database.models import Demand
+
+logger = logging.getLogger(__name__)
+
+# 评分字典的键 -> Demand 的列
+SCORE_COLUMNS = {
+    "demand_strength": "demand_strength_score",
+    "market_size": "market_size_score",
+    "payment_willingness": "willingness_to_pay_score",
+    "technical_feasibility": "technical_feasibility_score",
+    "passive_income_fit": "passive_income_fit_score",
+    "overall": "overall_score"
+}
+
+# 由分类和 generate_recommendations 得到的列 -> (取值函数, 列类型)
+DERIVED_COLUMNS = {
+    "tool_type": (lambda analysis, recommendations: analysis["tool_type"], String),
+    "technical_complexity": (lambda analysis, recommendations: analysis["technical_complexity"], String),
+    "recommended_pricing": (lambda analysis, recommendations: recommendations["recommended_pricing"], String),
+    "mvp_features": (lambda analysis, recommendations: recommendations["mvp_features"], JSON),
+    "main_tech_stack": (lambda analysis, recommendations: recommendations["suggested_tech_stack"], JSON),
+    "dev_time_weeks": (lambda analysis, recommendations: recommendations["time_estimate_weeks"], Integer)
+}
+
+
+def rescore_demands(database=None, analyzer: Optional[DemandAnalyzer] = None, chunk_size: int = 5000,
+                    dry_run: bool = False) -> Dict:
+    """重新计算所有已保存需求的评分、高潜力标记和推荐字段，返回统计信息"""
+    if database is None:
+        from backend.database.database import db as database
+    analyzer = analyzer or DemandAnalyzer()
+
+    start_time = time.time()
+    stats = {"scanned": 0, "updated": 0, "chunks": 0, "dry_run": dry_run}
+    columns = [getattr(Demand, name) for name in SCORE_COLUMNS.values()]
+    last_id = None
+
+    while True:
+        with database.get_session() as session:
+            # 按主键翻页（keyset），每块都走主键索引，不需要 OFFSET
+            query = select(Demand.id, Demand.problem, Demand.is_high_potential,
+                           *[getattr(Demand, name) for name in DERIVED_COLUMNS], *columns)
+            if last_id is not None:
+                query = query.where(Demand.id > last_id)
+            rows = session.execute(query.order_by(Demand.id).limit(chunk_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            changes = _rescore_chunk(analyzer, rows)
+            if changes and not dry_run:
+                _bulk_update(session, changes)
+
+        stats["scanned"] += len(rows)
+        stats["updated"] += len(changes)
+        stats["chunks"] += 1
+        logger.info(f"Rescored {stats['scanned']} demands, {stats['updated']} changed")
+
+    stats["duration_seconds"] = time.time() - start_time
+    logger.info(f"Rescoring completed: {stats}")
+    return stats
+
+
+def _rescore_chunk(analyzer: DemandAnalyzer, rows: List) -> List[Dict]:
+    """计算一块需求的新评分和推荐字段，只返回有变化的行"""
+    texts = [(row[1] or "").lower() for row in rows]
+    labels, scores = score_batch(analyzer, texts)
+
+    derived_end = 3 + len(DERIVED_COLUMNS)
+    names = list(SCORE_COLUMNS)
+    new = np.array([[item[name] for name in names] for item in scores], dtype=np.float64)
+    old = np.array([row[derived_end:] for row in rows], dtype=np.float64)
+    high = new[:, names.index("overall")] >= analyzer.high_potential_threshold
+    old_high = np.array([bool(row[2]) for row in rows])
+
+    # NULL 读成 NaN，与任何值都不相等，会被重新写入
+    changed = (new != old).any(axis=1) | (high != old_high)
+
+    # 推荐字段由分类和综合评分决定，与写入时一样经 generate_recommendations 生成
+    derived = []
+    for index, ((tool_type, payment_potential, complexity), item_scores) in enumerate(zip(labels, scores)):
+        analysis = {"tool_type": tool_type, "payment_potential": payment_potential,
+                    "technical_complexity": complexity, "scores": item_scores}
+        recommendations = analyzer.generate_recommendations(analysis)
+        values_ = {name: get(analysis, recommendations) for name, (get, _) in DERIVED_COLUMNS.items()}
+        if tuple(values_.values()) != tuple(rows[index][3:derived_end]):
+            changed[index] = True
+        derived.append(values_)
+
+    updated_at = datetime.utcnow()
+    changes = []
+    for index in np.flatnonzero(changed).tolist():
+        change = {"id": rows[index][0], "is_high_potential": bool(high[index]), "updated_at": updated_at}
+        change.update(zip(SCORE_COLUMNS.values(), new[index].tolist()))
+        change.update(derived[index])
+        changes.append(change)
+    return changes
+
+
+def _bulk_update(session, changes: List[Dict]):
+    if session.get_bind().dialect.name == "postgresql":
+        # 整块数据作为 VALUES 表与 demands 连接，一条语句完成更新
+        names = ["id", *SCORE_COLUMNS.values(), *DERIVED_COLUMNS, "is_high_potential", "updated_at"]
+        types = [String, *[Float] * len(SCORE_COLUMNS), *[type_ for _, type_ in DERIVED_COLUMNS.values()],
+                 Boolean, DateTime]
+        rows = values(*[column(name, type_) for name, type_ in zip(names, types)], name="rescored").data(
+            [tuple(change[name] for name in names) for change in changes]
+        )
+        session.execute(
+            update(Demand)
+            .where(Demand.id == rows.c.id)
+            # VALUES 中的JSON文本是 text 类型，写入 JSON 列前显式转换
+            .values({name: cast(rows.c[name], JSON) if type_ is JSON else rows.c[name]
+                     for name, type_ in zip(names[1:], types[1:])})
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        # 按主键的批量 UPDATE（executemany）
+        session.execute(update(Demand), changes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true", help="只统计会变化的行数，不写回")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = rescore_demands(chunk_size=args.chunk_size, dry_run=args.dry_run)
+    print(f"✅ scanned {result['scanned']} demands, {'would update' if args.dry_run else 'updated'} "
+          f"{result['updated']} in {result['duration_seconds']:.1f}s")
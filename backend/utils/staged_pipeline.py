@@ -0,0 +1,121 @@
+"""流式分段管道 - 各阶段用有界队列串联，每个阶段由若干工作线程并发处理
+
+阶段函数接收一个输入项，返回（或 yield）零个或多个输出项，逐个放入下游队列。
+下游队列满时 put 阻塞，阶段函数（如爬虫的翻页生成器）随之暂停，背压一直传回源头；
+内存中的数据量上限约为 队列数 x queue_size 项加上各阶段正在处理的项。
+
+阶段函数抛出的异常按项记录（日志 + errors 计数），不会中断管道。
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 队列结束标记，每个下游工作线程收到一个后退出
+_DONE = object()
+
+
+class Stage:
+    """管道中的一个阶段"""
+
+    def __init__(self, name: str, function: Callable[[object], Optional[Iterable]], workers: int = 1):
+        self.name = name
+        self.function = function
+        self.workers = max(1, workers)
+        self.stats = {
+            "workers": self.workers,
+            "processed": 0,
+            "emitted": 0,
+            "errors": 0,
+            "busy_seconds": 0.0,
+            # 等待下游队列空位的时间（背压）
+            "blocked_seconds": 0.0,
+            "max_queue_depth": 0
+        }
+
+
+class StagedPipeline:
+    """按顺序连接各阶段；run() 把 source 中的项送入第一个阶段，全部处理完后返回各阶段统计"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self._lock = threading.Lock()
+
+    def run(self, source: Iterable) -> Dict[str, Dict]:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(index, queues, remaining),
+                                          name=f"{stage.name}-{worker}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        # 源头在调用线程中迭代，第一个队列满时同样阻塞
+        started = time.perf_counter()
+        fed = 0
+        try:
+            for item in source:
+                queues[0].put(item)
+                fed += 1
+        except Exception as e:
+            logger.error(f"Pipeline source failed after {fed} items: {str(e)}")
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        stats = {stage.name: dict(stage.stats) for stage in self.stages}
+        logger.info(f"Staged pipeline finished {fed} source items in {time.perf_counter() - started:.2f}s")
+        return stats
+
+    def _work(self, index: int, queues: List[queue.Queue], remaining: List[int]) -> None:
+        stage = self.stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+        while True:
+            depth = inbox.qsize()
+            item = inbox.get()
+            if item is _DONE:
+                break
+
+            start = time.perf_counter()
+            blocked = 0.0
+            emitted = 0
+            failed = False
+            try:
+                for output in stage.function(item) or ():
+                    if outbox is not None:
+                        wait = time.perf_counter()
+                        outbox.put(output)
+                        blocked += time.perf_counter() - wait
+                    emitted += 1
+            except Exception as e:
+                failed = True
+                logger.warning(f"Stage {stage.name} failed on an item: {str(e)}")
+
+            with self._lock:
+                stats = stage.stats
+                stats["processed"] += 1
+                stats["emitted"] += emitted
+                stats["errors"] += failed
+                stats["busy_seconds"] += time.perf_counter() - start - blocked
+                stats["blocked_seconds"] += blocked
+                stats["max_queue_depth"] = max(stats["max_queue_depth"], depth)
+
+        # 本阶段最后一个退出的工作线程通知下游结束
+        with self._lock:
+            remaining[index] -= 1
+            last = remaining[index] == 0
+        if last and outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                outbox.put(_DONE)
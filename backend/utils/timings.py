@@ -0,0 +1,91 @@
+import itertools
+import threading
+from time import perf_counter_ns
+from typing import Dict, List
+
+# 直方图按耗时（纳秒）的二进制位数分桶：第 b 桶为 [2^(b-1), 2^b) ns
+HISTOGRAM_BUCKETS = 65
+
+
+class StageTimings:
+    """分阶段耗时统计 - 每个阶段一个 perf_counter_ns 对数直方图
+
+    record() 只做几次整数运算，开销在百纳秒级；逐条调用的热路径（每次只有几十微秒）
+    用 sample() 每 sample_every 次计时一次，批量路径每次都计时。
+    百分位由直方图估计（取所在桶的上界），误差不超过2倍。
+    流式管道的多个工作线程共用一个实例：抽样计数用 itertools.count（next() 是单个C调用，
+    不会丢计数），record() 的读-改-写和 snapshot() 在锁内进行（只有计时的调用才加锁）。
+    """
+
+    __slots__ = ("enabled", "sample_every", "_calls", "_stages", "_lock")
+
+    def __init__(self, enabled: bool = True, sample_every: int = 16):
+        self.enabled = enabled
+        self.sample_every = max(1, sample_every)
+        self._calls = itertools.count(1)
+        self._lock = threading.Lock()
+        # 阶段名 -> [次数, 总耗时ns, 最大耗时ns, 直方图]
+        self._stages: Dict[str, List] = {}
+
+    @staticmethod
+    def now() -> int:
+        return perf_counter_ns()
+
+    def sample(self) -> bool:
+        """本次调用是否计时（每 sample_every 次一次）"""
+        if not self.enabled:
+            return False
+        return next(self._calls) % self.sample_every == 0
+
+    def record(self, stage: str, elapsed_ns: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = [0, 0, 0, [0] * HISTOGRAM_BUCKETS]
+            stats[0] += 1
+            stats[1] += elapsed_ns
+            if elapsed_ns > stats[2]:
+                stats[2] = elapsed_ns
+            stats[3][min(elapsed_ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def since(self, stage: str, started_ns: int) -> int:
+        """记录从 started_ns 到现在的耗时，返回当前时间（作为下一阶段的起点）"""
+        now = perf_counter_ns()
+        self.record(stage, now - started_ns)
+        return now
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """导出各阶段统计（毫秒），可直接JSON序列化；抽样计时的阶段 count 为计时的次数"""
+        with self._lock:
+            stages = [(stage, stats[0], stats[1], stats[2], list(stats[3])) for stage, stats in self._stages.items()]
+        result = {}
+        for stage, count, total_ns, max_ns, histogram in stages:
+            result[stage] = {
+                "count": count,
+                "total_ms": round(total_ns / 1e6, 3),
+                "mean_us": round(total_ns / count / 1e3, 2) if count else 0.0,
+                "p50_us": self._percentile_us(histogram, count, 50),
+                "p90_us": self._percentile_us(histogram, count, 90),
+                "p99_us": self._percentile_us(histogram, count, 99),
+                "max_us": round(max_ns / 1e3, 2)
+            }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls = itertools.count(1)
+            self._stages = {}
+
+    @staticmethod
+    def _percentile_us(histogram: List[int], count: int, pct: float) -> float:
+        if not count:
+            return 0.0
+        target = pct / 100 * count
+        seen = 0
+        for bucket, bucket_count in enumerate(histogram):
+            seen += bucket_count
+            if seen >= target:
+                return round((1 << bucket) / 1e3, 2)
+        return 0.0